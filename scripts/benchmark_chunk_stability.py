@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Chunk Stability Benchmark
+
+Inserts one sentence near the top of each demo book and counts how many
+chunk hashes change (i.e. how many chunks a re-sync has to re-embed) for
+fixed-size versus content-defined chunking.
+
+Usage:
+    python scripts/benchmark_chunk_stability.py
+    python scripts/benchmark_chunk_stability.py --chunk-size 256 --position 0.5
+"""
+
+import argparse
+import hashlib
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.core.chunking import iter_content_defined_windows, iter_word_windows, window_text
+
+BOOKS = ["tenant1/WarAndPeace.txt", "tenant2/MobyDick.txt"]
+INSERTED = " Meanwhile, a sentence that was not in the original edition appears here."
+
+
+def fixed_size_texts(text: str, chunk_size: int, overlap: int) -> list:
+    return [window_text(text, s, e) for s, e, _ in iter_word_windows(text, chunk_size, overlap)]
+
+
+def content_defined_texts(text: str, chunk_size: int, overlap: int) -> list:
+    return [chunk for _, _, _, chunk in iter_content_defined_windows(text, chunk_size, overlap)]
+
+
+def chunk_hashes(chunks: list) -> list:
+    return [hashlib.sha256(chunk.encode("utf-8")).hexdigest() for chunk in chunks]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count re-embedded chunks after a local edit")
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--overlap", type=int, default=50)
+    parser.add_argument("--position", type=float, default=0.02, help="Edit position as a fraction of the text")
+    args = parser.parse_args()
+
+    strategies = [("fixed-size", fixed_size_texts), ("content-defined", content_defined_texts)]
+
+    print(f"🧬 Chunk stability after one inserted sentence at {args.position:.0%} of the text")
+    print("=" * 80)
+    print(f"{'file':<20} {'strategy':<16} {'chunks':>7} {'changed':>8} {'share':>7}")
+
+    for book in BOOKS:
+        path = PROJECT_ROOT / "demo-data" / book
+        if not path.exists():
+            print(f"⚠️ Missing {path}")
+            continue
+
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        cut = text.index(" ", int(len(text) * args.position))
+        edited = text[:cut] + INSERTED + text[cut:]
+
+        for name, chunker in strategies:
+            before = set(chunk_hashes(chunker(text, args.chunk_size, args.overlap)))
+            after = chunk_hashes(chunker(edited, args.chunk_size, args.overlap))
+            changed = sum(1 for h in after if h not in before)
+            print(f"{path.name:<20} {name:<16} {len(after):>7} {changed:>8} {changed / len(after):>7.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Chunker Benchmark
+
+Times the single-pass word-window chunker against the previous list-based
+fixed-size chunkers on the large demo books, with peak traced memory.
+
+The previous implementations are reproduced here with one fix: they never
+terminated once the last window reached the end of the text.
+
+Usage:
+    python scripts/benchmark_chunkers.py
+    python scripts/benchmark_chunkers.py --chunk-size 256 --overlap 32
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.core.chunking import iter_word_windows, window_text
+
+BOOKS = ["tenant1/WarAndPeace.txt", "tenant2/MobyDick.txt"]
+
+
+def legacy_fixed_size(text: str, chunk_size: int, overlap: int) -> list:
+    """Previous chunk_text_fixed_size: prefix re-join per chunk for start_char"""
+    words = text.split()
+    chunks = []
+    start = 0
+    while start < len(words):
+        end = min(start + chunk_size, len(words))
+        chunk_text = " ".join(words[start:end])
+        start_char = len(" ".join(words[:start])) if start > 0 else 0
+        chunks.append((chunk_text, start_char, start_char + len(chunk_text)))
+        if end == len(words):
+            break
+        start = end - overlap
+    return chunks
+
+
+def legacy_simple(text: str, chunk_size: int, overlap: int) -> list:
+    """Previous chunk_text_simple: full word list plus a joined copy per chunk"""
+    words = text.split()
+    chunks = []
+    start = 0
+    while start < len(words):
+        end = min(start + chunk_size, len(words))
+        chunks.append(" ".join(words[start:end]))
+        if end == len(words):
+            break
+        start = end - overlap
+    return chunks
+
+
+def streaming(text: str, chunk_size: int, overlap: int) -> list:
+    """Current chunker: regex scan, exact offsets"""
+    return [
+        (window_text(text, start_char, end_char), start_char, end_char)
+        for start_char, end_char, _ in iter_word_windows(text, chunk_size, overlap)
+    ]
+
+
+def measure(func, text: str, chunk_size: int, overlap: int):
+    tracemalloc.start()
+    started = time.perf_counter()
+    chunks = func(text, chunk_size, overlap)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return chunks, elapsed, peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark text chunkers on the demo books")
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--overlap", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"✂️ Chunking benchmark (chunk_size={args.chunk_size}, overlap={args.overlap})")
+    print("=" * 80)
+    print(f"{'file':<24} {'chunker':<18} {'chunks':>7} {'seconds':>9} {'peak MB':>9}")
+
+    for book in BOOKS:
+        path = PROJECT_ROOT / "demo-data" / book
+        if not path.exists():
+            print(f"⚠️ Missing {path}")
+            continue
+        text = path.read_text(encoding="utf-8", errors="ignore")
+
+        results = {}
+        for name, func in [("legacy fixed-size", legacy_fixed_size), ("legacy simple", legacy_simple), ("streaming", streaming)]:
+            chunks, elapsed, peak_mb = measure(func, text, args.chunk_size, args.overlap)
+            results[name] = chunks
+            print(f"{path.name:<24} {name:<18} {len(chunks):>7} {elapsed:>9.3f} {peak_mb:>9.1f}")
+
+        same_text = [c[0] for c in results["streaming"]] == results["legacy simple"]
+        exact = all(text[s:e].split() == chunk.split() for chunk, s, e in results["streaming"])
+        print(f"{'':<24} same chunk text: {'✅' if same_text else '❌'}  exact offsets: {'✅' if exact else '❌'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Embedding Backend Benchmark
+
+Compares each CPU inference backend (torch-int8, onnx, onnx-int8) against the
+fp32 PyTorch reference on paragraphs from demo-data: cosine deviation of the
+vectors and texts/sec throughput.
+
+Usage:
+    python scripts/benchmark_embedding_backends.py
+    python scripts/benchmark_embedding_backends.py --model sentence-transformers/all-mpnet-base-v2 --samples 256
+    python scripts/benchmark_embedding_backends.py --backend onnx-int8
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.core.inference_backends import InferenceBackend, check_backend_parity
+
+
+def load_demo_paragraphs(limit: int) -> list:
+    """Collect non-trivial paragraphs from the demo tenant text files"""
+    paragraphs = []
+    for path in sorted((PROJECT_ROOT / "demo-data").rglob("*.txt")):
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        for paragraph in text.split("\n\n"):
+            paragraph = " ".join(paragraph.split())
+            if len(paragraph) >= 80:
+                paragraphs.append(paragraph)
+                if len(paragraphs) >= limit:
+                    return paragraphs
+    return paragraphs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark embedding inference backends against fp32")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--backend", choices=[b.value for b in InferenceBackend if b != InferenceBackend.TORCH_FP32])
+    parser.add_argument("--samples", type=int, default=128)
+    args = parser.parse_args()
+
+    texts = load_demo_paragraphs(args.samples)
+    backends = [InferenceBackend(args.backend)] if args.backend else [
+        b for b in InferenceBackend if b != InferenceBackend.TORCH_FP32
+    ]
+
+    print(f"🔬 Benchmarking {args.model} on {len(texts)} demo paragraphs")
+    print("=" * 80)
+    print(f"{'backend':<12} {'mean cos':>10} {'min cos':>10} {'fp32 t/s':>10} {'backend t/s':>12} {'speedup':>8} {'MB':>8}")
+
+    for backend in backends:
+        try:
+            report = check_backend_parity(args.model, backend, texts)
+        except Exception as e:
+            print(f"{backend.value:<12} ❌ {e}")
+            continue
+
+        print(
+            f"{report['backend']:<12} {report['mean_cosine']:>10.5f} {report['min_cosine']:>10.5f} "
+            f"{report['reference_texts_per_sec']:>10} {report['backend_texts_per_sec']:>12} "
+            f"{report['speedup']:>7}x {report['backend_size_mb']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
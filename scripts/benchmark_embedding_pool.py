@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Embedding Process Pool Scaling Benchmark
+
+Embeds chunks of the demo-data corpus with 1..N pool workers and reports
+texts/sec, to check throughput scales with the number of cores.
+
+Usage:
+    python scripts/benchmark_embedding_pool.py
+    python scripts/benchmark_embedding_pool.py --max-workers 8 --samples 4000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.core.embedding_engine import chunk_text_semantic
+from src.backend.core.embedding_pool import EmbeddingProcessPool
+
+
+def load_demo_chunks(limit: int, chunk_size: int) -> list:
+    """Chunk demo tenant text files until limit chunks are collected"""
+    chunks = []
+    for path in sorted((PROJECT_ROOT / "demo-data").rglob("*.txt")):
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        chunks.extend(chunk.text for chunk in chunk_text_semantic(text, chunk_size))
+        if len(chunks) >= limit:
+            break
+    return chunks[:limit]
+
+
+async def run_pool(texts: list, model: str, workers: int, threads: int, shard_size: int) -> float:
+    pool = EmbeddingProcessPool(workers, threads, shard_size)
+    try:
+        await pool.embed(texts[:workers * shard_size], model)  # warm every worker's model
+        started = time.perf_counter()
+        await pool.embed(texts, model)
+        return len(texts) / (time.perf_counter() - started)
+    finally:
+        pool.shutdown()
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark embedding pool scaling")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--max-workers", type=int, default=cores)
+    parser.add_argument("--samples", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--shard-size", type=int, default=128)
+    args = parser.parse_args()
+
+    texts = load_demo_chunks(args.samples, args.chunk_size)
+    print(f"🏭 Embedding {len(texts)} demo chunks with {args.model} on {cores} cores")
+    print("=" * 60)
+    print(f"{'workers':>8} {'threads':>8} {'texts/sec':>10} {'scaling':>8}")
+
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        threads = max(1, cores // workers)
+        rate = asyncio.run(run_pool(texts, args.model, workers, threads, args.shard_size))
+        baseline = baseline or rate
+        print(f"{workers:>8} {threads:>8} {rate:>10.1f} {rate / baseline:>7.2f}x")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Padding Waste Benchmark
+
+Chunks the demo-data corpus, tokenizes every chunk, and compares the share of
+padded token positions for document-order batches (the previous behaviour)
+against the length-bucketed token-budget planner used by the embedders.
+
+Usage:
+    python scripts/benchmark_padding.py
+    python scripts/benchmark_padding.py --batch-size 32 --token-budget 16384
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.core.batching import padding_ratio, plan_length_batches, sequential_batches
+from src.backend.core.embedding_engine import chunk_text_semantic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure padding waste of embedding batch plans")
+    parser.add_argument("--model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--token-budget", type=int, default=8192)
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--max-length", type=int, default=256)
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+
+    print(f"📏 Padding waste: sequential x{args.batch_size} vs length-bucketed (budget {args.token_budget})")
+    print("=" * 80)
+    print(f"{'file':<40} {'chunks':>7} {'sequential':>11} {'bucketed':>9}")
+
+    all_lengths = []
+    for path in sorted((PROJECT_ROOT / "demo-data").rglob("*.txt")):
+        text = path.read_text(encoding="utf-8", errors="ignore")
+        chunks = [chunk.text for chunk in chunk_text_semantic(text, args.chunk_size)]
+        if not chunks:
+            continue
+
+        encoded = tokenizer(chunks, truncation=True, max_length=args.max_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        all_lengths.extend(lengths)
+
+        before = padding_ratio(lengths, sequential_batches(len(lengths), args.batch_size))
+        after = padding_ratio(lengths, plan_length_batches(lengths, args.token_budget, args.batch_size))
+        print(f"{str(path.relative_to(PROJECT_ROOT / 'demo-data')):<40} {len(lengths):>7} {before:>10.1%} {after:>9.1%}")
+
+    if not all_lengths:
+        print("❌ No demo-data text files found")
+        return
+
+    before = padding_ratio(all_lengths, sequential_batches(len(all_lengths), args.batch_size))
+    after = padding_ratio(all_lengths, plan_length_batches(all_lengths, args.token_budget, args.batch_size))
+    print("=" * 80)
+    print(f"{'TOTAL':<40} {len(all_lengths):>7} {before:>10.1%} {after:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+PDF Extraction Benchmark
+
+Extracts the demo tax code PDF inline and with 2..N page-range worker
+processes, reporting pages/sec and checking every run returns the same text.
+
+Usage:
+    python scripts/benchmark_pdf_extraction.py
+    python scripts/benchmark_pdf_extraction.py --pdf path/to/file.pdf --pages-per-task 8
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+# Add project root to Python path
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.backend.core.document_extraction import _extract_page_range, _open_pdf
+
+
+def extract_parallel(path: str, page_count: int, workers: int, per_task: int) -> tuple:
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as executor:
+        executor.submit(len, []).result()  # start the workers outside the timed region
+        started = time.perf_counter()
+        futures = [
+            executor.submit(_extract_page_range, path, start, min(start + per_task, page_count))
+            for start in range(0, page_count, per_task)
+        ]
+        pages = [page for future in futures for page in future.result()]
+        return pages, time.perf_counter() - started
+
+
+def main():
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark page-parallel PDF extraction")
+    parser.add_argument("--pdf", default=str(PROJECT_ROOT / "demo-data" / "tenant3" / "TaxCode.pdf"))
+    parser.add_argument("--max-workers", type=int, default=cores)
+    parser.add_argument("--pages-per-task", type=int, default=16)
+    args = parser.parse_args()
+
+    page_count = len(_open_pdf(args.pdf).pages)
+    print(f"📑 Extracting {page_count} pages of {Path(args.pdf).name} on {cores} cores")
+    print("=" * 60)
+    print(f"{'workers':>8} {'seconds':>9} {'pages/sec':>10} {'speedup':>8} {'same':>5}")
+
+    started = time.perf_counter()
+    baseline = _extract_page_range(args.pdf, 0, page_count)
+    inline_seconds = time.perf_counter() - started
+    print(f"{'inline':>8} {inline_seconds:>9.2f} {page_count / inline_seconds:>10.1f} {1.0:>7.2f}x {'✅':>5}")
+
+    workers = 2
+    while workers <= args.max_workers:
+        pages, seconds = extract_parallel(args.pdf, page_count, workers, args.pages_per_task)
+        same = "✅" if pages == baseline else "❌"
+        print(f"{workers:>8} {seconds:>9.2f} {page_count / seconds:>10.1f} {inline_seconds / seconds:>7.2f}x {same:>5}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -84,6 +84,39 @@ async def get_system_stats(
         raise HTTPException(status_code=500, detail=f"Failed to get stats: {str(e)}")
 
 
+@router.get("/performance")
+async def get_performance_stats(
+    current_tenant: Tenant = Depends(get_current_tenant)
+) -> Dict[str, Any]:
+    """Get embedding pipeline metrics - admin only"""
+    
+    if current_tenant.slug != "admin":
+        raise HTTPException(status_code=403, detail="Admin access required")
+    
+    from src.backend.core.embedding_pool import get_embedding_pool_stats
+    from src.backend.core.embedding_scheduler import get_embedding_scheduler_stats
+    from src.backend.core.extraction_cache import get_extraction_cache_stats
+    from src.backend.core.inference_executor import get_inference_executor, get_sync_inference_executor
+    from src.backend.core.model_registry import get_model_registry
+    from src.backend.core.query_batcher import get_query_batcher_stats
+    from src.backend.core.query_cache import get_query_cache
+    from src.backend.core.sync_jobs import get_sync_job_stats
+    from src.backend.core.upload_watcher import get_upload_watcher_stats
+    
+    return {
+        "inference_executor": get_inference_executor().get_stats(),
+        "sync_inference_executor": get_sync_inference_executor().get_stats(),
+        "model_registry": get_model_registry().get_stats(),
+        "query_batchers": get_query_batcher_stats(),
+        "query_cache": get_query_cache().get_stats(),
+        "embedding_pool": get_embedding_pool_stats(),
+        "embedding_scheduler": get_embedding_scheduler_stats(),
+        "extraction_cache": get_extraction_cache_stats(),
+        "upload_watcher": get_upload_watcher_stats(),
+        "sync_jobs": get_sync_job_stats()
+    }
+
+
 @router.get("/health")
 async def health_check():
     """Simple health check"""
@@ -11,7 +11,8 @@ from src.backend.dependencies import get_current_tenant_dep
 from src.backend.database import get_async_db
 from src.backend.models.database import Tenant
 from src.backend.core.database_operations import search_embeddings
-from src.backend.core.embedding_engine import SingletonEmbeddingModel, EmbeddingModel
+from src.backend.core.inference_executor import InferenceQueueFullError
+from src.backend.core.query_batcher import embed_query
 
 router = APIRouter()
 
@@ -36,17 +37,14 @@ async def process_query(
         
         start_time = time.time()
         
-        # Get embedding model
-        model = SingletonEmbeddingModel.get_model(EmbeddingModel.MINI_LM.value)
-        
-        # Generate query embedding
-        query_embedding = model.encode([query], convert_to_tensor=False, show_progress_bar=False)[0]
+        # Generate query embedding through the micro-batcher (off the event loop)
+        query_embedding = await embed_query(query)
         
         # Search for similar embeddings
         similar_chunks = await search_embeddings(
             db=db,
             tenant_slug=current_tenant.slug,
-            query_embedding=query_embedding.tolist() if hasattr(query_embedding, 'tolist') else list(query_embedding),
+            query_embedding=query_embedding,
             limit=max_sources
         )
         
@@ -56,8 +54,9 @@ async def process_query(
         sources = []
         for chunk in similar_chunks:
             sources.append({
-                "text": chunk.text,
+                "text": chunk.chunk_content,
                 "chunk_index": chunk.chunk_index,
+                "page_number": chunk.page_number,
                 "file_id": str(chunk.file_id),
                 "token_count": chunk.token_count
             })
@@ -80,6 +79,11 @@ async def process_query(
         
     except HTTPException:
         raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Embedding service busy: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -104,17 +108,14 @@ async def semantic_search(
         
         max_results = request.get("max_results", 20)
         
-        # Get embedding model
-        model = SingletonEmbeddingModel.get_model(EmbeddingModel.MINI_LM.value)
-        
-        # Generate query embedding
-        query_embedding = model.encode([query], convert_to_tensor=False, show_progress_bar=False)[0]
+        # Generate query embedding through the micro-batcher (off the event loop)
+        query_embedding = await embed_query(query)
         
         # Search for similar embeddings
         similar_chunks = await search_embeddings(
             db=db,
             tenant_slug=current_tenant.slug,
-            query_embedding=query_embedding.tolist() if hasattr(query_embedding, 'tolist') else list(query_embedding),
+            query_embedding=query_embedding,
             limit=max_results
         )
         
@@ -122,8 +123,9 @@ async def semantic_search(
         results = []
         for chunk in similar_chunks:
             results.append({
-                "text": chunk.text,
+                "text": chunk.chunk_content,
                 "chunk_index": chunk.chunk_index,
+                "page_number": chunk.page_number,
                 "file_id": str(chunk.file_id),
                 "token_count": chunk.token_count
             })
@@ -137,6 +139,11 @@ async def semantic_search(
         
     except HTTPException:
         raise
+    except InferenceQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Embedding service busy: {str(e)}"
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -12,6 +12,7 @@ from src.backend.dependencies import get_current_tenant_dep
 from src.backend.database import get_async_db
 from src.backend.models.database import Tenant
 from src.backend.core.sync_coordinator import SyncCoordinator
+from src.backend.core.sync_jobs import get_sync_job_runner
 from src.backend.simple_embedder import (
     get_available_models, 
     get_available_strategies
@@ -28,6 +29,7 @@ class SyncRequest(BaseModel):
     chunk_size: Optional[int] = 512
     chunk_overlap: Optional[int] = 50
     force_reprocess: bool = False
+    force_full_sync: bool = False
 
 
 class EmbeddingConfigRequest(BaseModel):
@@ -71,31 +73,28 @@ async def trigger_sync(
     current_tenant: Tenant = Depends(get_current_tenant_dep),
     db: AsyncSession = Depends(get_async_db)
 ):
-    """Trigger sync with configuration options"""
+    """Queue a background sync; poll /status or /history with the returned sync_id"""
     
     try:
-        coordinator = SyncCoordinator(db)
-        
         # Default values if no request provided
         if request is None:
             request = SyncRequest()
         
         # Determine sync type
-        force_full_sync = (request.sync_type == "full") or request.force_reprocess
+        force_full_sync = (request.sync_type == "full") or request.force_reprocess or request.force_full_sync
         
-        # Execute sync
-        results = await coordinator.quick_sync(
-            tenant_slug=current_tenant.slug,
+        job = await get_sync_job_runner().submit(
+            db,
+            current_tenant.slug,
             force_full_sync=force_full_sync,
             embedding_model=request.embedding_model,
             chunking_strategy=request.chunking_strategy
         )
         
         return {
-            "status": "completed",
             "tenant": current_tenant.slug,
-            "sync_type": request.sync_type,
-            **results
+            "sync_type": "full" if force_full_sync else request.sync_type,
+            **job
         }
         
     except Exception as e:
@@ -186,18 +185,14 @@ async def get_sync_history(
     current_tenant: Tenant = Depends(get_current_tenant_dep),
     db: AsyncSession = Depends(get_async_db)
 ):
-    """Get sync history (simplified for now)"""
+    """Get recent sync operations, newest first"""
     
-    coordinator = SyncCoordinator(db)
-    status = await coordinator.get_sync_status(current_tenant.slug)
+    from src.backend.core.database_operations import get_sync_operations
     
-    # For now, return current status as "history"
-    # In a full implementation, you'd track sync operations in the database
+    history = await get_sync_operations(db, current_tenant.slug, limit=max(1, min(limit, 100)))
     return {
         "tenant": current_tenant.slug,
-        "current_status": status,
-        "history": [],
-        "note": "Full history tracking not yet implemented"
+        "history": history
     }
 
 
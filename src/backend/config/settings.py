@@ -61,6 +61,50 @@ class Settings(BaseSettings):
     embedding_model_dimensions: int = Field(default=384, env="EMBEDDING_MODEL_DIMENSIONS")
     embedding_device: str = Field(default="cpu", env="EMBEDDING_DEVICE")
     embedding_batch_size: int = Field(default=32, env="EMBEDDING_BATCH_SIZE")
+    embedding_batch_token_budget: int = Field(default=8192, env="EMBEDDING_BATCH_TOKEN_BUDGET", description="Max padded tokens per inference batch (length-bucketed)")
+    embedding_model_cache_mb: int = Field(default=2048, env="EMBEDDING_MODEL_CACHE_MB", description="RAM budget for warm embedding models (LRU eviction)")
+    embedding_backend: str = Field(default="torch-fp32", env="EMBEDDING_BACKEND", description="torch-fp32, torch-int8, onnx or onnx-int8")
+    embedding_backend_overrides: Dict[str, str] = Field(default_factory=dict, env="EMBEDDING_BACKEND_OVERRIDES", description="JSON map of model name to backend")
+    inference_max_workers: int = Field(default=2, env="INFERENCE_MAX_WORKERS", description="Threads running embedding inference off the event loop")
+    inference_max_queue_depth: int = Field(default=64, env="INFERENCE_MAX_QUEUE_DEPTH", description="Pending inference calls allowed before rejecting new work")
+    sync_inference_max_workers: int = Field(default=2, env="SYNC_INFERENCE_MAX_WORKERS", description="Threads for sync extraction and embedding (separate from query inference)")
+    sync_inference_max_queue_depth: int = Field(default=256, env="SYNC_INFERENCE_MAX_QUEUE_DEPTH", description="Pending sync extraction/embedding calls allowed before failing new work")
+    query_batch_max_size: int = Field(default=32, env="QUERY_BATCH_MAX_SIZE", description="Max query texts encoded in one micro-batch")
+    query_batch_max_wait_ms: float = Field(default=5.0, env="QUERY_BATCH_MAX_WAIT_MS", description="Max time a query waits for batch companions")
+    query_cache_max_entries: int = Field(default=1024, ge=0, env="QUERY_CACHE_MAX_ENTRIES", description="Query embeddings kept in the LRU cache (0 disables)")
+    query_cache_ttl_seconds: float = Field(default=3600.0, env="QUERY_CACHE_TTL_SECONDS", description="Age after which a cached query embedding is recomputed (0 = no expiry)")
+    embedding_pool_workers: int = Field(default=0, env="EMBEDDING_POOL_WORKERS", description="Worker processes for bulk sync embedding (0 disables the pool)")
+    embedding_pool_threads_per_worker: int = Field(default=0, env="EMBEDDING_POOL_THREADS_PER_WORKER", description="torch threads per pool worker (0 = cores / workers)")
+    embedding_pool_min_chunks: int = Field(default=256, env="EMBEDDING_POOL_MIN_CHUNKS", description="Smallest chunk count sent to the process pool")
+    embedding_pool_shard_size: int = Field(default=128, env="EMBEDDING_POOL_SHARD_SIZE", description="Chunks per task handed to a pool worker")
+    ingest_stream_min_bytes: int = Field(default=1048576, env="INGEST_STREAM_MIN_BYTES", description="Files at least this large are read, embedded and written in windows")
+    ingest_window_chunks: int = Field(default=256, env="INGEST_WINDOW_CHUNKS", description="Chunks per streaming window (bounds peak memory)")
+    pdf_extraction_workers: int = Field(default=0, env="PDF_EXTRACTION_WORKERS", description="Processes extracting PDF pages (0 = one per CPU core, 1 = inline)")
+    pdf_pages_per_task: int = Field(default=16, env="PDF_PAGES_PER_TASK", description="Pages per extraction task; smaller PDFs are read inline")
+    extraction_cache_dir: str = Field(default=str(CACHE_DIR / "extraction"), env="EXTRACTION_CACHE_DIR", description="On-disk cache of extracted text and chunk lists")
+    extraction_cache_max_bytes: int = Field(default=536870912, env="EXTRACTION_CACHE_MAX_BYTES", description="Extraction cache size before LRU eviction (0 = disabled)")
+    scan_manifest_dir: str = Field(default=str(CACHE_DIR / "scan"), env="SCAN_MANIFEST_DIR", description="Per-tenant (size, mtime_ns, inode, hash) manifests for fast rescans")
+    scan_full_verify_interval_seconds: int = Field(default=86400, env="SCAN_FULL_VERIFY_INTERVAL_SECONDS", description="Rehash every file at least this often (0 = only on forced full syncs)")
+    hash_workers: int = Field(default=0, env="HASH_WORKERS", description="Threads hashing files during discovery (0 = one per CPU core)")
+    hash_buffer_bytes: int = Field(default=1048576, env="HASH_BUFFER_BYTES", description="Read buffer per hashing thread")
+    hash_use_mmap: bool = Field(default=False, env="HASH_USE_MMAP", description="Hash memory-mapped files instead of buffered reads")
+    upload_watcher_enabled: bool = Field(default=False, env="UPLOAD_WATCHER_ENABLED", description="Sync changed upload paths from filesystem events")
+    upload_watcher_dir: str = Field(default="./data/uploads", env="UPLOAD_WATCHER_DIR", description="Upload root watched for tenant directories")
+    upload_watcher_debounce_ms: int = Field(default=1000, env="UPLOAD_WATCHER_DEBOUNCE_MS", description="Quiet time before a burst of events is synced")
+    upload_watcher_max_delay_ms: int = Field(default=10000, env="UPLOAD_WATCHER_MAX_DELAY_MS", description="Longest a changed path waits during continuous activity")
+    sync_pipeline_enabled: bool = Field(default=True, env="SYNC_PIPELINE_ENABLED", description="Overlap extraction, embedding and writes of different files during sync")
+    sync_pipeline_extract_workers: int = Field(default=2, env="SYNC_PIPELINE_EXTRACT_WORKERS", description="Files extracted and chunked concurrently")
+    sync_pipeline_embed_workers: int = Field(default=1, env="SYNC_PIPELINE_EMBED_WORKERS", description="Concurrent embedding batches")
+    sync_pipeline_embed_batch_chunks: int = Field(default=256, env="SYNC_PIPELINE_EMBED_BATCH_CHUNKS", description="Chunks packed into one embedding call, across file boundaries")
+    sync_pipeline_queue_windows: int = Field(default=4, env="SYNC_PIPELINE_QUEUE_WINDOWS", description="Chunk windows buffered between stages (bounds memory)")
+    sync_job_workers: int = Field(default=2, env="SYNC_JOB_WORKERS", description="Background sync jobs run concurrently (one per tenant at a time)")
+    sync_write_batch_files: int = Field(default=100, env="SYNC_WRITE_BATCH_FILES", description="Files whose writes share one transaction during a pipelined sync")
+    sync_write_batch_rows: int = Field(default=5000, env="SYNC_WRITE_BATCH_ROWS", description="Chunk rows written before the sync transaction is committed")
+    embedding_scheduler_slots: int = Field(default=2, env="EMBEDDING_SCHEDULER_SLOTS", description="Sync embedding batches running at once across all tenants (per worker process)")
+    embedding_scheduler_batch_chunks: int = Field(default=256, env="EMBEDDING_SCHEDULER_BATCH_CHUNKS", description="Chunks per scheduled embedding batch (one slot each); raised to fill every pool worker when the pool is on")
+    embedding_scheduler_tenant_weights: str = Field(default="", env="EMBEDDING_SCHEDULER_TENANT_WEIGHTS", description="Fair-share weights, e.g. 'tenant1:2,tenant2:0.5' (default weight 1)")
+    sync_job_heartbeat_seconds: float = Field(default=5.0, env="SYNC_JOB_HEARTBEAT_SECONDS", description="Interval for writing progress and heartbeat of running sync operations")
+    sync_job_stale_seconds: float = Field(default=60.0, env="SYNC_JOB_STALE_SECONDS", description="Heartbeat age after which a running sync is considered dead and resumed")
     
     # RAG/LLM settings - Comprehensive configuration for iterative tuning
     rag_llm_model: str = Field(
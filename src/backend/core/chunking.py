@@ -0,0 +1,233 @@
+"""
+Chunking Primitives - Single-Pass Word and Token Windows With Exact Offsets
+Word windows are located with repeated-word regexes (scanned in C); token
+windows use the model's own tokenizer offsets. No per-word lists, no
+re-joining of prefixes
+"""
+
+import math
+import re
+import zlib
+from collections import deque
+from functools import lru_cache
+from typing import Iterable, Iterator, Tuple
+
+# Bump when any chunker emits different chunks for the same text (invalidates cached chunk lists)
+CHUNKING_VERSION = 2
+
+_FIRST_WORD = re.compile(r"\S")
+_WORD_SPANS = re.compile(r"\S+")
+_REST = re.compile(r"\S+(?:\s+\S+)*")
+_WHITESPACE = re.compile(r"\s+")
+_THROUGH_LAST_SPACE = re.compile(r".*\s", re.DOTALL)
+_NEXT_SPACE = re.compile(r"\s")
+
+
+@lru_cache(maxsize=32)
+def _window_patterns(chunk_size: int, step: int) -> Tuple["re.Pattern", "re.Pattern"]:
+    """(exactly chunk_size words, step words plus trailing whitespace)"""
+    full = re.compile(r"\S+(?:\s+\S+){%d}" % (chunk_size - 1))
+    advance = re.compile(r"(?:\S+\s+){%d}(?=\S)" % step)
+    return full, advance
+
+
+def iter_word_windows(text: str, chunk_size: int = 512, overlap: int = 50) -> Iterator[Tuple[int, int, int]]:
+    """
+    Yield (start_char, end_char, word_count) for windows of chunk_size words
+    that advance by chunk_size - overlap words, in one forward scan of text.
+    """
+    chunk_size = max(1, chunk_size)
+    step = max(1, chunk_size - max(0, overlap))
+    full, advance = _window_patterns(chunk_size, step)
+
+    first = _FIRST_WORD.search(text)
+    if first is None:
+        return
+    start = first.start()
+
+    while True:
+        window = full.match(text, start)
+        if window is None:
+            # Fewer than chunk_size words left: final partial window
+            tail = _REST.match(text, start)
+            yield start, tail.end(), sum(1 for _ in _WORD_SPANS.finditer(text, start, tail.end()))
+            return
+
+        yield start, window.end(), chunk_size
+        if _FIRST_WORD.search(text, window.end()) is None:
+            return
+
+        start = advance.match(text, start).end()
+
+
+def window_text(text: str, start_char: int, end_char: int) -> str:
+    """Chunk text with runs of whitespace collapsed to one space (as ' '.join(words))"""
+    return _WHITESPACE.sub(" ", text[start_char:end_char])
+
+
+# Block sizes: in-memory texts are split for tokenization, files are read in larger blocks
+TOKENIZE_SEGMENT_CHARS = 64 * 1024
+STREAM_BLOCK_CHARS = 256 * 1024
+
+
+def model_token_budget(model) -> int:
+    """Content tokens per chunk the encoder keeps: max_seq_length minus special tokens"""
+    max_length = getattr(model, 'max_seq_length', None) or model.tokenizer.model_max_length
+    return max(1, max_length - model.tokenizer.num_special_tokens_to_add(pair=False))
+
+
+def _whitespace_cut(text: str, start: int, end: int) -> int:
+    """Position just after the last whitespace character in text[start:end], or end if there is none"""
+    match = _THROUGH_LAST_SPACE.match(text, start, end)
+    return match.end() if match else end
+
+
+def iter_text_blocks(text: str, block_chars: int = TOKENIZE_SEGMENT_CHARS) -> Iterator[str]:
+    """
+    Split text into consecutive blocks ending on whitespace, so no word spans two blocks
+    (a block without whitespace runs on to the end of its word)
+    """
+    position = 0
+    while position < len(text):
+        end = position + block_chars
+        if end >= len(text):
+            end = len(text)
+        else:
+            cut = _whitespace_cut(text, position, end)
+            if cut == end and not text[end - 1].isspace():
+                following = _NEXT_SPACE.search(text, end)
+                cut = following.end() if following else len(text)
+            end = cut
+        yield text[position:end]
+        position = end
+
+
+def iter_file_blocks(file_path, block_chars: int = STREAM_BLOCK_CHARS) -> Iterator[str]:
+    """Read a text file incrementally in blocks ending on whitespace"""
+    carry = ""
+    with open(file_path, encoding="utf-8", errors="ignore") as handle:
+        while True:
+            data = handle.read(block_chars)
+            if not data:
+                break
+            data = carry + data
+            cut = _whitespace_cut(data, 0, len(data))
+            if cut == len(data) and not data[-1].isspace():
+                carry = data  # no whitespace yet: keep accumulating one long word
+                continue
+            carry = data[cut:]
+            yield data[:cut]
+    if carry:
+        yield carry
+
+
+def iter_token_windows(blocks: Iterable[str], tokenizer, max_tokens: int, overlap: int = 0) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    Yield (start_char, end_char, token_count, text) for windows of max_tokens
+    word pieces of the model's own tokenizer, advancing by max_tokens - overlap.
+    Blocks are tokenized one at a time; only the text of the open window is kept.
+    """
+    step = max(1, max_tokens - max(0, overlap))
+    window = deque()  # (start, end) of each token in the current window
+    fresh = 0  # tokens not yet covered by an emitted window
+    buffer = ""  # text from buffer_base up to the end of the current block
+    buffer_base = 0
+    position = 0
+
+    for block in blocks:
+        buffer += block
+        encoded = tokenizer(
+            block,
+            add_special_tokens=False,
+            return_offsets_mapping=True,
+            return_attention_mask=False,
+            return_token_type_ids=False,
+            verbose=False
+        )
+        for token_start, token_end in encoded["offset_mapping"]:
+            if token_end <= token_start:
+                continue
+            window.append((position + token_start, position + token_end))
+            fresh += 1
+            if len(window) == max_tokens:
+                start, end = window[0][0], window[-1][1]
+                yield start, end, max_tokens, window_text(buffer, start - buffer_base, end - buffer_base)
+                fresh = 0
+                for _ in range(step):
+                    window.popleft()
+        position += len(block)
+
+        # Drop text no open window can reach
+        keep_from = window[0][0] if window else position
+        buffer = buffer[keep_from - buffer_base:]
+        buffer_base = keep_from
+
+    if fresh:
+        start, end = window[0][0], window[-1][1]
+        yield start, end, len(window), window_text(buffer, start - buffer_base, end - buffer_base)
+
+
+_GEAR_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def _cdc_mask(average_gap: int) -> int:
+    """Top-bit mask that matches once per ~average_gap words (gear hash top bits span the last 64 words)"""
+    bits = max(1, min(32, round(math.log2(max(2, average_gap)))))
+    return ((1 << bits) - 1) << (64 - bits)
+
+
+def iter_stream_word_windows(
+    blocks: Iterable[str],
+    chunk_size: int = 512,
+    overlap: int = 50,
+    content_defined: bool = False
+) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    Yield (start_char, end_char, word_count, text) of word windows over a
+    stream of text blocks, holding only the words of the open window.
+
+    Fixed: windows of chunk_size words advancing by chunk_size - overlap.
+    Content-defined: a gear rolling hash over word hashes picks boundaries, so
+    a boundary depends only on the words just before it and a local edit
+    leaves every later chunk (and chunk_hash) unchanged. Chunks hold between
+    chunk_size // 4 and chunk_size words; overlap repeats trailing words.
+    """
+    max_words = max(1, chunk_size)
+    if content_defined:
+        keep = max(0, min(overlap, max_words // 2))
+        min_words = max(1, max_words // 4)
+        mask = _cdc_mask((max_words - min_words) // 2)
+    else:
+        keep = max_words - max(1, max_words - max(0, overlap))
+
+    window = deque()  # (start, end, word) of the open window, carried words first
+    fresh = 0  # words not yet covered by an emitted window
+    rolling = 0
+    position = 0
+
+    for block in blocks:
+        for match in _WORD_SPANS.finditer(block):
+            word = match.group()
+            window.append((position + match.start(), position + match.end(), word))
+            fresh += 1
+
+            if content_defined:
+                rolling = ((rolling << 1) + zlib.crc32(word.encode("utf-8"))) & _GEAR_MASK64
+                cut = len(window) >= max_words or (fresh >= min_words and not rolling & mask)
+            else:
+                cut = len(window) >= max_words
+
+            if cut:
+                yield window[0][0], window[-1][1], len(window), " ".join(w for _, _, w in window)
+                fresh = 0
+                while len(window) > keep:
+                    window.popleft()
+        position += len(block)
+
+    if fresh:
+        yield window[0][0], window[-1][1], len(window), " ".join(w for _, _, w in window)
+
+
+def iter_content_defined_windows(text: str, chunk_size: int = 512, overlap: int = 0) -> Iterator[Tuple[int, int, int, str]]:
+    """Content-defined chunks of an in-memory text (see iter_stream_word_windows)"""
+    return iter_stream_word_windows(iter_text_blocks(text), chunk_size, overlap, content_defined=True)
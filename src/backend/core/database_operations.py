@@ -3,15 +3,24 @@ Database Operations - Simple CRUD for Files and Embeddings
 Clean database interactions without complex service layers
 """
 
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import List, Optional, Dict, Any
 from uuid import uuid4
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, update
+from sqlalchemy import func, select, delete, insert, update
 from sqlalchemy.orm import selectinload
 
-from src.backend.models.database import File, EmbeddingChunk
+from src.backend.models.database import File, EmbeddingChunk, SyncOperation
 from src.backend.core.document_discovery import FileInfo
 from src.backend.core.embedding_engine import EmbeddedChunk
+from src.backend.simple_embedder import compute_chunk_hash
+
+# Keep IN (...) lists well below driver parameter limits
+CHUNK_HASH_LOOKUP_BATCH = 1000
+
+# Rows displaced from an index are parked above any real chunk index until moved or deleted
+PARKED_INDEX_OFFSET = 1 << 30
 
 
 async def create_file_record(
@@ -64,18 +73,29 @@ async def delete_file_record(db: AsyncSession, file_record: File) -> None:
     await db.commit()
 
 
+async def delete_file_chunks(db: AsyncSession, file_id, commit: bool = True) -> None:
+    """Delete all of a file's embeddings, keeping the file record"""
+    await db.execute(delete(EmbeddingChunk).where(EmbeddingChunk.file_id == file_id))
+    if commit:
+        await db.commit()
+
+
 async def set_file_status(
     db: AsyncSession,
     file_record: File,
     status: str,
-    error_message: Optional[str] = None
+    error_message: Optional[str] = None,
+    commit: bool = True
 ) -> None:
-    """Update file sync status"""
+    """Update file sync status (synced files record when, the per-file checkpoint of a sync)"""
     file_record.sync_status = status
     if error_message:
         file_record.sync_error = error_message
+    if status == "synced":
+        file_record.sync_completed_at = datetime.now(timezone.utc)
     
-    await db.commit()
+    if commit:
+        await db.commit()
 
 
 async def save_embeddings(
@@ -87,6 +107,10 @@ async def save_embeddings(
     if not embedded_chunks:
         return 0
     
+    # New simple dict format from simple_embedder: diff against stored rows
+    if isinstance(embedded_chunks[0], dict):
+        return await _save_chunk_dicts(db, file_record, embedded_chunks)
+    
     # Delete existing embeddings for this file
     await db.execute(
         delete(EmbeddingChunk).where(EmbeddingChunk.file_id == file_record.id)
@@ -95,38 +119,20 @@ async def save_embeddings(
     # Create new embedding records
     embedding_records = []
     
-    # Handle both old EmbeddedChunk objects and new simple dict format
-    for i, embedded_chunk in enumerate(embedded_chunks):
-        if isinstance(embedded_chunk, dict):
-            # New simple format from simple_embedder
-            import hashlib
-            chunk_text = embedded_chunk["text"]
-            chunk_hash = hashlib.sha256(chunk_text.encode()).hexdigest()
-            
-            embedding_record = EmbeddingChunk(
-                file_id=file_record.id,
-                tenant_slug=file_record.tenant_slug,
-                chunk_index=embedded_chunk["index"],
-                chunk_content=chunk_text,
-                chunk_hash=chunk_hash,
-                token_count=len(chunk_text.split()),
-                embedding=embedded_chunk["embedding"],
-                embedding_model=embedded_chunk["model"]
-            )
-        else:
-            # Old EmbeddedChunk object format (for backward compatibility)
-            chunk = embedded_chunk.chunk
-            embedding_record = EmbeddingChunk(
-                file_id=file_record.id,
-                tenant_slug=file_record.tenant_slug,
-                chunk_index=chunk.index,
-                text=chunk.text,
-                token_count=getattr(chunk, 'token_count', None),
-                start_char=getattr(chunk, 'start_char', None),
-                end_char=getattr(chunk, 'end_char', None),
-                embedding=embedded_chunk.embedding,
-                embedding_model=embedded_chunk.embedding_model
-            )
+    # Old EmbeddedChunk object format (for backward compatibility)
+    for embedded_chunk in embedded_chunks:
+        chunk = embedded_chunk.chunk
+        embedding_record = EmbeddingChunk(
+            file_id=file_record.id,
+            tenant_slug=file_record.tenant_slug,
+            chunk_index=chunk.index,
+            text=chunk.text,
+            token_count=getattr(chunk, 'token_count', None),
+            start_char=getattr(chunk, 'start_char', None),
+            end_char=getattr(chunk, 'end_char', None),
+            embedding=embedded_chunk.embedding,
+            embedding_model=embedded_chunk.embedding_model
+        )
         embedding_records.append(embedding_record)
     
     # Bulk insert
@@ -136,6 +142,166 @@ async def save_embeddings(
     return len(embedding_records)
 
 
+class FileChunkRows:
+    """
+    Stored chunk rows of one file, matched against new chunks window by window.
+    Rows are matched by (chunk_hash, model): unchanged rows stay put, moved rows
+    only get a new chunk_index, and rows never matched are deleted at the end.
+    """
+    
+    def __init__(self, file_id, rows):
+        self.file_id = file_id
+        self.all_ids = [row_id for row_id, _, _, _ in rows]
+        self.available: Dict[tuple, List[tuple]] = {}
+        self.holders: Dict[int, Any] = {}  # chunk_index -> id of the stored row sitting there
+        self.kept = set()
+        self.unchanged = 0
+        self.moved = 0
+        self.inserted = 0
+        
+        for row_id, chunk_index, chunk_hash, model in rows:
+            self.available.setdefault((chunk_hash, model), []).append((chunk_index, row_id))
+            self.holders[chunk_index] = row_id
+        for matches in self.available.values():
+            matches.sort(reverse=True)  # pop() takes the lowest index first, keeping order stable
+
+
+async def load_file_chunk_rows(db: AsyncSession, file_id) -> FileChunkRows:
+    """Load (id, index, hash, model) of a file's stored chunks - no content, no vectors"""
+    result = await db.execute(
+        select(EmbeddingChunk.id, EmbeddingChunk.chunk_index, EmbeddingChunk.chunk_hash, EmbeddingChunk.embedding_model)
+        .where(EmbeddingChunk.file_id == file_id)
+    )
+    return FileChunkRows(file_id, result.all())
+
+
+async def apply_chunk_window(db: AsyncSession, rows: FileChunkRows, chunks: List[dict], model_name: str) -> List[dict]:
+    """
+    Reuse stored rows for a window of chunks and free the indices the rest will take.
+    Returns the chunks that still need a row (and therefore a vector).
+    """
+    moved = []
+    inserts = []
+    for chunk in chunks:
+        chunk["hash"] = chunk.get("hash") or compute_chunk_hash(chunk["text"])
+        chunk["model"] = model_name
+        matches = rows.available.get((chunk["hash"], model_name))
+        if matches:
+            old_index, row_id = matches.pop()
+            rows.kept.add(row_id)
+            if old_index == chunk["index"]:
+                rows.unchanged += 1
+            else:
+                moved.append((row_id, old_index, chunk["index"], chunk.get("page_number")))
+        else:
+            inserts.append(chunk)
+    
+    # uq_file_chunk_index is checked per row: park whatever sits on a target index first
+    targets = [new_index for _, _, new_index, _ in moved] + [chunk["index"] for chunk in inserts]
+    parked = [rows.holders.pop(index) for index in targets if index in rows.holders]
+    for row_id, old_index, _, _ in moved:
+        if rows.holders.get(old_index) == row_id:
+            del rows.holders[old_index]
+    
+    if parked:
+        await db.execute(
+            update(EmbeddingChunk)
+            .where(EmbeddingChunk.id.in_(parked))
+            .values(chunk_index=EmbeddingChunk.chunk_index + PARKED_INDEX_OFFSET)
+        )
+    if moved:
+        await db.execute(
+            update(EmbeddingChunk),
+            [
+                {"id": row_id, "chunk_index": new_index, "page_number": page_number}
+                for row_id, _, new_index, page_number in moved
+            ]
+        )
+    
+    rows.moved += len(moved)
+    return inserts
+
+
+async def insert_chunk_window(
+    db: AsyncSession,
+    file_record: File,
+    rows: FileChunkRows,
+    chunks: List[dict],
+    commit: bool = True
+) -> None:
+    """Insert embedded chunks returned by apply_chunk_window (one multi-row INSERT) and commit the window"""
+    if chunks:
+        await db.execute(insert(EmbeddingChunk), [
+            {
+                "file_id": file_record.id,
+                "tenant_slug": file_record.tenant_slug,
+                "chunk_index": chunk["index"],
+                "chunk_content": chunk["text"],
+                "chunk_hash": chunk["hash"],
+                "token_count": chunk.get("token_count") or len(chunk["text"].split()),
+                "page_number": chunk.get("page_number"),
+                "embedding": chunk["embedding"],
+                "embedding_model": chunk["model"]
+            }
+            for chunk in chunks
+        ])
+    rows.inserted += len(chunks)
+    if commit:
+        await db.commit()
+
+
+async def finish_file_chunk_rows(db: AsyncSession, rows: FileChunkRows, commit: bool = True) -> Dict[str, int]:
+    """Delete stored rows no chunk matched; returns the file's unchanged/moved/inserted/removed counts"""
+    removed = [row_id for row_id in rows.all_ids if row_id not in rows.kept]
+    for i in range(0, len(removed), CHUNK_HASH_LOOKUP_BATCH):
+        await db.execute(delete(EmbeddingChunk).where(EmbeddingChunk.id.in_(removed[i:i + CHUNK_HASH_LOOKUP_BATCH])))
+    if commit:
+        await db.commit()
+    
+    return {
+        "unchanged": rows.unchanged,
+        "moved": rows.moved,
+        "inserted": rows.inserted,
+        "removed": len(removed)
+    }
+
+
+async def _save_chunk_dicts(db: AsyncSession, file_record: File, chunks: List[dict]) -> int:
+    """Whole-file save of embedded chunk dicts through the window diff"""
+    rows = await load_file_chunk_rows(db, file_record.id)
+    inserts = await apply_chunk_window(db, rows, chunks, chunks[0]["model"])
+    await insert_chunk_window(db, file_record, rows, inserts)
+    await finish_file_chunk_rows(db, rows)
+    return len(chunks)
+
+
+async def get_cached_embeddings(
+    db: AsyncSession,
+    tenant_slug: str,
+    chunk_hashes: List[str],
+    embedding_model: str
+) -> Dict[str, Any]:
+    """Look up already-computed vectors by (chunk_hash, embedding_model) within a tenant"""
+    cached = {}
+    unique_hashes = list(dict.fromkeys(chunk_hashes))
+    
+    for i in range(0, len(unique_hashes), CHUNK_HASH_LOOKUP_BATCH):
+        batch = unique_hashes[i:i + CHUNK_HASH_LOOKUP_BATCH]
+        result = await db.execute(
+            select(EmbeddingChunk.chunk_hash, EmbeddingChunk.embedding)
+            .where(
+                EmbeddingChunk.tenant_slug == tenant_slug,
+                EmbeddingChunk.embedding_model == embedding_model,
+                EmbeddingChunk.chunk_hash.in_(batch),
+                EmbeddingChunk.embedding.is_not(None)
+            )
+        )
+        for chunk_hash, embedding in result:
+            cached.setdefault(chunk_hash, embedding)
+    
+    return cached
+
+
 async def get_file_by_path(db: AsyncSession, tenant_slug: str, file_path: str) -> Optional[File]:
     """Get file record by path"""
     result = await db.execute(
@@ -147,12 +313,15 @@ async def get_file_by_path(db: AsyncSession, tenant_slug: str, file_path: str) -
     return result.scalar_one_or_none()
 
 
-async def get_files_for_tenant(db: AsyncSession, tenant_slug: str) -> List[File]:
-    """Get all files for a tenant"""
+async def get_files_for_tenant(db: AsyncSession, tenant_slug: str) -> list:
+    """Get all files for a tenant as (id, filename, file_path, file_size, file_hash, sync_status, updated_at) rows"""
     result = await db.execute(
-        select(File).where(File.tenant_slug == tenant_slug)
+        select(
+            File.id, File.filename, File.file_path, File.file_size,
+            File.file_hash, File.sync_status, File.updated_at
+        ).where(File.tenant_slug == tenant_slug)
     )
-    return result.scalars().all()
+    return result.all()
 
 
 async def get_embeddings_for_file(db: AsyncSession, file_id) -> List[EmbeddingChunk]:
@@ -167,13 +336,13 @@ async def get_embeddings_for_file(db: AsyncSession, file_id) -> List[EmbeddingCh
 async def search_embeddings(
     db: AsyncSession,
     tenant_slug: str,
-    query_embedding: List[float],
+    query_embedding: np.ndarray,
     limit: int = 10,
     similarity_threshold: float = 0.0
 ) -> List[EmbeddingChunk]:
     """Search for similar embeddings using cosine similarity"""
-    # Convert query embedding to pgvector format
-    query_vector = f"[{','.join(map(str, query_embedding))}]"
+    # float32 array, bound through the binary pgvector codec
+    query_vector = np.ascontiguousarray(query_embedding, dtype=np.float32)
     
     # Use pgvector cosine similarity
     result = await db.execute(
@@ -195,38 +364,86 @@ async def search_embeddings(
 
 
 async def get_tenant_stats(db: AsyncSession, tenant_slug: str) -> dict:
-    """Get statistics for a tenant"""
-    # Count files
-    file_result = await db.execute(
-        select(File).where(File.tenant_slug == tenant_slug)
+    """
+    Get statistics for a tenant
+    Counts come from SQL COUNT / GROUP BY over covering indexes; only the
+    names of files not yet synced are fetched
+    """
+    # Status breakdown
+    status_result = await db.execute(
+        select(File.sync_status, func.count())
+        .where(File.tenant_slug == tenant_slug)
+        .group_by(File.sync_status)
     )
-    files = file_result.scalars().all()
+    status_counts = {status: count for status, count in status_result.all()}
     
     # Count embeddings
-    embedding_result = await db.execute(
-        select(EmbeddingChunk).where(EmbeddingChunk.tenant_slug == tenant_slug)
+    total_chunks = await db.scalar(
+        select(func.count()).select_from(EmbeddingChunk).where(EmbeddingChunk.tenant_slug == tenant_slug)
     )
-    embeddings = embedding_result.scalars().all()
     
-    # Status breakdown
-    status_counts = {}
-    for file in files:
-        status = file.sync_status
-        status_counts[status] = status_counts.get(status, 0) + 1
+    # Names of files that are not synced
+    files_by_status = {"processing": [], "failed": [], "pending": []}
+    if any(status_counts.get(status) for status in files_by_status):
+        name_result = await db.execute(
+            select(File.sync_status, File.filename)
+            .where(File.tenant_slug == tenant_slug, File.sync_status.in_(list(files_by_status)))
+        )
+        for status, filename in name_result.all():
+            files_by_status[status].append(filename)
     
     return {
-        "total_files": len(files),
-        "total_chunks": len(embeddings),
+        "total_files": sum(status_counts.values()),
+        "total_chunks": total_chunks or 0,
         "status_breakdown": status_counts,
-        "files_by_status": {
-            "completed": [f for f in files if f.sync_status == "completed"],
-            "processing": [f for f in files if f.sync_status == "processing"],
-            "failed": [f for f in files if f.sync_status == "failed"],
-            "pending": [f for f in files if f.sync_status == "pending"]
-        }
+        "files_by_status": files_by_status
     }
 
 
+def sync_operation_to_dict(operation: SyncOperation) -> dict:
+    """API view of a sync_operations row"""
+    def timestamp(value):
+        return value.isoformat() if value else None
+    
+    return {
+        "sync_id": str(operation.id),
+        "operation_type": operation.operation_type,
+        "status": operation.status,
+        "started_at": timestamp(operation.started_at),
+        "completed_at": timestamp(operation.completed_at),
+        "heartbeat_at": timestamp(operation.heartbeat_at),
+        "progress": {
+            "stage": operation.progress_stage,
+            "percentage": operation.progress_percentage,
+            "current_file_index": operation.current_file_index,
+            "total_files": operation.total_files_to_process,
+            "current_file_name": operation.current_file_name
+        },
+        "files_processed": operation.files_processed or 0,
+        "files_added": operation.files_added or 0,
+        "files_updated": operation.files_updated or 0,
+        "files_deleted": operation.files_deleted or 0,
+        "chunks_created": operation.chunks_created or 0,
+        "processing_speed_files_per_min": operation.processing_speed_files_per_min,
+        "processing_speed_chunks_per_min": operation.processing_speed_chunks_per_min,
+        "memory_usage_mb": operation.memory_usage_mb,
+        "error_message": operation.error_message,
+        "error_details": operation.error_details,
+        "resumed_from": (operation.sync_config or {}).get("resumed_from")
+    }
+
+
+async def get_sync_operations(db: AsyncSession, tenant_slug: str, limit: int = 10) -> List[dict]:
+    """Most recent sync operations of a tenant, newest first"""
+    result = await db.execute(
+        select(SyncOperation)
+        .where(SyncOperation.tenant_slug == tenant_slug)
+        .order_by(SyncOperation.started_at.desc())
+        .limit(limit)
+    )
+    return [sync_operation_to_dict(operation) for operation in result.scalars().all()]
+
+
 async def cleanup_orphaned_embeddings(db: AsyncSession) -> int:
     """Clean up embeddings that don't have corresponding file records"""
     # Find embeddings without files
@@ -259,4 +476,15 @@ async def reset_failed_files(db: AsyncSession, tenant_slug: str) -> int:
         .values(sync_status="pending", sync_error=None)
     )
     await db.commit()
+    return result.rowcount
+
+
+async def reset_processing_files(db: AsyncSession, tenant_slug: str) -> int:
+    """Return files an interrupted sync of the tenant left in 'processing' to pending"""
+    result = await db.execute(
+        update(File)
+        .where(File.tenant_slug == tenant_slug, File.sync_status == "processing")
+        .values(sync_status="pending", sync_error="Interrupted sync")
+    )
+    await db.commit()
     return result.rowcount
\ No newline at end of file
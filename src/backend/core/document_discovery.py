@@ -3,15 +3,32 @@ Document Discovery - Filesystem vs Database Comparison
 Simple functions to detect what files need syncing
 """
 
+import asyncio
 import hashlib
+import json
+import mmap
+import os
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Set, Optional
 from dataclasses import dataclass
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
 
+from src.backend.config.settings import get_settings
+from src.backend.core.merkle_manifest import build_merkle_tree, diff_merkle_trees, load_synced_tree, save_synced_tree
 from src.backend.models.database import File
 
+# Files modified this close to a scan may change again within the same mtime tick,
+# so their signature is recorded without a hash and they are rehashed next time
+RACY_WINDOW_NS = 2_000_000_000
+
+# File rows looked up per IN (...) query when planning specific paths
+PATH_LOOKUP_BATCH = 1000
+
 
 @dataclass
 class FileInfo:
@@ -28,96 +45,353 @@ class SyncPlan:
     new_files: List[FileInfo]
     updated_files: List[tuple[File, FileInfo]]  # (db_record, fs_info)
     deleted_files: List[File]
+    fs_files: Optional[List[FileInfo]] = None  # full scan behind the plan (recorded after the sync)
     
     @property
     def total_changes(self) -> int:
         return len(self.new_files) + len(self.updated_files) + len(self.deleted_files)
 
 
-def calculate_file_hash(file_path: Path) -> str:
-    """Calculate SHA256 hash of file content"""
+def calculate_file_hash(file_path: Path, buffer_bytes: int = 1024 * 1024, use_mmap: bool = False) -> str:
+    """
+    Calculate SHA256 hash of file content
+    Reads into one reused large buffer (or hashes an mmap of the file);
+    hashlib releases the GIL on big updates, so threads hash in parallel
+    """
     hash_sha256 = hashlib.sha256()
     try:
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_sha256.update(chunk)
+        with open(file_path, "rb", buffering=0) as f:
+            if use_mmap:
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        hash_sha256.update(mapped)
+                return hash_sha256.hexdigest()
+            
+            buffer = bytearray(buffer_bytes)
+            view = memoryview(buffer)
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                hash_sha256.update(view[:size])
         return hash_sha256.hexdigest()
     except Exception:
         return ""
 
 
-def scan_filesystem(tenant_slug: str, upload_dir: str = "./data/uploads") -> List[FileInfo]:
-    """Scan filesystem for tenant files"""
+def hash_files(file_paths: List[Path]) -> List[str]:
+    """Hash files concurrently on hash_workers threads; "" for unreadable files"""
+    settings = get_settings()
+    workers = settings.hash_workers or os.cpu_count() or 1
+    
+    def digest(file_path: Path) -> str:
+        return calculate_file_hash(file_path, settings.hash_buffer_bytes, settings.hash_use_mmap)
+    
+    if workers == 1 or len(file_paths) < 2:
+        return [digest(file_path) for file_path in file_paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(file_paths)), thread_name_prefix="hash") as executor:
+        return list(executor.map(digest, file_paths))
+
+
+def _manifest_path(tenant_slug: str) -> Path:
+    return Path(get_settings().scan_manifest_dir) / f"{tenant_slug}.json"
+
+
+def load_scan_manifest(tenant_slug: str) -> Dict:
+    """{"verified_at": epoch seconds of the last full verify, "files": {path: [size, mtime_ns, inode, hash]}}"""
+    try:
+        with open(_manifest_path(tenant_slug), encoding="utf-8") as handle:
+            manifest = json.load(handle)
+        if isinstance(manifest.get("files"), dict):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"verified_at": 0, "files": {}}
+
+
+def save_scan_manifest(tenant_slug: str, manifest: Dict) -> None:
+    """Atomic write of a tenant's scan manifest"""
+    path = _manifest_path(tenant_slug)
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not save scan manifest for {tenant_slug}: {e}")
+        temp_path.unlink(missing_ok=True)
+
+
+def scan_filesystem(tenant_slug: str, upload_dir: str = "./data/uploads", full_verify: bool = False) -> List[FileInfo]:
+    """
+    Scan filesystem for tenant files
+    Only files whose (size, mtime_ns, inode) changed since the last scan are
+    rehashed; full_verify (or an expired verify interval) rehashes everything
+    """
     tenant_dir = Path(upload_dir) / tenant_slug
     files = []
     
     if not tenant_dir.exists():
         return files
     
+    settings = get_settings()
+    manifest = load_scan_manifest(tenant_slug)
+    interval = settings.scan_full_verify_interval_seconds
+    if interval > 0 and time.time() - manifest.get("verified_at", 0) >= interval:
+        full_verify = True
+    known = {} if full_verify else manifest["files"]
+    
+    # Pass 1: stat every file and reuse hashes whose signature is unchanged
+    scan_started_ns = time.time_ns()
+    scanned = []  # (relative_path, file_path, stat, signature, known hash or None)
     for file_path in tenant_dir.rglob("*"):
-        if file_path.is_file():
-            try:
-                relative_path = str(file_path.relative_to(upload_dir))
-                file_hash = calculate_file_hash(file_path)
-                
-                files.append(FileInfo(
-                    path=relative_path,
-                    name=file_path.name,
-                    size=file_path.stat().st_size,
-                    hash=file_hash
-                ))
-            except Exception:
-                # Skip files we can't read
+        try:
+            st = file_path.stat()
+            if not stat.S_ISREG(st.st_mode):
                 continue
+            relative_path = str(file_path.relative_to(upload_dir))
+            signature = [st.st_size, st.st_mtime_ns, st.st_ino]
+            
+            previous = known.get(relative_path)
+            known_hash = previous[3] if previous and previous[:3] == signature else None
+            scanned.append((relative_path, file_path, st, signature, known_hash))
+        except Exception:
+            # Skip files we can't stat
+            continue
     
+    # Pass 2: hash the rest concurrently
+    pending = [item for item in scanned if not item[4]]
+    hash_started = time.perf_counter()
+    new_hashes = iter(hash_files([file_path for _, file_path, _, _, _ in pending]))
+    hash_seconds = time.perf_counter() - hash_started
+    hashed_bytes = sum(st.st_size for _, _, st, _, _ in pending)
+    
+    entries = {}
+    for relative_path, file_path, st, signature, known_hash in scanned:
+        file_hash = known_hash or next(new_hashes)
+        if not file_hash:
+            continue  # Skip files we can't read
+        
+        racy = scan_started_ns - st.st_mtime_ns < RACY_WINDOW_NS
+        entries[relative_path] = signature + [None if racy else file_hash]
+        files.append(FileInfo(
+            path=relative_path,
+            name=file_path.name,
+            size=st.st_size,
+            hash=file_hash
+        ))
+    
+    if full_verify or entries != manifest["files"]:
+        save_scan_manifest(tenant_slug, {
+            "verified_at": time.time() if full_verify else manifest.get("verified_at", 0),
+            "files": entries
+        })
+    
+    mode = "full verify" if full_verify else "stat fast path"
+    throughput = hashed_bytes / (1024 * 1024) / hash_seconds if hash_seconds > 0 else 0.0
+    print(f"🔍 Scanned {len(scanned)} files for {tenant_slug} ({mode}): {len(pending)} hashed "
+          f"({hashed_bytes / (1024 * 1024):.1f} MB at {throughput:.0f} MB/s), {len(scanned) - len(pending)} unchanged")
     return files
 
 
-async def get_database_files(db: AsyncSession, tenant_slug: str) -> List[File]:
-    """Get all files for tenant from database"""
+async def get_database_file_index(db: AsyncSession, tenant_slug: str) -> list:
+    """
+    (id, file_path, file_hash, file_size, sync_status) rows of every tenant file
+    Column projection only, answered from idx_files_plan_covering
+    """
     result = await db.execute(
-        select(File).where(File.tenant_slug == tenant_slug)
+        select(File.id, File.file_path, File.file_hash, File.file_size, File.sync_status)
+        .where(File.tenant_slug == tenant_slug)
     )
-    return result.scalars().all()
+    return result.all()
+
+
+async def load_files_by_id(db: AsyncSession, file_ids: list) -> Dict:
+    """Full File entities for the given ids (only rows a plan will modify)"""
+    files = {}
+    for i in range(0, len(file_ids), PATH_LOOKUP_BATCH):
+        result = await db.execute(select(File).where(File.id.in_(file_ids[i:i + PATH_LOOKUP_BATCH])))
+        files.update((f.id, f) for f in result.scalars().all())
+    return files
 
 
 async def create_sync_plan(
     db: AsyncSession, 
     tenant_slug: str, 
-    force_full_sync: bool = False
+    force_full_sync: bool = False,
+    resume_after: Optional[datetime] = None
 ) -> SyncPlan:
-    """Compare filesystem vs database and create sync plan"""
+    """
+    Compare filesystem vs database and create sync plan
+    With a stored Merkle tree of the last sync (and an unchanged database
+    fingerprint) only differing subtrees are compared, against their own rows;
+    equal root hashes return an empty plan without loading any File rows.
+    Rows not 'synced' (failed, or left pending/processing by an interrupted
+    sync) are always retried; a resumed full sync (resume_after) skips
+    unchanged files it already synced since that time
+    """
+    
+    # Get current state (a forced full sync also rehashes every file)
+    # Stat and hashing run off the event loop
+    fs_files = await asyncio.to_thread(scan_filesystem, tenant_slug, full_verify=force_full_sync)
     
-    # Get current state
-    fs_files = scan_filesystem(tenant_slug)
-    db_files = await get_database_files(db, tenant_slug)
+    synced = None if force_full_sync else load_synced_tree(tenant_slug)
+    if synced is not None and synced["fingerprint"] == await get_file_fingerprint(db, tenant_slug):
+        tree = build_merkle_tree({f.path: f.hash for f in fs_files}, tenant_slug)
+        changed, deleted = diff_merkle_trees(tree, synced["tree"], tenant_slug)
+        fs_map = {f.path: f for f in fs_files}
+        plan = await _plan_for_paths(db, tenant_slug, [fs_map[path] for path in changed], deleted)
+        plan.fs_files = fs_files
+        print(f"🌳 Merkle plan for {tenant_slug}: {len(changed)} changed, {len(deleted)} deleted paths")
+        return plan
+    
+    db_rows = await get_database_file_index(db, tenant_slug)
     
     # Create lookup maps
-    fs_map = {f.path: f for f in fs_files}
-    db_map = {f.file_path: f for f in db_files}
+    db_map = {row.file_path: row for row in db_rows}
+    
+    # Per-file checkpoints of the interrupted full sync being resumed
+    done_ids = set()
+    if force_full_sync and resume_after is not None:
+        result = await db.execute(
+            select(File.id).where(
+                File.tenant_slug == tenant_slug,
+                File.sync_status == "synced",
+                File.sync_completed_at >= resume_after
+            )
+        )
+        done_ids = set(result.scalars().all())
     
     # Find changes
     new_files = []
-    updated_files = []
-    deleted_files = []
+    updated = []  # (file id, fs_info)
     
     # Check filesystem files against database
     for fs_file in fs_files:
-        db_file = db_map.get(fs_file.path)
+        db_row = db_map.get(fs_file.path)
         
-        if not db_file:
+        if not db_row:
             # New file
             new_files.append(fs_file)
-        elif db_file.file_hash != fs_file.hash or force_full_sync:
-            # Updated file or force sync
-            updated_files.append((db_file, fs_file))
+        elif db_row.file_hash != fs_file.hash or db_row.sync_status != "synced":
+            # Updated file, or not synced yet
+            updated.append((db_row.id, fs_file))
+        elif force_full_sync and db_row.id not in done_ids:
+            # Force sync (minus files a resumed run already finished)
+            updated.append((db_row.id, fs_file))
     
     # Check for deleted files (in database but not on filesystem)
     fs_paths = set(f.path for f in fs_files)
-    deleted_files = [
-        db_file for db_file in db_files 
-        if db_file.file_path not in fs_paths
-    ]
+    deleted_ids = [row.id for row in db_rows if row.file_path not in fs_paths]
+    
+    # Full entities only for the rows the sync will modify
+    entities = await load_files_by_id(db, [file_id for file_id, _ in updated] + deleted_ids)
+    updated_files = [(entities[file_id], fs_file) for file_id, fs_file in updated if file_id in entities]
+    deleted_files = [entities[file_id] for file_id in deleted_ids if file_id in entities]
+    
+    return SyncPlan(
+        new_files=new_files,
+        updated_files=updated_files,
+        deleted_files=deleted_files,
+        fs_files=fs_files
+    )
+
+
+async def create_path_sync_plan(
+    db: AsyncSession,
+    tenant_slug: str,
+    relative_paths: List[str],
+    upload_dir: str = "./data/uploads"
+) -> SyncPlan:
+    """
+    Sync plan for specific paths only (relative to upload_dir, under the tenant)
+    Directories expand to the files below them; a missing path deletes its
+    record, or every record below it if it was a directory
+    """
+    upload_root = Path(upload_dir)
+    candidates = {}
+    missing = []
+    for relative_path in relative_paths:
+        path = upload_root / relative_path
+        if Path(relative_path).parts[:1] != (tenant_slug,):
+            continue
+        if path.is_file():
+            candidates[relative_path] = path
+        elif path.is_dir():
+            for file_path in path.rglob("*"):
+                if file_path.is_file():
+                    candidates[str(file_path.relative_to(upload_root))] = file_path
+        else:
+            missing.append(relative_path)
+    
+    # Stat before hashing: a file an upload tool renames or removes meanwhile is
+    # skipped (its own event follows) instead of failing the tenant's batch
+    sizes = {}
+    for relative_path, file_path in list(candidates.items()):
+        try:
+            sizes[relative_path] = file_path.stat().st_size
+        except OSError:
+            del candidates[relative_path]
+    
+    hashes = await asyncio.to_thread(hash_files, list(candidates.values()))
+    fs_files = []
+    for (relative_path, file_path), file_hash in zip(candidates.items(), hashes):
+        if file_hash:
+            fs_files.append(FileInfo(
+                path=relative_path,
+                name=file_path.name,
+                size=sizes[relative_path],
+                hash=file_hash
+            ))
+    
+    return await _plan_for_paths(db, tenant_slug, fs_files, missing, set(candidates), match_below_missing=True)
+
+
+async def _plan_for_paths(
+    db: AsyncSession,
+    tenant_slug: str,
+    fs_files: List[FileInfo],
+    missing: List[str],
+    present: Optional[Set[str]] = None,
+    match_below_missing: bool = False
+) -> SyncPlan:
+    """
+    Compare just these files against their own File rows (no full table load)
+    Missing paths delete their row (or, with match_below_missing, every row
+    below them); rows not 'synced' (failed, or interrupted mid-sync) are
+    retried even if the hash matches
+    """
+    if not fs_files and not missing:
+        return SyncPlan(new_files=[], updated_files=[], deleted_files=[])
+    
+    present = present if present is not None else {f.path for f in fs_files}
+    paths = [f.path for f in fs_files] + missing
+    db_map = {}
+    for i in range(0, len(paths), PATH_LOOKUP_BATCH):
+        result = await db.execute(
+            select(File).where(File.tenant_slug == tenant_slug, File.file_path.in_(paths[i:i + PATH_LOOKUP_BATCH]))
+        )
+        db_map.update((f.file_path, f) for f in result.scalars().all())
+    if match_below_missing and missing:
+        result = await db.execute(
+            select(File).where(
+                File.tenant_slug == tenant_slug,
+                or_(*[File.file_path.startswith(f"{relative_path}/") for relative_path in missing])
+            )
+        )
+        db_map.update((f.file_path, f) for f in result.scalars().all())
+    
+    new_files = []
+    updated_files = []
+    for fs_file in fs_files:
+        db_file = db_map.get(fs_file.path)
+        if not db_file:
+            new_files.append(fs_file)
+        elif db_file.file_hash != fs_file.hash or db_file.sync_status != "synced":
+            updated_files.append((db_file, fs_file))
+    
+    deleted_files = [db_file for path, db_file in db_map.items() if path not in present]
     
     return SyncPlan(
         new_files=new_files,
@@ -126,6 +400,32 @@ async def create_sync_plan(
     )
 
 
+async def get_file_fingerprint(db: AsyncSession, tenant_slug: str) -> str:
+    """Cheap summary of a tenant's File rows; changes whenever rows are added, removed or updated"""
+    result = await db.execute(
+        select(func.count(File.id), func.max(File.updated_at)).where(File.tenant_slug == tenant_slug)
+    )
+    count, last_update = result.one()
+    return f"{count}:{last_update.isoformat() if last_update else ''}"
+
+
+async def record_synced_tree(
+    db: AsyncSession,
+    tenant_slug: str,
+    fs_files: List[FileInfo],
+    failed_paths: Optional[List[str]] = None
+) -> None:
+    """
+    Store the Merkle tree the database now reflects; failed paths get an
+    empty leaf so the next plan revisits them
+    """
+    file_hashes = {f.path: f.hash for f in fs_files}
+    for path in failed_paths or []:
+        file_hashes[path] = ""
+    tree = build_merkle_tree(file_hashes, tenant_slug)
+    save_synced_tree(tenant_slug, tree, await get_file_fingerprint(db, tenant_slug))
+
+
 def get_sync_summary(plan: SyncPlan) -> Dict[str, any]:
     """Get human-readable sync summary"""
     return {
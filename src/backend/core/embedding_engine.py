@@ -3,13 +3,24 @@ Embedding Engine - Configurable Embedding Generation
 Supports multiple models, chunking strategies, and similarity methods
 """
 
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import asyncio
 from pathlib import Path
 
 from src.backend.config.settings import get_settings
+from src.backend.core.batching import encode_length_bucketed
+from src.backend.core.chunking import (
+    iter_content_defined_windows,
+    iter_text_blocks,
+    iter_token_windows,
+    iter_word_windows,
+    model_token_budget,
+    window_text
+)
+from src.backend.core.document_extraction import extract_document
+from src.backend.core.model_registry import get_model_registry
 
 settings = get_settings()
 
@@ -26,6 +37,8 @@ class ChunkingStrategy(str, Enum):
     FIXED_SIZE = "fixed-size"
     SLIDING_WINDOW = "sliding-window"
     SEMANTIC = "semantic"
+    TOKEN_AWARE = "token-aware"
+    CONTENT_DEFINED = "content-defined"
 
 
 class SimilarityMethod(str, Enum):
@@ -60,112 +73,43 @@ class TextChunk:
 class EmbeddedChunk:
     """A chunk with its embedding"""
     chunk: TextChunk
-    embedding: List[float]
+    embedding: Any  # float32 numpy row
     embedding_model: str
 
 
 class SingletonEmbeddingModel:
-    """Singleton embedding model to prevent memory leaks"""
-    _instance = None
-    _model = None
-    _current_model_name = None
+    """Process-wide embedding model access backed by the shared model registry"""
     
     @classmethod
     def get_model(cls, model_name: str):
-        """Get or create embedding model instance"""
-        if cls._instance is None:
-            cls._instance = cls()
-        
-        # Only reload if model changed
-        if cls._current_model_name != model_name:
-            cls._load_model(model_name)
-        
-        return cls._model
-    
-    @classmethod
-    def _load_model(cls, model_name: str):
-        """Load embedding model with GPU optimization"""
-        try:
-            from sentence_transformers import SentenceTransformer
-            import torch
-            import gc
-            
-            # Clear any existing model first
-            if cls._model is not None:
-                print(f"🔄 Clearing existing model")
-                del cls._model
-                if torch.cuda.is_available():
-                    torch.cuda.empty_cache()
-                gc.collect()
-            
-            print(f"🤖 Loading embedding model: {model_name}")
-            
-            # Use GPU if available, otherwise CPU
-            if torch.cuda.is_available():
-                device = 'cuda'
-                print(f"🚀 GPU detected: {torch.cuda.get_device_name()}")
-            else:
-                device = 'cpu'
-                print("💻 Using CPU (no GPU available)")
-            
-            cls._model = SentenceTransformer(model_name, device=device)
-            cls._current_model_name = model_name
-            
-            # Set model to eval mode and optimize memory
-            cls._model.eval()
-            if device == 'cuda':
-                torch.cuda.empty_cache()
-            
-            print(f"✅ Model loaded on {device}")
-            
-        except Exception as e:
-            print(f"❌ Failed to load model {model_name}: {e}")
-            raise
+        """Get a warm embedding model instance"""
+        return get_model_registry().get_model(model_name)
 
 
 def extract_text_from_file(file_path: Path) -> str:
-    """Extract text from file based on extension"""
+    """Extract text from file based on extension (PDFs page by page, the rest as text)"""
     try:
-        suffix = file_path.suffix.lower()
-        
-        if suffix == '.txt':
-            return file_path.read_text(encoding='utf-8', errors='ignore')
-        elif suffix == '.md':
-            return file_path.read_text(encoding='utf-8', errors='ignore')
-        else:
-            # Try as text anyway
-            return file_path.read_text(encoding='utf-8', errors='ignore')
+        return extract_document(file_path).text
     except Exception as e:
         print(f"❌ Failed to extract text from {file_path}: {e}")
         return ""
 
 
-def chunk_text_fixed_size(text: str, chunk_size: int = 512, overlap: int = 50) -> List[TextChunk]:
-    """Fixed-size chunking strategy"""
-    words = text.split()
-    chunks = []
-    start = 0
-    
-    while start < len(words):
-        end = min(start + chunk_size, len(words))
-        chunk_words = words[start:end]
-        chunk_text = " ".join(chunk_words)
-        
-        # Calculate character positions (approximate)
-        start_char = len(" ".join(words[:start])) if start > 0 else 0
-        end_char = start_char + len(chunk_text)
-        
-        chunks.append(TextChunk(
-            text=chunk_text,
-            index=len(chunks),
+def iter_chunks_fixed_size(text: str, chunk_size: int = 512, overlap: int = 50) -> Iterator[TextChunk]:
+    """Fixed-size chunks streamed in one pass; start_char/end_char index into text"""
+    for index, (start_char, end_char, word_count) in enumerate(iter_word_windows(text, chunk_size, overlap)):
+        yield TextChunk(
+            text=window_text(text, start_char, end_char),
+            index=index,
             start_char=start_char,
             end_char=end_char,
-            token_count=len(chunk_words)
-        ))
-        
-        start = end - overlap
-    
-    return chunks
+            token_count=word_count
+        )
+
+
+def chunk_text_fixed_size(text: str, chunk_size: int = 512, overlap: int = 50) -> List[TextChunk]:
+    """Fixed-size chunking strategy"""
+    return list(iter_chunks_fixed_size(text, chunk_size, overlap))
 
 
 def chunk_text_sliding_window(text: str, chunk_size: int = 512, overlap: int = 100) -> List[TextChunk]:
@@ -213,9 +157,59 @@ def chunk_text_semantic(text: str, chunk_size: int = 512, overlap: int = 50) ->
     return chunks
 
 
-def chunk_text(text: str, strategy: ChunkingStrategy, chunk_size: int = 512, overlap: int = 50) -> List[TextChunk]:
+def chunk_text_content_defined(text: str, chunk_size: int = 512, overlap: int = 50) -> List[TextChunk]:
+    """Content-defined chunking: rolling-hash boundaries that survive local edits"""
+    return [
+        TextChunk(
+            text=chunk_text,
+            index=index,
+            start_char=start_char,
+            end_char=end_char,
+            token_count=word_count
+        )
+        for index, (start_char, end_char, word_count, chunk_text) in enumerate(
+            iter_content_defined_windows(text, chunk_size, overlap)
+        )
+    ]
+
+
+def chunk_text_token_aware(
+    text: str,
+    model_name: str = EmbeddingModel.MINI_LM.value,
+    chunk_size: int = 512,
+    overlap: int = 50
+) -> List[TextChunk]:
+    """Token-aware chunking: chunk_size and overlap count the model's word pieces, capped at max_seq_length"""
+    model = SingletonEmbeddingModel.get_model(model_name)
+    max_tokens = min(chunk_size, model_token_budget(model))
+    
+    return [
+        TextChunk(
+            text=chunk_text,
+            index=index,
+            start_char=start_char,
+            end_char=end_char,
+            token_count=token_count
+        )
+        for index, (start_char, end_char, token_count, chunk_text) in enumerate(
+            iter_token_windows(iter_text_blocks(text), model.tokenizer, max_tokens, overlap)
+        )
+    ]
+
+
+def chunk_text(
+    text: str,
+    strategy: ChunkingStrategy,
+    chunk_size: int = 512,
+    overlap: int = 50,
+    model_name: str = EmbeddingModel.MINI_LM.value
+) -> List[TextChunk]:
     """Chunk text using specified strategy"""
-    if strategy == ChunkingStrategy.FIXED_SIZE:
+    if strategy == ChunkingStrategy.TOKEN_AWARE:
+        return chunk_text_token_aware(text, model_name, chunk_size, overlap)
+    elif strategy == ChunkingStrategy.CONTENT_DEFINED:
+        return chunk_text_content_defined(text, chunk_size, overlap)
+    elif strategy == ChunkingStrategy.FIXED_SIZE:
         return chunk_text_fixed_size(text, chunk_size, overlap)
     elif strategy == ChunkingStrategy.SLIDING_WINDOW:
         return chunk_text_sliding_window(text, chunk_size, overlap)
@@ -236,7 +230,7 @@ def generate_embeddings(chunks: List[TextChunk], config: EmbeddingConfig) -> Lis
         
         # Get singleton model
         model = SingletonEmbeddingModel.get_model(config.model.value)
-        device = next(model.parameters()).device if hasattr(model, 'parameters') else 'cpu'
+        device = model.device
         is_gpu = device.type == 'cuda'
         
         print(f"🔢 Generating embeddings for {len(chunks)} chunks on {device}")
@@ -244,50 +238,21 @@ def generate_embeddings(chunks: List[TextChunk], config: EmbeddingConfig) -> Lis
         # Extract texts
         texts = [chunk.text for chunk in chunks]
         
-        # Adaptive batch size based on device and text length
-        if is_gpu:
-            # Smaller batches for GPU to prevent OOM
-            avg_text_len = sum(len(text) for text in texts) / len(texts) if texts else 0
-            if avg_text_len > 1000:  # Long texts
-                batch_size = 8
-            elif avg_text_len > 500:  # Medium texts
-                batch_size = 16
-            else:  # Short texts
-                batch_size = 32
-        else:
-            # Larger batches for CPU
-            batch_size = 64
-        
-        embeddings = []
-        
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
-            print(f"   📦 Processing batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1} ({len(batch_texts)} items)")
-            
-            # Generate embeddings with memory optimization
-            with torch.no_grad():  # Disable gradients for inference
-                batch_embeddings = model.encode(
-                    batch_texts,
-                    convert_to_tensor=False,
-                    show_progress_bar=False,
-                    batch_size=min(8, len(batch_texts)) if is_gpu else min(32, len(batch_texts))
-                )
-            
-            embeddings.extend(batch_embeddings)
-            
-            # Aggressive memory cleanup after each batch
-            if is_gpu and torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()  # Wait for GPU operations to complete
-            
-            gc.collect()
+        # Length-bucketed batches under a token budget (less padding than fixed batch sizes)
+        with torch.no_grad():  # Disable gradients for inference
+            embeddings = encode_length_bucketed(
+                model,
+                texts,
+                token_budget=settings.embedding_batch_token_budget,
+                max_batch_size=settings.embedding_batch_size
+            )
         
         # Create embedded chunks
         embedded_chunks = []
         for chunk, embedding in zip(chunks, embeddings):
             embedded_chunks.append(EmbeddedChunk(
                 chunk=chunk,
-                embedding=embedding.tolist() if hasattr(embedding, 'tolist') else list(embedding),
+                embedding=embedding,
                 embedding_model=config.model.value
             ))
         
@@ -325,7 +290,7 @@ def process_file_to_embeddings(
         return []
     
     # Chunk text
-    chunks = chunk_text(text, config.chunking, config.chunk_size, config.chunk_overlap)
+    chunks = chunk_text(text, config.chunking, config.chunk_size, config.chunk_overlap, config.model.value)
     if not chunks:
         print(f"⚠️ No chunks created from {file_path}")
         return []
@@ -356,5 +321,7 @@ def get_available_strategies() -> List[Dict[str, str]]:
     return [
         {"value": ChunkingStrategy.FIXED_SIZE.value, "name": "Fixed Size (Simple)"},
         {"value": ChunkingStrategy.SLIDING_WINDOW.value, "name": "Sliding Window (Overlap)"},
-        {"value": ChunkingStrategy.SEMANTIC.value, "name": "Semantic (Sentence Boundaries)"}
+        {"value": ChunkingStrategy.SEMANTIC.value, "name": "Semantic (Sentence Boundaries)"},
+        {"value": ChunkingStrategy.TOKEN_AWARE.value, "name": "Token-Aware (Model Sequence Length)"},
+        {"value": ChunkingStrategy.CONTENT_DEFINED.value, "name": "Content-Defined (Edit-Stable Boundaries)"}
     ]
\ No newline at end of file
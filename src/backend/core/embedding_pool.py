@@ -0,0 +1,204 @@
+"""
+Embedding Process Pool - Full Syncs Across All CPU Cores
+Worker processes each hold one warm model with a pinned torch thread count;
+chunk shards fan out to the workers and vectors come back through shared memory
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from multiprocessing import get_context, shared_memory
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.backend.config.settings import get_settings
+
+# Per-process state of a pool worker (unused in the API process)
+_worker_models: Dict[str, Any] = {}
+
+
+def _init_worker(threads: int) -> None:
+    """Pin intra-op threads so workers x threads never exceeds the core count"""
+    import torch
+
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+
+
+def _worker_model(model_name: str):
+    """Load a model once per worker process with the configured CPU backend"""
+    model = _worker_models.get(model_name)
+    if model is None:
+        from src.backend.core.inference_backends import load_embedding_model, resolve_backend
+
+        model, _ = load_embedding_model(model_name, resolve_backend(model_name), 'cpu')
+        _worker_models[model_name] = model
+    return model
+
+
+def _attach(shm_name: str) -> shared_memory.SharedMemory:
+    """Attach to the parent's segment without registering it for cleanup here"""
+    try:
+        return shared_memory.SharedMemory(name=shm_name, track=False)
+    except TypeError:  # Python < 3.13
+        return shared_memory.SharedMemory(name=shm_name)
+
+
+def _worker_dimension(model_name: str) -> int:
+    return _worker_model(model_name).get_sentence_embedding_dimension()
+
+
+def _worker_encode_shard(
+    model_name: str,
+    texts: List[str],
+    shm_name: str,
+    total_rows: int,
+    dimension: int,
+    start_row: int,
+    token_budget: int,
+    max_batch_size: int
+) -> int:
+    """Encode one shard and write its rows straight into the shared output matrix"""
+    import torch
+    from src.backend.core.batching import encode_length_bucketed
+
+    model = _worker_model(model_name)
+    with torch.no_grad():
+        vectors = encode_length_bucketed(model, texts, token_budget, max_batch_size)
+
+    shm = _attach(shm_name)
+    try:
+        output = np.ndarray((total_rows, dimension), dtype=np.float32, buffer=shm.buf)
+        output[start_row:start_row + len(texts)] = vectors
+        del output
+    finally:
+        shm.close()
+    return len(texts)
+
+
+class EmbeddingProcessPool:
+    """
+    Process pool for bulk embedding during syncs.
+    Threads in the inference executor share one interpreter; for large tenants
+    separate processes with a fixed thread budget each scale with core count.
+    """
+
+    def __init__(self, workers: int, threads_per_worker: int, shard_size: int):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.shard_size = shard_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),  # fork is unsafe once torch threads exist
+            initializer=_init_worker,
+            initargs=(threads_per_worker,)
+        )
+        self._dimensions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.texts_embedded = 0
+        self.total_seconds = 0.0
+
+    async def _dimension(self, model_name: str) -> int:
+        if model_name not in self._dimensions:
+            future = self._executor.submit(_worker_dimension, model_name)
+            self._dimensions[model_name] = await asyncio.wrap_future(future)
+        return self._dimensions[model_name]
+
+    async def embed(self, texts: Sequence[str], model_name: str) -> np.ndarray:
+        """Embed texts across the workers; returns a float32 matrix in input order"""
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+
+        settings = get_settings()
+        started = time.perf_counter()
+        dimension = await self._dimension(model_name)
+        total_rows = len(texts)
+
+        shm = shared_memory.SharedMemory(create=True, size=total_rows * dimension * 4)
+        try:
+            futures = [
+                self._executor.submit(
+                    _worker_encode_shard,
+                    model_name,
+                    list(texts[start:start + self.shard_size]),
+                    shm.name,
+                    total_rows,
+                    dimension,
+                    start,
+                    settings.embedding_batch_token_budget,
+                    settings.embedding_batch_size
+                )
+                for start in range(0, total_rows, self.shard_size)
+            ]
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+
+            view = np.ndarray((total_rows, dimension), dtype=np.float32, buffer=shm.buf)
+            vectors = view.copy()
+            del view
+        finally:
+            shm.close()
+            shm.unlink()
+
+        with self._lock:
+            self.calls += 1
+            self.texts_embedded += total_rows
+            self.total_seconds += time.perf_counter() - started
+        return vectors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool metrics for monitoring"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "threads_per_worker": self.threads_per_worker,
+                "shard_size": self.shard_size,
+                "calls": self.calls,
+                "texts_embedded": self.texts_embedded,
+                "texts_per_sec": round(self.texts_embedded / self.total_seconds, 1) if self.total_seconds else 0.0
+            }
+
+    def shutdown(self) -> None:
+        """Terminate worker processes"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+@lru_cache()
+def get_embedding_pool() -> Optional[EmbeddingProcessPool]:
+    """Get the process-wide embedding pool, or None when disabled"""
+    settings = get_settings()
+    workers = settings.embedding_pool_workers
+    if workers <= 0:
+        return None
+
+    cores = os.cpu_count() or 1
+    threads = settings.embedding_pool_threads_per_worker or max(1, cores // workers)
+    print(f"🏭 Starting embedding process pool: {workers} workers x {threads} threads")
+    return EmbeddingProcessPool(workers, threads, settings.embedding_pool_shard_size)
+
+
+def should_use_embedding_pool(chunk_count: int) -> bool:
+    """Large embedding jobs go to the process pool; small ones stay on the thread executor"""
+    settings = get_settings()
+    return settings.embedding_pool_workers > 0 and chunk_count >= settings.embedding_pool_min_chunks
+
+
+def get_embedding_pool_stats() -> Optional[Dict[str, Any]]:
+    """Pool stats if the pool was ever started"""
+    if get_embedding_pool.cache_info().currsize and get_embedding_pool() is not None:
+        return get_embedding_pool().get_stats()
+    return None
+
+
+def shutdown_embedding_pool() -> None:
+    """Stop worker processes if the pool was ever created"""
+    if get_embedding_pool.cache_info().currsize:
+        pool = get_embedding_pool()
+        if pool is not None:
+            pool.shutdown()
+        get_embedding_pool.cache_clear()
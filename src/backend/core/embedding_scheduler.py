@@ -0,0 +1,192 @@
+"""
+Embedding Scheduler - Fair Share of Embedding Capacity Across Tenants
+Concurrent syncs no longer run independent embedding loops: every batch
+asks for one of a fixed number of slots, and free slots go to waiting
+batches in weighted fair queuing order (smallest virtual finish time), so
+one tenant's large upload cannot starve another tenant's small one
+
+The budget and its fairness are per worker process: each uvicorn worker
+has its own scheduler, so N workers run up to N x slots batches at once and
+tenants are only balanced against syncs running in the same process
+(sync jobs land on whichever worker received the trigger)
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List
+
+from src.backend.config.settings import get_settings
+
+
+def parse_tenant_weights(spec: str) -> Dict[str, float]:
+    """"tenant1:2,tenant2:0.5" -> {"tenant1": 2.0, "tenant2": 0.5}"""
+    weights = {}
+    for entry in filter(None, (part.strip() for part in spec.split(","))):
+        slug, _, weight = entry.partition(":")
+        try:
+            if float(weight) > 0:
+                weights[slug.strip()] = float(weight)
+        except ValueError:
+            print(f"⚠️ Ignoring invalid embedding weight: {entry}")
+    return weights
+
+
+class TenantQueueStats:
+    """Queue depth and waiting time of one tenant"""
+
+    def __init__(self):
+        self.queued_batches = 0
+        self.queued_chunks = 0
+        self.running_batches = 0
+        self.granted_batches = 0
+        self.chunks_embedded = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def to_dict(self, weight: float) -> Dict[str, Any]:
+        return {
+            "weight": weight,
+            "queued_batches": self.queued_batches,
+            "queued_chunks": self.queued_chunks,
+            "running_batches": self.running_batches,
+            "granted_batches": self.granted_batches,
+            "chunks_embedded": self.chunks_embedded,
+            "avg_wait_seconds": round(self.total_wait_seconds / self.granted_batches, 4) if self.granted_batches else 0.0,
+            "max_wait_seconds": round(self.max_wait_seconds, 4)
+        }
+
+
+class EmbeddingScheduler:
+    """Global budget of embedding slots shared by all tenants' syncs"""
+
+    def __init__(self, slots: int, batch_chunks: int, weights: Dict[str, float]):
+        self.slots = max(1, slots)
+        self.batch_chunks = max(1, batch_chunks)
+        self.weights = weights
+        self._free = self.slots
+        self._waiting: List[tuple] = []  # heap of (finish_tag, seq, start_tag, tenant, cost, enqueued_at, future)
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._last_finish: Dict[str, float] = {}
+        self._tenants: Dict[str, TenantQueueStats] = {}
+
+    def _tenant(self, tenant_slug: str) -> TenantQueueStats:
+        stats = self._tenants.get(tenant_slug)
+        if stats is None:
+            stats = self._tenants[tenant_slug] = TenantQueueStats()
+        return stats
+
+    def _grant(self, tenant_slug: str, cost: int, start_tag: float, waited: float) -> None:
+        self._virtual_time = max(self._virtual_time, start_tag)
+        stats = self._tenant(tenant_slug)
+        stats.running_batches += 1
+        stats.granted_batches += 1
+        stats.total_wait_seconds += waited
+        stats.max_wait_seconds = max(stats.max_wait_seconds, waited)
+
+    async def _acquire(self, tenant_slug: str, cost: int) -> None:
+        # A tenant's next batch starts where its previous one finished (in virtual time),
+        # so heavy tenants fall behind light ones by cost / weight
+        weight = self.weights.get(tenant_slug, 1.0)
+        start_tag = max(self._virtual_time, self._last_finish.get(tenant_slug, 0.0))
+        finish_tag = start_tag + cost / weight
+        self._last_finish[tenant_slug] = finish_tag
+
+        if self._free > 0 and not self._waiting:
+            self._free -= 1
+            self._grant(tenant_slug, cost, start_tag, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (finish_tag, next(self._sequence), start_tag, tenant_slug, cost, time.monotonic(), future))
+        stats = self._tenant(tenant_slug)
+        stats.queued_batches += 1
+        stats.queued_chunks += cost
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(tenant_slug)  # granted just before the cancellation landed
+            else:
+                future.cancel()
+                stats.queued_batches -= 1
+                stats.queued_chunks -= cost
+            raise
+
+    def _release(self, tenant_slug: str) -> None:
+        self._tenant(tenant_slug).running_batches -= 1
+        while self._waiting:
+            _, _, start_tag, waiter, cost, enqueued_at, future = heapq.heappop(self._waiting)
+            if future.cancelled():
+                continue
+            stats = self._tenant(waiter)
+            stats.queued_batches -= 1
+            stats.queued_chunks -= cost
+            self._grant(waiter, cost, start_tag, time.monotonic() - enqueued_at)
+            future.set_result(None)  # the slot passes straight to the waiter
+            return
+        self._free += 1
+
+    async def embed(
+        self,
+        tenant_slug: str,
+        chunks: list,
+        model_name: str,
+        embed_fn: Callable[[list, str], Awaitable[bool]]
+    ) -> bool:
+        """Run embed_fn over chunks in batches of batch_chunks, one slot per batch"""
+        for start in range(0, len(chunks), self.batch_chunks):
+            batch = chunks[start:start + self.batch_chunks]
+            await self._acquire(tenant_slug, len(batch))
+            try:
+                embedded = await embed_fn(batch, model_name)
+            finally:
+                self._release(tenant_slug)
+            if not embedded:
+                return False
+            self._tenant(tenant_slug).chunks_embedded += len(batch)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "slots": self.slots,
+            "free_slots": self._free,
+            "batch_chunks": self.batch_chunks,
+            "waiting_batches": sum(1 for entry in self._waiting if not entry[-1].cancelled()),
+            "tenants": {
+                slug: stats.to_dict(self.weights.get(slug, 1.0)) for slug, stats in sorted(self._tenants.items())
+            }
+        }
+
+
+def scheduled_batch_chunks(settings) -> int:
+    """
+    Chunks per scheduled batch: with the process pool enabled, at least enough
+    to reach the pool and give every pool worker a shard
+    """
+    batch_chunks = settings.embedding_scheduler_batch_chunks
+    if settings.embedding_pool_workers > 0:
+        batch_chunks = max(
+            batch_chunks,
+            settings.embedding_pool_min_chunks,
+            settings.embedding_pool_workers * settings.embedding_pool_shard_size
+        )
+    return batch_chunks
+
+
+@lru_cache()
+def get_embedding_scheduler() -> EmbeddingScheduler:
+    """Scheduler of this worker process (use from the event loop only); not shared across processes"""
+    settings = get_settings()
+    return EmbeddingScheduler(
+        slots=settings.embedding_scheduler_slots,
+        batch_chunks=scheduled_batch_chunks(settings),
+        weights=parse_tenant_weights(settings.embedding_scheduler_tenant_weights)
+    )
+
+
+def get_embedding_scheduler_stats() -> Dict[str, Any]:
+    return get_embedding_scheduler().get_stats()
@@ -0,0 +1,174 @@
+"""
+Extraction Cache - Identical Bytes Are Never Extracted or Chunked Twice
+On-disk JSON entries keyed by (file hash, extractor version, chunking config),
+evicted least-recently-used once the directory exceeds its byte budget
+"""
+
+import hashlib
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from src.backend.config.settings import get_settings
+from src.backend.core.chunking import CHUNKING_VERSION
+from src.backend.core.document_extraction import EXTRACTOR_VERSION, ExtractedDocument
+
+
+def chunking_config_key(
+    chunk_size: int,
+    chunk_overlap: int,
+    max_chunks: Optional[int],
+    chunking_strategy: str,
+    model_name: str
+) -> str:
+    """Everything that changes the chunk list of a document (the model only for token-aware)"""
+    tokenizer = model_name if chunking_strategy == "token-aware" else ""
+    return f"{chunking_strategy}|{chunk_size}|{chunk_overlap}|{max_chunks}|{tokenizer}|v{CHUNKING_VERSION}"
+
+
+class ExtractionCache:
+    """Extracted documents and chunk lists stored as files under one directory"""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.chunk_hits = 0
+        self.text_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = sum(path.stat().st_size for path in self.directory.glob("*.json"))
+
+    def _path(self, *parts: str) -> Path:
+        key = hashlib.sha256("|".join((EXTRACTOR_VERSION,) + parts).encode()).hexdigest()
+        return self.directory / f"{key}.json"
+
+    def _read(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as handle:
+                entry = json.load(handle)
+            os.utime(path)  # mtime is the LRU clock
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def record_lookup(self, status: str) -> None:
+        """Count one file lookup: "chunks" or "text" (hits) or "miss" (both entries missed)"""
+        with self._lock:
+            if status == "chunks":
+                self.chunk_hits += 1
+            elif status == "text":
+                self.text_hits += 1
+            else:
+                self.misses += 1
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> None:
+        """Atomic write (temp file + rename), then evict down to max_bytes"""
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_path, "w", encoding="utf-8") as handle:
+                json.dump(entry, handle, ensure_ascii=False, separators=(",", ":"))
+            replaced = path.stat().st_size if path.exists() else 0
+            os.replace(temp_path, path)
+            size = path.stat().st_size
+        except OSError as e:
+            print(f"⚠️ Extraction cache write failed: {e}")
+            temp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._total_bytes += size - replaced
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the directory fits in max_bytes"""
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.evictions += 1
+        with self._lock:
+            self._total_bytes = total
+
+    def get_document(self, file_hash: str) -> Optional[ExtractedDocument]:
+        entry = self._read(self._path("document", file_hash))
+        return ExtractedDocument(**entry) if entry is not None else None
+
+    def put_document(self, file_hash: str, document: ExtractedDocument) -> None:
+        self._write(self._path("document", file_hash), {
+            "text": document.text,
+            "extraction_method": document.extraction_method,
+            "page_starts": document.page_starts
+        })
+
+    def get_chunks(self, file_hash: str, config_key: str) -> Optional[Dict[str, Any]]:
+        """{"extraction_method", "page_count", "chunks"} or None"""
+        return self._read(self._path("chunks", file_hash, config_key))
+
+    def put_chunks(self, file_hash: str, config_key: str, document: ExtractedDocument, chunks: List[dict]) -> None:
+        self._write(self._path("chunks", file_hash, config_key), {
+            "extraction_method": document.extraction_method,
+            "page_count": document.page_count,
+            "chunks": chunks
+        })
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._total_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring"""
+        with self._lock:
+            hits = self.chunk_hits + self.text_hits
+            lookups = hits + self.misses
+            return {
+                "directory": str(self.directory),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": hits,
+                "chunk_hits": self.chunk_hits,
+                "text_hits": self.text_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+
+@lru_cache()
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """Get the process-wide extraction cache, or None when disabled"""
+    settings = get_settings()
+    if settings.extraction_cache_max_bytes <= 0:
+        return None
+    try:
+        return ExtractionCache(Path(settings.extraction_cache_dir), settings.extraction_cache_max_bytes)
+    except OSError as e:
+        print(f"⚠️ Extraction cache disabled: {e}")
+        return None
+
+
+def get_extraction_cache_stats() -> Optional[Dict[str, Any]]:
+    """Cache stats if the cache was ever opened"""
+    if get_extraction_cache.cache_info().currsize and get_extraction_cache() is not None:
+        return get_extraction_cache().get_stats()
+    return None
@@ -0,0 +1,184 @@
+"""
+Inference Backends - CPU-Optimized Ways to Run the Embedding Models
+PyTorch fp32, PyTorch dynamic int8, and ONNX Runtime (optionally int8) per EmbeddingModel
+"""
+
+import re
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.backend.config.settings import get_settings, CACHE_DIR
+
+# Exported ONNX graphs live next to the HuggingFace cache so they survive restarts
+ONNX_EXPORT_DIR = CACHE_DIR / "onnx"
+
+# avx2 kernels run on every x86-64 CPU we deploy to; avx512_vnni is faster where available
+ONNX_QUANTIZATION_CONFIG = "avx2"
+
+PARITY_SAMPLE_TEXTS = [
+    "What is the company's mission?",
+    "Employees accrue vacation days monthly and may carry over up to five days.",
+    "The quarterly financial report shows revenue growth across all regions.",
+    "Well, Prince, so Genoa and Lucca are now just family estates of the Buonapartes.",
+    "Call me Ishmael. Some years ago, never mind how long precisely, I went to sea.",
+    "Install the client, configure the API key, and trigger a sync from the dashboard."
+]
+
+
+class InferenceBackend(str, Enum):
+    """Available inference backends"""
+    TORCH_FP32 = "torch-fp32"
+    TORCH_INT8 = "torch-int8"
+    ONNX = "onnx"
+    ONNX_INT8 = "onnx-int8"
+
+
+def resolve_backend(model_name: str) -> InferenceBackend:
+    """Pick the configured backend for a model (per-model override, then global default)"""
+    settings = get_settings()
+    value = settings.embedding_backend_overrides.get(model_name, settings.embedding_backend)
+    try:
+        return InferenceBackend(value)
+    except ValueError:
+        print(f"⚠️ Unknown embedding backend '{value}' for {model_name}, using {InferenceBackend.TORCH_FP32.value}")
+        return InferenceBackend.TORCH_FP32
+
+
+def _onnx_export_dir(model_name: str) -> Path:
+    """Local directory holding the ONNX export of a model"""
+    return ONNX_EXPORT_DIR / re.sub(r"[^A-Za-z0-9_.-]", "__", model_name)
+
+
+def _torch_size_mb(model) -> float:
+    """Resident size of a PyTorch model from its parameters and buffers"""
+    total_bytes = sum(p.numel() * p.element_size() for p in model.parameters())
+    total_bytes += sum(b.numel() * b.element_size() for b in model.buffers())
+    return total_bytes / (1024 * 1024)
+
+
+def _load_torch_fp32(model_name: str, device: str) -> Tuple[Any, float]:
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device=device)
+    model.eval()
+    return model, _torch_size_mb(model)
+
+
+def _load_torch_int8(model_name: str) -> Tuple[Any, float]:
+    """Dynamic int8 quantization of every nn.Linear (CPU only)"""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device='cpu')
+    model.eval()
+
+    fp32_mb = _torch_size_mb(model)
+    linear_mb = sum(
+        m.weight.numel() * m.weight.element_size()
+        for m in model.modules() if isinstance(m, torch.nn.Linear)
+    ) / (1024 * 1024)
+
+    torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    # Linear weights shrink 4x; embeddings and norms stay fp32
+    return model, fp32_mb - linear_mb * 0.75
+
+
+def _load_onnx(model_name: str, quantized: bool) -> Tuple[Any, float]:
+    """Load (exporting on first use) an ONNX Runtime version of the model"""
+    from sentence_transformers import SentenceTransformer
+
+    export_dir = _onnx_export_dir(model_name)
+    fp32_file = export_dir / "onnx" / "model.onnx"
+
+    if not fp32_file.exists():
+        print(f"📦 Exporting {model_name} to ONNX in {export_dir}")
+        model = SentenceTransformer(model_name, device='cpu', backend="onnx")
+        model.save_pretrained(str(export_dir))
+
+    if not quantized:
+        model = SentenceTransformer(str(export_dir), device='cpu', backend="onnx")
+        return model, fp32_file.stat().st_size / (1024 * 1024)
+
+    int8_name = f"model_qint8_{ONNX_QUANTIZATION_CONFIG}.onnx"
+    int8_file = export_dir / "onnx" / int8_name
+
+    if not int8_file.exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        print(f"📦 Quantizing ONNX export of {model_name} ({ONNX_QUANTIZATION_CONFIG})")
+        base = SentenceTransformer(str(export_dir), device='cpu', backend="onnx")
+        export_dynamic_quantized_onnx_model(base, ONNX_QUANTIZATION_CONFIG, str(export_dir))
+
+    model = SentenceTransformer(
+        str(export_dir),
+        device='cpu',
+        backend="onnx",
+        model_kwargs={"file_name": f"onnx/{int8_name}"}
+    )
+    return model, int8_file.stat().st_size / (1024 * 1024)
+
+
+def load_embedding_model(model_name: str, backend: InferenceBackend, device: str) -> Tuple[Any, float]:
+    """
+    Load a model with the requested backend.
+    Returns (model, estimated size in MB). Falls back to torch-fp32 when the
+    optional ONNX dependencies are missing or the backend cannot run on device.
+    """
+    if backend != InferenceBackend.TORCH_FP32 and device != 'cpu':
+        print(f"⚠️ Backend {backend.value} is CPU-only, using {InferenceBackend.TORCH_FP32.value} on {device}")
+        backend = InferenceBackend.TORCH_FP32
+
+    try:
+        if backend == InferenceBackend.TORCH_INT8:
+            return _load_torch_int8(model_name)
+        if backend in (InferenceBackend.ONNX, InferenceBackend.ONNX_INT8):
+            return _load_onnx(model_name, quantized=backend == InferenceBackend.ONNX_INT8)
+    except ImportError as e:
+        print(f"⚠️ Backend {backend.value} unavailable ({e}), install optimum[onnxruntime]; using {InferenceBackend.TORCH_FP32.value}")
+
+    return _load_torch_fp32(model_name, device)
+
+
+def check_backend_parity(
+    model_name: str,
+    backend: InferenceBackend,
+    texts: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Compare a backend against the fp32 reference on the same texts.
+    Reports cosine similarity between paired vectors and throughput of both.
+    """
+    import numpy as np
+
+    texts = texts or PARITY_SAMPLE_TEXTS
+
+    reference, _ = _load_torch_fp32(model_name, 'cpu')
+    candidate, candidate_mb = load_embedding_model(model_name, backend, 'cpu')
+
+    def _timed_encode(model):
+        started = time.perf_counter()
+        vectors = model.encode(texts, convert_to_numpy=True, show_progress_bar=False)
+        return np.asarray(vectors, dtype=np.float32), time.perf_counter() - started
+
+    ref_vectors, ref_seconds = _timed_encode(reference)
+    cand_vectors, cand_seconds = _timed_encode(candidate)
+
+    ref_norm = ref_vectors / np.linalg.norm(ref_vectors, axis=1, keepdims=True)
+    cand_norm = cand_vectors / np.linalg.norm(cand_vectors, axis=1, keepdims=True)
+    cosines = np.sum(ref_norm * cand_norm, axis=1)
+
+    return {
+        "model": model_name,
+        "backend": backend.value,
+        "samples": len(texts),
+        "mean_cosine": float(cosines.mean()),
+        "min_cosine": float(cosines.min()),
+        "max_cosine_deviation": float(1.0 - cosines.min()),
+        "reference_texts_per_sec": round(len(texts) / ref_seconds, 1) if ref_seconds else None,
+        "backend_texts_per_sec": round(len(texts) / cand_seconds, 1) if cand_seconds else None,
+        "speedup": round(ref_seconds / cand_seconds, 2) if cand_seconds else None,
+        "backend_size_mb": round(candidate_mb, 1)
+    }
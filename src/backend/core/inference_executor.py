@@ -0,0 +1,150 @@
+"""
+Inference Executor - Embedding Work Off the Event Loop
+Bounded thread pools awaited for model calls: one for query embeddings, and a
+separate one for sync extraction and embedding, so a large sync cannot take
+the threads (or queue slots) that queries need
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from src.backend.config.settings import get_settings
+
+
+class InferenceQueueFullError(Exception):
+    """Raised when the inference executor has no free slot for new work"""
+    pass
+
+
+class InferenceExecutor:
+    """
+    Thread pool for CPU-heavy model calls with a bounded backlog.
+    Threads (not processes) so every worker shares the warm models in the
+    model registry; torch releases the GIL during forward passes.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int, thread_name_prefix: str = "inference"):
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._active = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue_depth
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run func(*args, **kwargs) on the pool and await its result"""
+        with self._lock:
+            if self._pending >= self.capacity:
+                self.rejected += 1
+                raise InferenceQueueFullError(
+                    f"Inference queue full ({self._pending}/{self.capacity} pending)"
+                )
+            self._pending += 1
+            self.submitted += 1
+
+        submitted_at = time.perf_counter()
+
+        def _timed_call():
+            started_at = time.perf_counter()
+            wait = started_at - submitted_at
+            with self._lock:
+                self._active += 1
+                self.total_wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self.total_run_seconds += time.perf_counter() - started_at
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, functools.partial(_timed_call))
+            with self._lock:
+                self.completed += 1
+            return result
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Executor metrics for monitoring"""
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "active": self._active,
+                "queued": max(self._pending - self._active, 0),
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self.total_wait_seconds / finished * 1000, 2) if finished else 0.0,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 2),
+                "avg_run_ms": round(self.total_run_seconds / finished * 1000, 2) if finished else 0.0
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work and wait for running calls"""
+        self._executor.shutdown(wait=True)
+
+
+@lru_cache()
+def get_inference_executor() -> InferenceExecutor:
+    """Get the process-wide inference executor for queries"""
+    settings = get_settings()
+    return InferenceExecutor(
+        max_workers=settings.inference_max_workers,
+        max_queue_depth=settings.inference_max_queue_depth
+    )
+
+
+@lru_cache()
+def get_sync_inference_executor() -> InferenceExecutor:
+    """Get the process-wide executor for sync extraction and embedding"""
+    settings = get_settings()
+    return InferenceExecutor(
+        max_workers=settings.sync_inference_max_workers,
+        max_queue_depth=settings.sync_inference_max_queue_depth,
+        thread_name_prefix="sync-inference"
+    )
+
+
+async def run_inference(func: Callable, *args, **kwargs) -> Any:
+    """Await a blocking model call on the query inference executor"""
+    return await get_inference_executor().run(func, *args, **kwargs)
+
+
+async def run_sync_inference(func: Callable, *args, **kwargs) -> Any:
+    """Await blocking extraction or embedding work of a sync on the sync executor"""
+    return await get_sync_inference_executor().run(func, *args, **kwargs)
+
+
+def shutdown_inference_executor() -> None:
+    """Shut down the executors if they were ever created"""
+    for factory in (get_inference_executor, get_sync_inference_executor):
+        if factory.cache_info().currsize:
+            factory().shutdown()
+            factory.cache_clear()
@@ -0,0 +1,100 @@
+"""
+Merkle Manifest - Sync Planning in O(changed)
+Each tenant's files form a hash tree (directory hash = hash of its children);
+the tree last synced to the database is stored so planning only descends
+into subtrees whose hash differs, and equal root hashes mean "no changes"
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.backend.config.settings import get_settings
+
+# {dir path: {"hash": str, "dirs": [child dir names], "files": {file name: content hash}}}
+MerkleTree = Dict[str, dict]
+
+
+def build_merkle_tree(file_hashes: Dict[str, str], root: str) -> MerkleTree:
+    """
+    Hash tree over upload-relative paths ("tenant/dir/file") below root
+    Leaves are content hashes only: size and mtime changes that leave the
+    bytes identical do not need a sync
+    """
+    nodes: MerkleTree = {root: {"dirs": set(), "files": {}}}
+    for path, file_hash in file_hashes.items():
+        parent, name = path.rsplit("/", 1)
+        nodes.setdefault(parent, {"dirs": set(), "files": {}})["files"][name] = file_hash
+        while parent != root and "/" in parent:
+            grandparent, child = parent.rsplit("/", 1)
+            siblings = nodes.setdefault(grandparent, {"dirs": set(), "files": {}})["dirs"]
+            if child in siblings:
+                break  # ancestors already registered
+            siblings.add(child)
+            parent = grandparent
+
+    # Deepest directories first so children are hashed before their parents
+    for path in sorted(nodes, key=lambda p: p.count("/"), reverse=True):
+        node = nodes[path]
+        digest = hashlib.sha256()
+        node["dirs"] = sorted(node["dirs"])
+        for name in node["dirs"]:
+            digest.update(f"d {name} {nodes[f'{path}/{name}']['hash']}\n".encode())
+        for name, file_hash in sorted(node["files"].items()):
+            digest.update(f"f {name} {file_hash}\n".encode())
+        node["hash"] = digest.hexdigest()
+    return nodes
+
+
+def diff_merkle_trees(current: MerkleTree, synced: MerkleTree, root: str) -> Tuple[List[str], List[str]]:
+    """(changed or new file paths, deleted file paths), visiting only directories whose hash differs"""
+    changed = []
+    deleted = []
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        now = current.get(path)
+        before = synced.get(path)
+        if now is not None and before is not None and now["hash"] == before["hash"]:
+            continue  # identical subtree
+
+        now_files = now["files"] if now else {}
+        before_files = before["files"] if before else {}
+        changed.extend(f"{path}/{name}" for name, file_hash in now_files.items() if before_files.get(name) != file_hash)
+        deleted.extend(f"{path}/{name}" for name in before_files if name not in now_files)
+
+        child_dirs = set(now["dirs"] if now else []) | set(before["dirs"] if before else [])
+        stack.extend(f"{path}/{name}" for name in child_dirs)
+    return changed, deleted
+
+
+def _state_path(tenant_slug: str) -> Path:
+    return Path(get_settings().scan_manifest_dir) / f"{tenant_slug}.merkle.json"
+
+
+def load_synced_tree(tenant_slug: str) -> Optional[dict]:
+    """{"fingerprint": database fingerprint at the time, "tree": MerkleTree} of the last sync, or None"""
+    try:
+        with open(_state_path(tenant_slug), encoding="utf-8") as handle:
+            state = json.load(handle)
+        if isinstance(state.get("tree"), dict) and tenant_slug in state["tree"]:
+            return state
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def save_synced_tree(tenant_slug: str, tree: MerkleTree, fingerprint: str) -> None:
+    """Atomic write of the tree the database now reflects"""
+    path = _state_path(tenant_slug)
+    temp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump({"fingerprint": fingerprint, "tree": tree}, handle, separators=(",", ":"))
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not save Merkle manifest for {tenant_slug}: {e}")
+        temp_path.unlink(missing_ok=True)
@@ -0,0 +1,128 @@
+"""
+Model Registry - Warm Embedding Models Shared Per Process
+Keeps several SentenceTransformer models loaded under a RAM budget with LRU eviction
+"""
+
+import gc
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from src.backend.config.settings import get_settings
+from src.backend.core.inference_backends import InferenceBackend, load_embedding_model, resolve_backend
+
+
+class ModelRegistry:
+    """Process-wide LRU cache of loaded embedding models bounded by a memory budget"""
+
+    def __init__(self, max_memory_mb: int):
+        self.max_memory_mb = max_memory_mb
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes_mb: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def get_model(self, model_name: str, backend: Optional[InferenceBackend] = None):
+        """Return a warm model, loading it (and evicting LRU models) if needed"""
+        backend = backend or resolve_backend(model_name)
+        key = f"{model_name}@{backend.value}"
+
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return model
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # One loader per model; other models stay available meanwhile
+        with load_lock:
+            with self._lock:
+                model = self._models.get(key)
+                if model is not None:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return model
+
+            model, size_mb = self._load_model(model_name, backend)
+
+            with self._lock:
+                self._models[key] = model
+                self._sizes_mb[key] = size_mb
+                self.loads += 1
+                self._evict_over_budget(keep=key)
+
+            return model
+
+    def _load_model(self, model_name: str, backend: InferenceBackend):
+        """Load a model with the given backend on the best available device"""
+        import torch
+
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        print(f"🤖 Loading embedding model: {model_name} ({backend.value}) on {device}")
+
+        try:
+            model, size_mb = load_embedding_model(model_name, backend, device)
+        except Exception as e:
+            print(f"❌ Failed to load model {model_name}: {e}")
+            raise
+
+        print(f"✅ Model loaded ({size_mb:.0f} MB)")
+        return model, size_mb
+
+    def _evict_over_budget(self, keep: str) -> None:
+        """Evict least recently used models until the budget is respected (lock held)"""
+        while self.used_memory_mb > self.max_memory_mb and len(self._models) > 1:
+            oldest_name = next(iter(self._models))
+            if oldest_name == keep:
+                break
+            self._models.pop(oldest_name)
+            freed_mb = self._sizes_mb.pop(oldest_name, 0.0)
+            self.evictions += 1
+            print(f"🧹 Evicted embedding model {oldest_name} ({freed_mb:.0f} MB)")
+            self._release_memory()
+
+    @staticmethod
+    def _release_memory() -> None:
+        """Return freed model memory to the allocator"""
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+
+    @property
+    def used_memory_mb(self) -> float:
+        return sum(self._sizes_mb.values())
+
+    def clear(self) -> None:
+        """Unload every model"""
+        with self._lock:
+            self._models.clear()
+            self._sizes_mb.clear()
+        self._release_memory()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registry statistics for monitoring"""
+        with self._lock:
+            return {
+                "loaded_models": {name: round(self._sizes_mb[name], 1) for name in self._models},
+                "used_memory_mb": round(self.used_memory_mb, 1),
+                "max_memory_mb": self.max_memory_mb,
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
+
+
+@lru_cache()
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry"""
+    settings = get_settings()
+    return ModelRegistry(max_memory_mb=settings.embedding_model_cache_mb)
@@ -0,0 +1,223 @@
+"""
+Query Batcher - Dynamic Micro-Batching for Query Embeddings
+Collects concurrent query texts for a few milliseconds and encodes them in one forward pass
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.backend.config.settings import get_settings
+from src.backend.core.embedding_engine import SingletonEmbeddingModel, EmbeddingModel
+from src.backend.core.inference_executor import run_inference
+from src.backend.core.query_cache import get_query_cache, normalize_query
+
+
+def _encode_batch(model_name: str, texts: List[str]):
+    """Encode a batch of query texts (runs on the inference executor)"""
+    model = SingletonEmbeddingModel.get_model(model_name)
+    return model.encode(
+        texts,
+        batch_size=len(texts),
+        convert_to_tensor=False,
+        show_progress_bar=False
+    )
+
+
+class QueryEmbeddingBatcher:
+    """
+    Per-model micro-batcher. A request waits at most max_wait_ms for
+    companions before its batch is dispatched, which bounds the added latency.
+    """
+
+    def __init__(self, model_name: str, max_batch_size: int, max_wait_ms: float, max_inflight_batches: int):
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self.max_inflight_batches = max_inflight_batches
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Optional[asyncio.Semaphore] = None
+        self._dispatches: Set[asyncio.Task] = set()  # the loop only holds tasks weakly
+        self._latencies = deque(maxlen=1000)
+        self.requests = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.largest_batch = 0
+
+    def _ensure_started(self) -> None:
+        """Start the collector task on the running event loop"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._inflight = asyncio.Semaphore(self.max_inflight_batches)
+            self._worker = asyncio.create_task(self._collect_batches())
+
+    async def embed(self, text: str):
+        """Queue a text and await its embedding vector"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def _collect_batches(self) -> None:
+        """Gather queued texts into batches bounded by size and wait time"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_seconds
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._inflight.acquire()
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        """Encode one batch and resolve every waiting request"""
+        try:
+            live = [item for item in batch if not item[1].done()]
+            if not live:
+                return
+
+            self.batches += 1
+            self.batched_items += len(live)
+            self.largest_batch = max(self.largest_batch, len(live))
+
+            try:
+                vectors = await run_inference(_encode_batch, self.model_name, [text for text, _, _ in live])
+            except asyncio.CancelledError:
+                for _, future, _ in live:
+                    future.cancel()
+                raise
+            except Exception as e:
+                for _, future, _ in live:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+
+            finished_at = time.perf_counter()
+            for (_, future, queued_at), vector in zip(live, vectors):
+                if not future.done():
+                    future.set_result(vector)
+                self._latencies.append(finished_at - queued_at)
+        finally:
+            self._inflight.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Batching statistics for monitoring"""
+        latencies = sorted(self._latencies)
+        p50 = latencies[len(latencies) // 2] if latencies else 0.0
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+        return {
+            "model": self.model_name,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": round(self.batched_items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "p50_latency_ms": round(p50 * 1000, 2),
+            "p99_latency_ms": round(p99 * 1000, 2)
+        }
+
+    async def stop(self) -> None:
+        """Cancel the collector task and any in-flight dispatches"""
+        tasks = list(self._dispatches)
+        if self._worker is not None:
+            tasks.append(self._worker)
+            self._worker = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_batchers: Dict[str, QueryEmbeddingBatcher] = {}
+
+
+class _SharedEncode:
+    """One encode of a query, awaited by every concurrent caller of the same text"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+# Identical queries already being encoded; later arrivals await the same task
+_pending_queries: Dict[Tuple[str, str], _SharedEncode] = {}
+
+
+def get_query_batcher(model_name: str = EmbeddingModel.MINI_LM.value) -> QueryEmbeddingBatcher:
+    """Get the micro-batcher for a model"""
+    if model_name not in _batchers:
+        settings = get_settings()
+        _batchers[model_name] = QueryEmbeddingBatcher(
+            model_name=model_name,
+            max_batch_size=settings.query_batch_max_size,
+            max_wait_ms=settings.query_batch_max_wait_ms,
+            max_inflight_batches=settings.inference_max_workers
+        )
+    return _batchers[model_name]
+
+
+async def embed_query(query: str, model_name: str = EmbeddingModel.MINI_LM.value):
+    """
+    Embed a query: cache first, then the shared micro-batcher.
+    The query is encoded after normalize_query, so full-width or ligature
+    forms are embedded as their NFKC equivalents, not as typed.
+    """
+    normalized = normalize_query(query)
+    cache = get_query_cache()
+    
+    vector = cache.get(model_name, normalized)
+    if vector is not None:
+        return vector
+    
+    key = (model_name, normalized)
+    shared = _pending_queries.get(key)
+    if shared is None:
+        # The encode is a task of its own: a caller that disconnects cancels only its wait
+        shared = _pending_queries[key] = _SharedEncode(asyncio.create_task(_encode_query(model_name, normalized)))
+        shared.task.add_done_callback(lambda _: _forget_query(key, shared))
+    
+    shared.waiters += 1
+    try:
+        return await asyncio.shield(shared.task)
+    finally:
+        shared.waiters -= 1
+        if shared.waiters == 0 and not shared.task.done():
+            # Every caller is gone: stop the encode (later arrivals start a fresh one)
+            _forget_query(key, shared)
+            shared.task.cancel()
+
+
+async def _encode_query(model_name: str, normalized: str):
+    vector = await get_query_batcher(model_name).embed(normalized)
+    return get_query_cache().put(model_name, normalized, vector)
+
+
+def _forget_query(key: Tuple[str, str], shared: _SharedEncode) -> None:
+    if _pending_queries.get(key) is shared:
+        del _pending_queries[key]
+
+
+def get_query_batcher_stats() -> List[Dict[str, Any]]:
+    """Statistics for every active batcher"""
+    return [batcher.get_stats() for batcher in _batchers.values()]
+
+
+async def shutdown_query_batchers() -> None:
+    """Stop all batcher tasks"""
+    for batcher in _batchers.values():
+        await batcher.stop()
+    _batchers.clear()
@@ -0,0 +1,106 @@
+"""
+Query Embedding Cache - Repeat Questions Skip Inference
+Bounded LRU with TTL keyed by (model, normalized query text)
+"""
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from src.backend.config.settings import get_settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a query for cache keys and encoding.
+    Unicode NFKC and collapsed whitespace only. The normalized text is what
+    gets encoded, so variants sharing a key also share one embedding; that
+    embedding can differ slightly from the raw text's (tokenizers do not
+    generally ignore NFKC differences such as full-width or ligature forms).
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", query)).strip()
+
+
+class QueryEmbeddingCache:
+    """LRU of query vectors; entries also expire after ttl_seconds"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, model_name: str, normalized_query: str) -> Optional[np.ndarray]:
+        key = (model_name, normalized_query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, vector = entry
+            if self.ttl_seconds > 0 and time.monotonic() - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector
+
+    def put(self, model_name: str, normalized_query: str, vector: np.ndarray) -> np.ndarray:
+        """Store a read-only float32 copy so callers cannot mutate cached vectors"""
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        if self.max_entries <= 0:
+            return vector
+        key = (model_name, normalized_query)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return vector
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+
+@lru_cache()
+def get_query_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache"""
+    settings = get_settings()
+    return QueryEmbeddingCache(
+        max_entries=settings.query_cache_max_entries,
+        ttl_seconds=settings.query_cache_ttl_seconds
+    )
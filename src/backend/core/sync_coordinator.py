@@ -3,13 +3,34 @@ Sync Coordinator - Orchestrates the Complete Sync Process
 Combines discovery, embedding generation, and database operations
 """
 
-from typing import Dict, Any
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
 from pathlib import Path
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.backend.core.document_discovery import create_sync_plan, get_sync_summary, SyncPlan
+from src.backend.config.settings import get_settings
+from src.backend.core.document_discovery import (
+    create_path_sync_plan,
+    create_sync_plan,
+    get_sync_summary,
+    record_synced_tree,
+    SyncPlan
+)
+from src.backend.core.document_extraction import is_pdf
+from src.backend.core.embedding_pool import get_embedding_pool, should_use_embedding_pool
+from src.backend.core.embedding_scheduler import get_embedding_scheduler
+from src.backend.core.inference_executor import run_sync_inference
+from src.backend.core.sync_pipeline import SyncPipeline
+from src.backend.core.sync_writer import SyncWriter
+from src.backend.database import AsyncSessionLocal
 from src.backend.simple_embedder import (
-    process_file_to_embeddings_simple,
+    prepare_file_chunks_cached,
+    iter_file_chunks_simple,
+    next_chunk_window,
+    embed_chunks_simple,
     get_available_models,
     get_available_strategies
 )
@@ -17,36 +38,149 @@ from src.backend.simple_embedder import (
 # Simple config class to replace complex EmbeddingConfig
 class SimpleEmbeddingConfig:
     def __init__(self, model: str = "sentence-transformers/all-MiniLM-L6-v2", 
-                 chunk_size: int = 512, chunk_overlap: int = 50, max_chunks: int = 1000):
+                 chunk_size: int = 512, chunk_overlap: int = 50, max_chunks: Optional[int] = None,
+                 chunking_strategy: str = "fixed-size"):
         self.model = model
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.max_chunks = max_chunks
+        self.chunking_strategy = chunking_strategy
 from src.backend.core.database_operations import (
     create_file_record,
     update_file_record,
-    delete_file_record,
-    save_embeddings,
     set_file_status,
-    get_tenant_stats
+    delete_file_chunks,
+    get_tenant_stats,
+    get_sync_operations,
+    get_cached_embeddings,
+    load_file_chunk_rows,
+    apply_chunk_window,
+    insert_chunk_window,
+    finish_file_chunk_rows
 )
 
 
+# One sync at a time per tenant (API triggers and the upload watcher share the rows).
+# Worker processes coordinate through a PostgreSQL advisory lock keyed by
+# (SYNC_LOCK_NAMESPACE, hashtext(tenant_slug)); the asyncio lock queues this process's syncs
+SYNC_LOCK_NAMESPACE = 7245
+SYNC_LOCK_POLL_SECONDS = 1.0
+_tenant_sync_locks: Dict[str, asyncio.Lock] = {}
+
+
+@asynccontextmanager
+async def tenant_sync_lock(tenant_slug: str):
+    """Lock serialising syncs of one tenant across all worker processes"""
+    lock = _tenant_sync_locks.get(tenant_slug)
+    if lock is None:
+        lock = _tenant_sync_locks[tenant_slug] = asyncio.Lock()
+    async with lock:
+        # Transaction-level lock on a session of its own: released when the session
+        # closes, even if the sync fails or its connection is lost
+        async with AsyncSessionLocal() as lock_db:
+            while not (await lock_db.execute(
+                text("SELECT pg_try_advisory_xact_lock(:namespace, hashtext(:tenant_slug))"),
+                {"namespace": SYNC_LOCK_NAMESPACE, "tenant_slug": tenant_slug}
+            )).scalar():
+                await asyncio.sleep(SYNC_LOCK_POLL_SECONDS)  # polled: a blocking wait would hit command_timeout
+            yield
+
+
+async def tenant_sync_locked(db: AsyncSession, tenant_slug: str) -> bool:
+    """Whether any worker process currently holds the tenant's sync lock"""
+    result = await db.execute(
+        text("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_locks
+                WHERE locktype = 'advisory' AND granted AND objsubid = 2
+                  AND classid = CAST(:namespace AS oid) AND objid = CAST(hashtext(:tenant_slug) AS oid)
+            )
+        """),
+        {"namespace": SYNC_LOCK_NAMESPACE, "tenant_slug": tenant_slug}
+    )
+    return bool(result.scalar())
+
+
 class SyncCoordinator:
     """Main coordinator for sync operations"""
     
-    def __init__(self, db: AsyncSession, upload_dir: str = "./data/uploads"):
+    def __init__(self, db: AsyncSession, upload_dir: str = "./data/uploads", progress=None):
         self.db = db
         self.upload_dir = upload_dir
         self.default_config = SimpleEmbeddingConfig()
+        self.progress = progress  # optional SyncProgress of a background sync job
+    
+    async def _progress_stage(self, stage: str, total_files: int = None) -> None:
+        if self.progress is not None:
+            await self.progress.set_stage(stage, total_files)
+    
+    def _progress_file(self, file_name: str, chunks: int = 0) -> None:
+        if self.progress is not None:
+            self.progress.file_done(file_name, chunks)
     
     async def discover_changes(
         self, 
         tenant_slug: str, 
-        force_full_sync: bool = False
+        force_full_sync: bool = False,
+        resume_after: Optional[datetime] = None
     ) -> SyncPlan:
         """Discover what files need syncing"""
-        return await create_sync_plan(self.db, tenant_slug, force_full_sync)
+        return await create_sync_plan(self.db, tenant_slug, force_full_sync, resume_after)
+    
+    async def _embed_chunks(self, tenant_slug: str, chunks: list, model_name: str) -> bool:
+        """Embed chunks in place, batch by batch, within the tenant's fair share of embedding slots"""
+        return await get_embedding_scheduler().embed(tenant_slug, chunks, model_name, self._run_embedding)
+    
+    async def _run_embedding(self, chunks: list, model_name: str) -> bool:
+        """Embed chunks in place: process pool for large jobs, inference executor otherwise"""
+        if should_use_embedding_pool(len(chunks)):
+            try:
+                vectors = await get_embedding_pool().embed([chunk["text"] for chunk in chunks], model_name)
+                for chunk, vector in zip(chunks, vectors):
+                    chunk["embedding"] = vector
+                    chunk["model"] = model_name
+                return True
+            except Exception as e:
+                print(f"   ⚠️ Embedding pool failed ({e}), falling back to sync inference executor")
+        
+        return await run_sync_inference(embed_chunks_simple, chunks, model_name)
+    
+    def _should_stream(self, file_path: Path) -> bool:
+        """Large text files are read, chunked and written in bounded windows"""
+        return (
+            file_path.exists()
+            and not is_pdf(file_path)
+            and file_path.stat().st_size >= get_settings().ingest_stream_min_bytes
+        )
+    
+    async def _store_chunk_window(
+        self,
+        tenant_slug: str,
+        file_record,
+        stored_rows,
+        window: list,
+        model_name: str
+    ) -> int:
+        """Diff, embed and write one window of chunks; returns how many needed no inference"""
+        new_chunks = await apply_chunk_window(self.db, stored_rows, window, model_name)
+        
+        # Reuse vectors of chunks we have already embedded with this model
+        cached = await get_cached_embeddings(
+            self.db, tenant_slug, [chunk["hash"] for chunk in new_chunks], model_name
+        )
+        missing_chunks = []
+        for chunk in new_chunks:
+            if chunk["hash"] in cached:
+                chunk["embedding"] = cached[chunk["hash"]]
+            else:
+                missing_chunks.append(chunk)
+        
+        # Only never-seen chunks go through the model
+        if missing_chunks and not await self._embed_chunks(tenant_slug, missing_chunks, model_name):
+            raise RuntimeError("No embeddings generated")
+        
+        await insert_chunk_window(self.db, file_record, stored_rows, new_chunks)
+        return len(window) - len(missing_chunks)
     
     async def process_single_file(
         self,
@@ -61,8 +195,11 @@ class SyncCoordinator:
         file_path = Path(self.upload_dir) / file_info.path
         result = {
             "file_name": file_info.name,
+            "file_path": file_info.path,
             "success": False,
             "chunks_created": 0,
+            "chunks_reused": 0,
+            "extraction_cache": None,
             "error": None
         }
         
@@ -75,44 +212,108 @@ class SyncCoordinator:
             else:
                 file_record = await update_file_record(self.db, existing_file_record, file_info)
             
-            # Generate embeddings using simple embedder (no memory leaks)
-            embedded_chunks = process_file_to_embeddings_simple(
-                file_path, 
-                chunk_size=config.chunk_size,
-                chunk_overlap=config.chunk_overlap,
-                model_name=config.model,
-                max_chunks=config.max_chunks
-            )
+            # Large text files stream through in bounded windows (read, chunk, embed, write,
+            # then read on); small files and PDFs (extracted page by page in parallel) are
+            # chunked in one go through the extraction cache, then split into windows of the
+            # same size. Neither path cuts at max_chunks by default: chunks are embedded and
+            # written window by window either way.
+            # Chunking runs on the inference executor so the event loop stays free.
+            settings = get_settings()
+            streaming = self._should_stream(file_path)
+            if streaming:
+                chunk_stream = iter_file_chunks_simple(
+                    file_path,
+                    chunk_size=config.chunk_size,
+                    chunk_overlap=config.chunk_overlap,
+                    chunking_strategy=config.chunking_strategy,
+                    model_name=config.model
+                )
+                file_record.page_count = None
+                file_record.extraction_method = "text"
+                pending = None
+            else:
+                prepared = await run_sync_inference(
+                    prepare_file_chunks_cached,
+                    file_path,
+                    file_info.hash,
+                    chunk_size=config.chunk_size,
+                    chunk_overlap=config.chunk_overlap,
+                    max_chunks=config.max_chunks,
+                    chunking_strategy=config.chunking_strategy,
+                    model_name=config.model
+                )
+                file_record.page_count = prepared["page_count"]
+                file_record.extraction_method = prepared["extraction_method"]
+                result["extraction_cache"] = prepared["cache"]
+                pending = prepared["chunks"]
+            
+            stored_rows = await load_file_chunk_rows(self.db, file_record.id)
+            chunks_saved = 0
+            chunks_reused = 0
+            while True:
+                if streaming:
+                    window = await run_sync_inference(next_chunk_window, chunk_stream, settings.ingest_window_chunks)
+                else:
+                    window = pending[:settings.ingest_window_chunks]
+                    pending = pending[settings.ingest_window_chunks:]
+                if not window:
+                    break
+                
+                chunks_reused += await self._store_chunk_window(
+                    tenant_slug, file_record, stored_rows, window, config.model
+                )
+                chunks_saved += len(window)
             
-            if not embedded_chunks:
+            if not chunks_saved:
                 await set_file_status(self.db, file_record, "failed", "No embeddings generated")
                 result["error"] = "No meaningful content or embeddings generated"
                 return result
             
-            # Save embeddings to database
-            chunks_saved = await save_embeddings(self.db, file_record, embedded_chunks)
+            counts = await finish_file_chunk_rows(self.db, stored_rows)
+            print(f"   💾 Chunks: {counts['unchanged']} unchanged, {counts['moved']} moved, "
+                  f"{counts['inserted']} inserted, {counts['removed']} removed")
             
             # Mark as synced
             await set_file_status(self.db, file_record, "synced")
             
             result.update({
                 "success": True,
-                "chunks_created": chunks_saved
+                "chunks_created": chunks_saved,
+                "chunks_reused": chunks_reused
             })
             
-            print(f"   ✅ Processed {file_info.name}: {chunks_saved} chunks")
+            print(f"   ✅ Processed {file_info.name}: {chunks_saved} chunks ({chunks_reused} reused)")
             
         except Exception as e:
             error_msg = f"Error processing {file_info.name}: {str(e)}"
             print(f"   ❌ {error_msg}")
             
             if 'file_record' in locals():
+                await self.db.rollback()
+                if 'stored_rows' in locals():
+                    # Windows committed before the failure, and old rows parked at shifted
+                    # indices, must not stay searchable: drop the file's rows (retried next sync)
+                    try:
+                        await delete_file_chunks(self.db, stored_rows.file_id, commit=False)
+                    except Exception as cleanup_error:
+                        print(f"   ⚠️ Could not remove partial chunks of {file_info.name}: {cleanup_error}")
+                        await self.db.rollback()
                 await set_file_status(self.db, file_record, "failed", str(e))
             
             result["error"] = str(e)
         
         return result
     
+    @staticmethod
+    def _count_extraction_cache(counts: Dict[str, Any], status) -> None:
+        """Tally one file's extraction cache outcome (None = cache bypassed)"""
+        if status is None:
+            return
+        key = {"chunks": "chunk_hits", "text": "text_hits"}.get(status, "misses")
+        counts[key] += 1
+        lookups = counts["chunk_hits"] + counts["text_hits"] + counts["misses"]
+        counts["hit_rate"] = round((counts["chunk_hits"] + counts["text_hits"]) / lookups, 4)
+    
     async def execute_sync_plan(
         self,
         tenant_slug: str,
@@ -129,76 +330,90 @@ class SyncCoordinator:
             "total_changes": plan.total_changes,
             "files_processed": 0,
             "total_chunks_created": 0,
+            "total_chunks_reused": 0,
             "new_files_processed": 0,
             "updated_files_processed": 0,
             "deleted_files_processed": 0,
             "successful_files": [],
             "failed_files": [],
+            "extraction_cache": {"chunk_hits": 0, "text_hits": 0, "misses": 0, "hit_rate": 0.0},
             "config_used": {
                 "model": config.model,
                 "chunk_size": config.chunk_size,
                 "chunk_overlap": config.chunk_overlap,
-                "max_chunks": config.max_chunks
+                "max_chunks": config.max_chunks,
+                "chunking_strategy": config.chunking_strategy
             }
         }
         
         try:
-            # Process new files
-            print(f"\n🔄 Processing {len(plan.new_files)} new files...")
-            for file_info in plan.new_files:
-                result = await self.process_single_file(
-                    tenant_slug, file_info, config, is_new_file=True
-                )
-                
-                results["files_processed"] += 1
-                if result["success"]:
-                    results["new_files_processed"] += 1
-                    results["total_chunks_created"] += result["chunks_created"]
-                    results["successful_files"].append(result["file_name"])
-                else:
-                    results["failed_files"].append({
-                        "file_name": result["file_name"],
-                        "error": result["error"]
-                    })
+            # New and updated files: (file_info, is_new_file, existing_file_record)
+            work = [(file_info, True, None) for file_info in plan.new_files]
+            work += [(file_info, False, db_file) for db_file, file_info in plan.updated_files]
+            print(f"\n🔄 Processing {len(plan.new_files)} new and {len(plan.updated_files)} updated files...")
+            await self._progress_stage("processing", plan.total_changes)
             
-            # Process updated files
-            print(f"\n🔄 Processing {len(plan.updated_files)} updated files...")
-            for db_file, file_info in plan.updated_files:
-                result = await self.process_single_file(
-                    tenant_slug, file_info, config, 
-                    is_new_file=False, existing_file_record=db_file
-                )
-                
+            if work and get_settings().sync_pipeline_enabled:
+                # Extraction, embedding and writes of different files overlap
+                pipeline = SyncPipeline(self, tenant_slug, config)
+                file_results = await pipeline.run(work)
+                results["pipeline"] = pipeline.get_stats()
+            else:
+                file_results = []
+                for file_info, is_new, db_file in work:
+                    result = await self.process_single_file(
+                        tenant_slug, file_info, config,
+                        is_new_file=is_new, existing_file_record=db_file
+                    )
+                    self._progress_file(result["file_name"], result["chunks_created"])
+                    file_results.append(result)
+            
+            for (_, is_new, _), result in zip(work, file_results):
                 results["files_processed"] += 1
+                self._count_extraction_cache(results["extraction_cache"], result["extraction_cache"])
                 if result["success"]:
-                    results["updated_files_processed"] += 1
+                    results["new_files_processed" if is_new else "updated_files_processed"] += 1
                     results["total_chunks_created"] += result["chunks_created"]
+                    results["total_chunks_reused"] += result["chunks_reused"]
                     results["successful_files"].append(result["file_name"])
                 else:
                     results["failed_files"].append({
                         "file_name": result["file_name"],
+                        "file_path": result["file_path"],
                         "error": result["error"]
                     })
             
             # Process deleted files
             print(f"\n🗑️ Processing {len(plan.deleted_files)} deleted files...")
-            for db_file in plan.deleted_files:
-                try:
-                    await delete_file_record(self.db, db_file)
+            if plan.deleted_files:
+                await self._progress_stage("deleting")
+                # Set-based DELETEs in one transaction (savepoints isolate failing files)
+                deleted, failures = await SyncWriter(self.db, tenant_slug).delete_files(plan.deleted_files)
+                for db_file in deleted:
                     results["deleted_files_processed"] += 1
                     print(f"   🗑️ Deleted {db_file.filename}")
-                except Exception as e:
-                    print(f"   ❌ Failed to delete {db_file.filename}: {e}")
+                    self._progress_file(db_file.filename)
+                for db_file, error in failures:
+                    print(f"   ❌ Failed to delete {db_file.filename}: {error}")
                     results["failed_files"].append({
                         "file_name": db_file.filename,
-                        "error": f"Delete failed: {str(e)}"
+                        "file_path": db_file.file_path,
+                        "error": f"Delete failed: {error}"
                     })
+                    self._progress_file(db_file.filename)
             
             print(f"\n✅ Sync completed for {tenant_slug}")
             print(f"   📊 Files processed: {results['files_processed']}")
             print(f"   📦 Chunks created: {results['total_chunks_created']}")
+            print(f"   ♻️ Chunks reused: {results['total_chunks_reused']}")
             print(f"   ✅ Successful: {len(results['successful_files'])}")
             print(f"   ❌ Failed: {len(results['failed_files'])}")
+            print(f"   ⚡ Extraction cache hit rate: {results['extraction_cache']['hit_rate']:.0%}")
+            if "pipeline" in results:
+                utilization = ", ".join(
+                    f"{name} {stage['utilization']:.0%}" for name, stage in results["pipeline"]["stages"].items()
+                )
+                print(f"   🚰 Pipeline utilization: {utilization}")
             
         except Exception as e:
             print(f"\n💥 Sync failed for {tenant_slug}: {e}")
@@ -211,9 +426,14 @@ class SyncCoordinator:
         tenant_slug: str,
         force_full_sync: bool = False,
         embedding_model: str = None,
-        chunking_strategy: str = None
+        chunking_strategy: str = None,
+        resume_after: Optional[datetime] = None
     ) -> Dict[str, Any]:
-        """Complete sync operation in one call"""
+        """
+        Complete sync operation in one call
+        resume_after continues an interrupted full sync: files it already
+        finished are skipped, and chunks it already stored are reused
+        """
         
         # Create simple config
         config = SimpleEmbeddingConfig()
@@ -222,39 +442,79 @@ class SyncCoordinator:
             available_models = [m["value"] for m in get_available_models()]
             if embedding_model in available_models:
                 config.model = embedding_model
+        if chunking_strategy:
+            available_strategies = [s["value"] for s in get_available_strategies()]
+            if chunking_strategy in available_strategies:
+                config.chunking_strategy = chunking_strategy
         
-        # Discover changes
-        plan = await self.discover_changes(tenant_slug, force_full_sync)
-        
-        if plan.total_changes == 0:
-            stats = await get_tenant_stats(self.db, tenant_slug)
-            return {
-                "message": f"No changes detected for {tenant_slug}",
-                "changes_detected": 0,
-                "current_stats": stats
-            }
-        
-        # Execute sync
-        results = await self.execute_sync_plan(tenant_slug, plan, config)
-        
-        # Get final stats
-        final_stats = await get_tenant_stats(self.db, tenant_slug)
-        results["final_stats"] = final_stats
-        
-        return results
+        async with tenant_sync_lock(tenant_slug):
+            # Discover changes
+            await self._progress_stage("discovering")
+            plan = await self.discover_changes(tenant_slug, force_full_sync, resume_after)
+            
+            if plan.total_changes == 0:
+                await record_synced_tree(self.db, tenant_slug, plan.fs_files)
+                stats = await get_tenant_stats(self.db, tenant_slug)
+                return {
+                    "message": f"No changes detected for {tenant_slug}",
+                    "changes_detected": 0,
+                    "current_stats": stats
+                }
+            
+            # Execute sync
+            results = await self.execute_sync_plan(tenant_slug, plan, config)
+            
+            # Remember the tree the database now reflects (failed files stay pending)
+            if "sync_error" not in results:
+                failed_paths = [failed["file_path"] for failed in results["failed_files"]]
+                await record_synced_tree(self.db, tenant_slug, plan.fs_files, failed_paths)
+            
+            # Get final stats
+            final_stats = await get_tenant_stats(self.db, tenant_slug)
+            results["final_stats"] = final_stats
+            
+            return results
+    
+    async def sync_paths(self, tenant_slug: str, relative_paths: List[str]) -> Dict[str, Any]:
+        """
+        Incremental sync of specific upload paths (e.g. from the upload watcher)
+        Only the given paths are stat'ed, hashed and compared; no directory scan
+        """
+        async with tenant_sync_lock(tenant_slug):
+            plan = await create_path_sync_plan(self.db, tenant_slug, relative_paths, self.upload_dir)
+            if plan.total_changes == 0:
+                return {"tenant_slug": tenant_slug, "changes_detected": 0}
+            return await self.execute_sync_plan(tenant_slug, plan)
     
     async def get_sync_status(self, tenant_slug: str) -> Dict[str, Any]:
         """Get current sync status for tenant"""
         stats = await get_tenant_stats(self.db, tenant_slug)
+        latest = await get_sync_operations(self.db, tenant_slug, limit=1)
+        latest_sync = latest[0] if latest else None
+        
+        # A running operation whose heartbeat stopped belongs to a dead process
+        live_operation = False
+        if latest_sync is not None and latest_sync["status"] == "running":
+            heartbeat = latest_sync["heartbeat_at"] or latest_sync["started_at"]
+            cutoff = datetime.now(timezone.utc) - timedelta(seconds=get_settings().sync_job_stale_seconds)
+            latest_sync["heartbeat_stale"] = heartbeat is None or datetime.fromisoformat(heartbeat) < cutoff
+            live_operation = not latest_sync["heartbeat_stale"]
+        syncing = live_operation or await tenant_sync_locked(self.db, tenant_slug)
         
-        # Check if any files are currently processing
-        processing_files = [f.filename for f in stats["files_by_status"]["processing"]]
+        # Files only count as processing while a sync is actually running
+        processing_files = stats["files_by_status"]["processing"] if syncing else []
         
         return {
             "tenant_slug": tenant_slug,
             "total_files": stats["total_files"],
             "total_chunks": stats["total_chunks"],
             "status_breakdown": stats["status_breakdown"],
+            "file_status": {
+                "total": stats["total_files"],
+                **{status: stats["status_breakdown"].get(status, 0) for status in ("synced", "pending", "processing", "failed")}
+            },
+            "latest_sync": latest_sync,
             "currently_processing": processing_files,
-            "is_syncing": len(processing_files) > 0
+            "stale_processing": [] if syncing else stats["files_by_status"]["processing"],
+            "is_syncing": syncing
         }
\ No newline at end of file
@@ -0,0 +1,401 @@
+"""
+Sync Jobs - Background Syncs Tracked in sync_operations
+/sync/trigger records a SyncOperation and returns its id at once; worker
+tasks run the sync on their own sessions and keep progress, speed, memory
+and heartbeat columns of the row current while it runs.
+Running operations whose heartbeat stops (the process died) are closed
+and resumed: finished files are checkpointed by sync_completed_at and
+stored chunks are reused, so a resumed sync only embeds what is missing
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config.settings import get_settings
+from src.backend.core.database_operations import reset_processing_files
+from src.backend.core.sync_coordinator import SyncCoordinator, tenant_sync_locked
+from src.backend.database import AsyncSessionLocal
+from src.backend.models.database import SyncOperation
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _memory_usage_mb() -> Optional[int]:
+    """Resident memory of this process (None without psutil)"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss // (1024 * 1024)
+
+
+class SyncProgress:
+    """
+    Progress of one running sync operation
+    The coordinator reports stages and finished files in memory; the row is
+    written on stage changes and every heartbeat, on a session of its own
+    """
+
+    def __init__(self, operation_id: UUID, heartbeat_seconds: float):
+        self.operation_id = operation_id
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stage = "starting"
+        self.total_files: Optional[int] = None
+        self.files_done = 0
+        self.chunks_done = 0
+        self.current_file: Optional[str] = None
+        self.started = time.monotonic()
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    async def _write(self, **values) -> None:
+        values["heartbeat_at"] = _now()
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(SyncOperation).where(SyncOperation.id == self.operation_id).values(**values)
+            )
+            await db.commit()
+
+    def _snapshot(self) -> Dict[str, Any]:
+        minutes = max(time.monotonic() - self.started, 1e-6) / 60
+        values = {
+            "progress_stage": self.stage,
+            "current_file_index": self.files_done,
+            "current_file_name": self.current_file[:255] if self.current_file else None,
+            "processing_speed_files_per_min": round(self.files_done / minutes, 2),
+            "processing_speed_chunks_per_min": round(self.chunks_done / minutes, 2),
+            "memory_usage_mb": _memory_usage_mb()
+        }
+        if self.total_files is not None:
+            values["total_files_to_process"] = self.total_files
+            done = min(self.files_done, self.total_files)
+            values["progress_percentage"] = round(100 * done / self.total_files, 1) if self.total_files else 100.0
+        return values
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await self._write(**self._snapshot())
+            except Exception as e:
+                print(f"⚠️ Sync heartbeat failed for {self.operation_id}: {e}")
+
+    async def start(self) -> None:
+        self.started = time.monotonic()
+        await self._write(progress_stage=self.stage)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+
+    async def set_stage(self, stage: str, total_files: Optional[int] = None) -> None:
+        """Coordinator hook: a new phase begins (written immediately)"""
+        self.stage = stage
+        if total_files is not None:
+            self.total_files = total_files
+        await self._write(**self._snapshot())
+
+    def file_done(self, file_name: str, chunks: int = 0) -> None:
+        """Coordinator hook: one file processed or deleted (written with the next heartbeat)"""
+        self.files_done += 1
+        self.chunks_done += chunks
+        self.current_file = file_name
+
+    async def finish(self, status: str, **values) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+        snapshot = self._snapshot()
+        if status == "completed":
+            snapshot["progress_percentage"] = 100.0
+        await self._write(**snapshot, **values, status=status, progress_stage=status, completed_at=_now())
+
+
+def _operation_outcome(results: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Final status and statistics columns from quick_sync results"""
+    values = {
+        "files_processed": results.get("files_processed", 0) + results.get("deleted_files_processed", 0),
+        "files_added": results.get("new_files_processed", 0),
+        "files_updated": results.get("updated_files_processed", 0),
+        "files_deleted": results.get("deleted_files_processed", 0),
+        "chunks_created": results.get("total_chunks_created", 0)
+    }
+    if results.get("failed_files"):
+        values["error_details"] = {"failed_files": results["failed_files"]}
+    if "sync_error" in results:
+        values["error_message"] = results["sync_error"]
+        return "failed", values
+    return "completed", values
+
+
+def _conflict(tenant_slug: str, operation_id: Optional[UUID]) -> Dict[str, Any]:
+    return {
+        "sync_id": str(operation_id) if operation_id else None,
+        "status": "conflict",
+        "message": f"A sync is already queued or running for {tenant_slug}"
+    }
+
+
+@dataclass
+class SyncJob:
+    operation_id: UUID
+    tenant_slug: str
+    force_full_sync: bool
+    embedding_model: Optional[str]
+    chunking_strategy: Optional[str]
+    resume_after: Optional[datetime] = None
+
+
+class SyncJobRunner:
+    """Queue of sync jobs drained by a few worker tasks; one queued/running job per tenant across processes"""
+
+    def __init__(self, workers: int, heartbeat_seconds: float, stale_seconds: float):
+        self.workers = max(1, workers)
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self._active: Dict[str, UUID] = {}
+        self._queued = set()  # operation ids not yet picked up (their heartbeat is kept by the watchdog)
+        self._submit_lock = asyncio.Lock()
+        self._tasks = []
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.resumed = 0
+
+    def start(self) -> None:
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._watchdog()))
+        print(f"🧵 Sync job runner started: {self.workers} workers")
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(
+        self,
+        db: AsyncSession,
+        tenant_slug: str,
+        force_full_sync: bool = False,
+        embedding_model: Optional[str] = None,
+        chunking_strategy: Optional[str] = None,
+        resume_after: Optional[datetime] = None,
+        resumed_from: Optional[UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Record a queued operation and enqueue it; conflicts with the tenant's active job
+        in any worker process (unique index on running operations per tenant)
+        """
+        async with self._submit_lock:
+            active = self._active.get(tenant_slug)
+            if active is not None:
+                return _conflict(tenant_slug, active)
+
+            operation = SyncOperation(
+                id=uuid4(),
+                tenant_slug=tenant_slug,
+                operation_type="full_sync" if force_full_sync else "delta_sync",
+                status="running",
+                progress_stage="queued",
+                started_at=_now(),  # same clock as the sync_completed_at checkpoints
+                heartbeat_at=_now(),
+                sync_config={
+                    "embedding_model": embedding_model,
+                    "chunking_strategy": chunking_strategy,
+                    "resume_after": resume_after.isoformat() if resume_after else None,
+                    "resumed_from": str(resumed_from) if resumed_from else None
+                }
+            )
+            db.add(operation)
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Another worker process has a running operation for this tenant
+                await db.rollback()
+                running = await db.execute(
+                    select(SyncOperation.id).where(
+                        SyncOperation.tenant_slug == tenant_slug, SyncOperation.status == "running"
+                    )
+                )
+                return _conflict(tenant_slug, running.scalar())
+            self._active[tenant_slug] = operation.id
+            self._queued.add(operation.id)
+
+        await self.queue.put(SyncJob(
+            operation.id, tenant_slug, force_full_sync, embedding_model, chunking_strategy, resume_after
+        ))
+        self.submitted += 1
+        return {
+            "sync_id": str(operation.id),
+            "status": "started",
+            "total_files": None,  # known once the job has discovered the changes (see /status)
+            "message": f"Sync queued for {tenant_slug}"
+        }
+
+    async def _run_job(self, job: SyncJob) -> None:
+        self._queued.discard(job.operation_id)
+        progress = SyncProgress(job.operation_id, self.heartbeat_seconds)
+        await progress.start()
+        try:
+            async with AsyncSessionLocal() as db:
+                coordinator = SyncCoordinator(db, progress=progress)
+                results = await coordinator.quick_sync(
+                    tenant_slug=job.tenant_slug,
+                    force_full_sync=job.force_full_sync,
+                    embedding_model=job.embedding_model,
+                    chunking_strategy=job.chunking_strategy,
+                    resume_after=job.resume_after
+                )
+        except Exception as e:
+            print(f"💥 Sync job {job.operation_id} failed: {e}")
+            await progress.finish("failed", error_message=str(e))
+            self.failed += 1
+            return
+
+        status, values = _operation_outcome(results)
+        await progress.finish(status, **values)
+        if status == "completed":
+            self.completed += 1
+        else:
+            self.failed += 1
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Could not record sync job {job.operation_id}: {e}")
+            finally:
+                self._active.pop(job.tenant_slug, None)
+
+    async def recover_stale(self) -> int:
+        """
+        Close running operations not owned by this runner whose heartbeat is
+        older than stale_seconds, return their tenants' files from 'processing'
+        to pending and queue a resuming sync per tenant
+        Live operations of other worker processes keep their heartbeat fresh
+        and are never touched
+        """
+        cutoff = _now() - timedelta(seconds=self.stale_seconds)
+        conditions = [
+            SyncOperation.status == "running",
+            SyncOperation.id.notin_(list(self._active.values())),
+            or_(SyncOperation.heartbeat_at < cutoff, SyncOperation.heartbeat_at.is_(None))
+        ]
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(SyncOperation)
+                .where(*conditions)
+                .values(
+                    status="failed",
+                    progress_stage="interrupted",
+                    completed_at=_now(),
+                    error_message="Interrupted (heartbeat lost); resumed by a new sync"
+                )
+                .returning(
+                    SyncOperation.id, SyncOperation.tenant_slug, SyncOperation.operation_type,
+                    SyncOperation.started_at, SyncOperation.sync_config
+                )
+            )
+            stale = result.all()
+            await db.commit()
+            for tenant_slug in {row.tenant_slug for row in stale}:
+                # A live sync in another process (e.g. the upload watcher) owns its 'processing' rows
+                if not await tenant_sync_locked(db, tenant_slug):
+                    await reset_processing_files(db, tenant_slug)
+
+            # One resume per tenant, from its newest interrupted operation
+            newest = {}
+            for row in sorted(stale, key=lambda row: row.started_at):
+                newest[row.tenant_slug] = row
+            for tenant_slug, row in newest.items():
+                config = row.sync_config or {}
+                full_sync = row.operation_type == "full_sync"
+                resume_after = None
+                if full_sync:
+                    # A chain of resumes keeps the first run's start as its checkpoint base
+                    resume_after = datetime.fromisoformat(config["resume_after"]) if config.get("resume_after") else row.started_at
+                job = await self.submit(
+                    db, tenant_slug,
+                    force_full_sync=full_sync,
+                    embedding_model=config.get("embedding_model"),
+                    chunking_strategy=config.get("chunking_strategy"),
+                    resume_after=resume_after,
+                    resumed_from=row.id
+                )
+                print(f"♻️ Resuming interrupted sync {row.id} for {tenant_slug} as {job['sync_id']} ({job['status']})")
+                self.resumed += job["status"] == "started"
+        return len(stale)
+
+    async def _watchdog(self) -> None:
+        """Keep queued operations' heartbeat fresh and resume runs whose heartbeat stopped"""
+        while True:
+            await asyncio.sleep(max(1.0, self.stale_seconds / 2))
+            try:
+                if self._queued:
+                    async with AsyncSessionLocal() as db:
+                        await db.execute(
+                            update(SyncOperation)
+                            .where(SyncOperation.id.in_(list(self._queued)))
+                            .values(heartbeat_at=_now())
+                        )
+                        await db.commit()
+                await self.recover_stale()
+            except Exception as e:
+                print(f"⚠️ Sync watchdog failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": self.queue.qsize(),
+            "active_tenants": sorted(self._active),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "resumed": self.resumed
+        }
+
+
+_runner: Optional[SyncJobRunner] = None
+
+
+def get_sync_job_runner() -> SyncJobRunner:
+    """The process-wide runner, started on first use (call on the event loop)"""
+    global _runner
+    if _runner is None:
+        settings = get_settings()
+        _runner = SyncJobRunner(
+            settings.sync_job_workers, settings.sync_job_heartbeat_seconds, settings.sync_job_stale_seconds
+        )
+        _runner.start()
+    return _runner
+
+
+def get_sync_job_stats() -> Optional[Dict[str, Any]]:
+    return _runner.get_stats() if _runner is not None else None
+
+
+async def start_sync_jobs() -> None:
+    """Start the runner and resume operations whose process died (stale heartbeat)"""
+    runner = get_sync_job_runner()
+    recovered = await runner.recover_stale()
+    if recovered:
+        print(f"♻️ Recovered {recovered} interrupted sync operations")
+
+
+async def stop_sync_jobs() -> None:
+    global _runner
+    if _runner is not None:
+        await _runner.stop()
+        _runner = None
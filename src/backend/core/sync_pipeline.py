@@ -0,0 +1,414 @@
+"""
+Sync Pipeline - Extraction, Embedding and Database Writes Overlap
+Files flow through bounded asyncio queues as windows of chunks:
+
+    extract (N workers) → plan (DB diff) → embed (batches across files) → write (DB)
+
+Plan and write share the coordinator's session, one step at a time, each step
+in a savepoint of the SyncWriter's batched transactions; the CPU embeds while
+the database is busy and vice versa
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.backend.config.settings import get_settings
+from src.backend.core.database_operations import (
+    FileChunkRows,
+    apply_chunk_window,
+    finish_file_chunk_rows,
+    get_cached_embeddings,
+    insert_chunk_window,
+    load_file_chunk_rows
+)
+from src.backend.core.embedding_scheduler import scheduled_batch_chunks
+from src.backend.core.inference_executor import run_sync_inference
+from src.backend.core.sync_writer import SyncWriter
+from src.backend.simple_embedder import (
+    iter_file_chunks_simple,
+    next_chunk_window,
+    prepare_file_chunks_cached
+)
+
+
+@dataclass
+class FileJob:
+    """One file moving through the pipeline"""
+    file_info: Any
+    is_new: bool
+    db_file: Any
+    result: Dict[str, Any]
+    file_record: Any = None
+    stored_rows: Any = None
+    page_count: Optional[int] = None
+    extraction_method: Optional[str] = None
+    windows_emitted: int = 0
+    windows_written: int = 0
+    extract_done: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class ChunkWindow:
+    """A bounded slice of one file's chunks"""
+    job: FileJob
+    chunks: List[dict]
+    inserts: List[dict] = field(default_factory=list)
+    missing: List[dict] = field(default_factory=list)
+
+
+class StageStats:
+    """Busy time of one stage (waiting on queues or the session does not count)"""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.items = 0
+        self.busy_seconds = 0.0
+
+    def to_dict(self, wall_seconds: float) -> Dict[str, Any]:
+        capacity = wall_seconds * self.workers
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "utilization": round(self.busy_seconds / capacity, 3) if capacity else 0.0
+        }
+
+
+class SyncPipeline:
+    """Runs new/updated files of one sync plan through the staged pipeline"""
+
+    def __init__(self, coordinator, tenant_slug: str, config):
+        settings = get_settings()
+        self.coordinator = coordinator
+        self.db = coordinator.db
+        self.tenant_slug = tenant_slug
+        self.config = config
+        self.writer = SyncWriter(self.db, tenant_slug)
+        self.window_chunks = settings.ingest_window_chunks
+        # Pack at least one scheduled batch per call, so pool-sized batches are not split
+        self.embed_batch_chunks = max(1, settings.sync_pipeline_embed_batch_chunks, scheduled_batch_chunks(settings))
+
+        queue_size = max(1, settings.sync_pipeline_queue_windows)
+        self.jobs: asyncio.Queue = asyncio.Queue()
+        self.plan_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.embed_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.write_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.db_lock = asyncio.Lock()  # one AsyncSession: plan and write steps never overlap
+
+        self.stats = {
+            "extract": StageStats(max(1, settings.sync_pipeline_extract_workers)),
+            "plan": StageStats(1),
+            "embed": StageStats(max(1, settings.sync_pipeline_embed_workers)),
+            "write": StageStats(1)
+        }
+        self.wall_seconds = 0.0
+
+    # ----- extract: read, extract and chunk files into windows -----
+
+    async def _emit(self, job: FileJob, chunks: List[dict], last: bool) -> None:
+        job.windows_emitted += 1
+        job.extract_done = last
+        await self.plan_queue.put(ChunkWindow(job, chunks))
+
+    async def _extract_file(self, job: FileJob, stats: StageStats) -> None:
+        config = self.config
+        file_path = Path(self.coordinator.upload_dir) / job.file_info.path
+        started = time.perf_counter()
+
+        if self.coordinator._should_stream(file_path):
+            job.extraction_method = "text"
+            chunk_stream = iter_file_chunks_simple(
+                file_path,
+                chunk_size=config.chunk_size,
+                chunk_overlap=config.chunk_overlap,
+                chunking_strategy=config.chunking_strategy,
+                model_name=config.model
+            )
+            window = await run_sync_inference(next_chunk_window, chunk_stream, self.window_chunks)
+            while True:
+                following = await run_sync_inference(next_chunk_window, chunk_stream, self.window_chunks) if window else []
+                stats.busy_seconds += time.perf_counter() - started
+                await self._emit(job, window, last=not following)
+                if not following:
+                    return
+                started = time.perf_counter()
+                window = following
+
+        prepared = await run_sync_inference(
+            prepare_file_chunks_cached,
+            file_path,
+            job.file_info.hash,
+            chunk_size=config.chunk_size,
+            chunk_overlap=config.chunk_overlap,
+            max_chunks=config.max_chunks,
+            chunking_strategy=config.chunking_strategy,
+            model_name=config.model
+        )
+        stats.busy_seconds += time.perf_counter() - started
+        job.page_count = prepared["page_count"]
+        job.extraction_method = prepared["extraction_method"]
+        job.result["extraction_cache"] = prepared["cache"]
+
+        chunks = prepared["chunks"]
+        starts = range(0, len(chunks), self.window_chunks) if chunks else [0]
+        for start in starts:
+            await self._emit(job, chunks[start:start + self.window_chunks], last=start == starts[-1])
+
+    async def _extract_worker(self) -> None:
+        stats = self.stats["extract"]
+        while True:
+            job = await self.jobs.get()
+            if job is None:
+                return
+            print(f"📄 Processing {job.file_info.name}...")
+            try:
+                await self._extract_file(job, stats)
+            except Exception as e:
+                job.error = str(e)
+                if not job.extract_done:
+                    await self._emit(job, [], last=True)
+            stats.items += 1
+
+    # ----- plan: file record, chunk-row diff and vector cache lookup -----
+
+    def _failed(self, job: FileJob) -> bool:
+        """Whether the file has failed, including by a batch rollback that discarded its writes"""
+        if not job.error and job.file_record in self.writer.rolled_back_files:
+            job.error = job.result["error"]
+        return bool(job.error)
+
+    async def _plan_window(self, window: ChunkWindow) -> None:
+        job = window.job
+        if self._failed(job) or not window.chunks:
+            return
+        self.writer.file_started(job.file_record, job.result)
+        if job.stored_rows is None:
+            # A new file has no stored chunks: skip the lookup
+            job.stored_rows = (
+                FileChunkRows(job.file_record.id, []) if job.is_new
+                else await load_file_chunk_rows(self.db, job.file_record.id)
+            )
+
+        model_name = self.config.model
+        window.inserts = await apply_chunk_window(self.db, job.stored_rows, window.chunks, model_name)
+
+        cached = await get_cached_embeddings(
+            self.db, self.tenant_slug, [chunk["hash"] for chunk in window.inserts], model_name
+        )
+        for chunk in window.inserts:
+            if chunk["hash"] in cached:
+                chunk["embedding"] = cached[chunk["hash"]]
+            else:
+                window.missing.append(chunk)
+
+    async def _plan_stage(self) -> None:
+        stats = self.stats["plan"]
+        while True:
+            window = await self.plan_queue.get()
+            if window is None:
+                return
+            async with self.db_lock:
+                started = time.perf_counter()
+                try:
+                    async with self.writer.step():
+                        await self._plan_window(window)
+                except Exception as e:
+                    window.job.error = window.job.error or str(e)
+                stats.busy_seconds += time.perf_counter() - started
+            stats.items += 1
+            await self.embed_queue.put(window)
+
+    # ----- embed: pack missing chunks of several windows (and files) into one call -----
+
+    async def _embed_windows(self, windows: List[ChunkWindow]) -> None:
+        by_hash: Dict[str, List[dict]] = {}
+        for window in windows:
+            if not window.job.error:
+                for chunk in window.missing:
+                    by_hash.setdefault(chunk["hash"], []).append(chunk)
+        if not by_hash:
+            return
+
+        unique = [chunks[0] for chunks in by_hash.values()]
+        try:
+            if not await self.coordinator._embed_chunks(self.tenant_slug, unique, self.config.model):
+                raise RuntimeError("No embeddings generated")
+        except Exception as e:
+            for window in windows:
+                if window.missing:
+                    window.job.error = window.job.error or str(e)
+            return
+
+        for chunks in by_hash.values():
+            for duplicate in chunks[1:]:
+                duplicate["embedding"] = chunks[0]["embedding"]
+
+    async def _embed_worker(self) -> None:
+        stats = self.stats["embed"]
+        finished = False
+        while not finished:
+            window = await self.embed_queue.get()
+            if window is None:
+                return
+            batch = [window]
+            pending = len(window.missing)
+            while pending < self.embed_batch_chunks and not self.embed_queue.empty():
+                window = self.embed_queue.get_nowait()
+                if window is None:
+                    finished = True
+                    break
+                batch.append(window)
+                pending += len(window.missing)
+
+            started = time.perf_counter()
+            await self._embed_windows(batch)
+            stats.busy_seconds += time.perf_counter() - started
+            stats.items += len(batch)
+            for window in batch:
+                await self.write_queue.put(window)
+
+    # ----- write: insert rows, then finish each file once all its windows are in -----
+
+    async def _write_window(self, window: ChunkWindow) -> None:
+        job = window.job
+        if not self._failed(job) and window.chunks:
+            async with self.writer.step():
+                await insert_chunk_window(self.db, job.file_record, job.stored_rows, window.inserts, commit=False)
+            job.result["chunks_created"] += len(window.chunks)
+            job.result["chunks_reused"] += len(window.chunks) - len(window.missing)
+            await self.writer.add_rows(len(window.inserts))
+
+    async def _finish_file(self, job: FileJob) -> None:
+        result = job.result
+        if not self._failed(job) and result["chunks_created"]:
+            try:
+                async with self.writer.step():
+                    counts = await finish_file_chunk_rows(self.db, job.stored_rows, commit=False)
+                print(f"   💾 Chunks: {counts['unchanged']} unchanged, {counts['moved']} moved, "
+                      f"{counts['inserted']} inserted, {counts['removed']} removed")
+            except Exception as e:
+                job.error = str(e)
+
+        if self._failed(job) or not result["chunks_created"]:
+            result["error"] = job.error or "No meaningful content or embeddings generated"
+            result["chunks_created"] = result["chunks_reused"] = 0
+            if job.stored_rows is not None:
+                # Some windows were applied: drop the file's rows (it is retried next sync)
+                try:
+                    await self.writer.discard_rows(job.stored_rows.file_id)
+                except Exception as e:
+                    print(f"   ⚠️ Could not remove partial chunks of {job.file_info.name}: {e}")
+            print(f"   ❌ Error processing {job.file_info.name}: {result['error']}")
+            await self.writer.file_done(job.file_record, result, "failed", job.error or "No embeddings generated")
+            return
+
+        result["success"] = True
+        print(f"   ✅ Processed {job.file_info.name}: {result['chunks_created']} chunks ({result['chunks_reused']} reused)")
+        await self.writer.file_done(
+            job.file_record, result, "synced",
+            page_count=job.page_count, extraction_method=job.extraction_method
+        )
+
+    async def _write_stage(self) -> None:
+        stats = self.stats["write"]
+        while True:
+            window = await self.write_queue.get()
+            if window is None:
+                return
+            job = window.job
+            async with self.db_lock:
+                started = time.perf_counter()
+                try:
+                    await self._write_window(window)
+                except Exception as e:
+                    job.error = job.error or str(e)
+                job.windows_written += 1
+                if job.extract_done and job.windows_written == job.windows_emitted:
+                    try:
+                        await self._finish_file(job)
+                    except Exception as e:
+                        job.result["success"] = False
+                        job.result["error"] = str(e)
+                    self.coordinator._progress_file(job.file_info.name, job.result["chunks_created"])
+                stats.busy_seconds += time.perf_counter() - started
+            stats.items += 1
+
+    # ----- driver -----
+
+    @staticmethod
+    async def _join(stage: List[asyncio.Task], tasks: List[asyncio.Task]) -> None:
+        """Wait for a stage's tasks; a crash anywhere in the pipeline raises instead of stalling the queues"""
+        while True:
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception() is not None:
+                    raise task.exception()
+            if all(task.done() for task in stage):
+                return
+            await asyncio.wait([task for task in tasks if not task.done()], return_when=asyncio.FIRST_COMPLETED)
+
+    async def run(self, work: List[Tuple[Any, bool, Any]]) -> List[Dict[str, Any]]:
+        """Process (file_info, is_new, db_file) items; returns per-file results in input order"""
+        jobs = [
+            FileJob(file_info, is_new, db_file, {
+                "file_name": file_info.name,
+                "file_path": file_info.path,
+                "success": False,
+                "chunks_created": 0,
+                "chunks_reused": 0,
+                "extraction_cache": None,
+                "error": None
+            })
+            for file_info, is_new, db_file in work
+        ]
+
+        started = time.perf_counter()
+
+        # All File rows go to 'processing' in one transaction before any work starts
+        prepared = await self.writer.prepare_files(work)
+        for job, (file_record, error) in zip(jobs, prepared):
+            job.file_record = file_record
+            job.result["error"] = error
+
+        extractors = [asyncio.create_task(self._extract_worker()) for _ in range(self.stats["extract"].workers)]
+        planner = asyncio.create_task(self._plan_stage())
+        embedders = [asyncio.create_task(self._embed_worker()) for _ in range(self.stats["embed"].workers)]
+        writer = asyncio.create_task(self._write_stage())
+        tasks = extractors + [planner] + embedders + [writer]
+        try:
+            for job in jobs:
+                if job.file_record is not None:
+                    self.jobs.put_nowait(job)
+            for _ in extractors:
+                self.jobs.put_nowait(None)
+
+            # Drain stage by stage: each stage stops after everything upstream is done
+            await self._join(extractors, tasks)
+            await self.plan_queue.put(None)
+            await self._join([planner], tasks)
+            for _ in embedders:
+                await self.embed_queue.put(None)
+            await self._join(embedders, tasks)
+            await self.write_queue.put(None)
+            await self._join([writer], tasks)
+            await self.writer.commit()
+        except Exception:
+            await self.db.rollback()  # drop the unfinished batch
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+            self.wall_seconds = time.perf_counter() - started
+
+        return [job.result for job in jobs]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-stage utilization for the sync results"""
+        return {
+            "wall_seconds": round(self.wall_seconds, 3),
+            "stages": {name: stats.to_dict(self.wall_seconds) for name, stats in self.stats.items()},
+            "writes": self.writer.get_stats()
+        }
@@ -0,0 +1,196 @@
+"""
+Sync Writer - Unit of Work for Sync Database Writes
+Record upserts, chunk rows, status changes and deletions of many files
+share a few large transactions instead of several commits per file; each
+step runs in a SAVEPOINT, so one failing step rolls back alone. A file whose
+windows span steps (or batches) and fails later has its chunk rows deleted,
+and a failed batch commit fails every file with writes in it
+"""
+
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.backend.config.settings import get_settings
+from src.backend.core.database_operations import create_file_record, set_file_status, update_file_record
+from src.backend.models.database import EmbeddingChunk, File
+
+# Files removed per DELETE statement
+DELETE_BATCH = 500
+
+
+class SyncWriter:
+    """Groups a sync's writes into transactions of up to batch_files files / batch_rows chunk rows"""
+
+    def __init__(self, db: AsyncSession, tenant_slug: str):
+        settings = get_settings()
+        self.db = db
+        self.tenant_slug = tenant_slug
+        self.batch_files = max(1, settings.sync_write_batch_files)
+        self.batch_rows = max(1, settings.sync_write_batch_rows)
+        self._pending_files = 0
+        self._pending_rows = 0
+        self._uncommitted: List[Dict[str, Any]] = []  # results to fail if the commit does
+        # Keyed by File object: after a rollback its attributes are expired and must not be loaded
+        self._in_flight: Dict[File, Dict[str, Any]] = {}  # files with rows written, not done yet
+        self.rolled_back_files = set()  # in-flight files whose writes a failed commit discarded
+        self.commits = 0
+        self.savepoint_rollbacks = 0
+
+    @asynccontextmanager
+    async def step(self):
+        """One file's step in a SAVEPOINT: on error only the step is undone (and the error re-raised)"""
+        try:
+            async with self.db.begin_nested():
+                yield
+        except Exception:
+            self.savepoint_rollbacks += 1
+            raise
+
+    async def commit(self) -> bool:
+        """
+        Commit the batch; if that fails, every file finished in it is reported failed,
+        and so is every file still in flight (its chunk-row state no longer matches the table)
+        """
+        try:
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            print(f"   ❌ Sync batch commit failed ({len(self._uncommitted)} files, {len(self._in_flight)} in flight): {e}")
+            for result in self._uncommitted + list(self._in_flight.values()):
+                result["success"] = False
+                result["error"] = f"Commit failed: {e}"
+            self.rolled_back_files.update(self._in_flight)
+            self._in_flight = {}
+            return False
+        finally:
+            self._pending_files = 0
+            self._pending_rows = 0
+            self._uncommitted = []
+        self.commits += 1
+        return True
+
+    async def _maybe_commit(self) -> None:
+        if self._pending_files >= self.batch_files or self._pending_rows >= self.batch_rows:
+            await self.commit()
+
+    async def prepare_files(self, work: List[Tuple[Any, bool, Any]]) -> List[Tuple[Optional[File], Optional[str]]]:
+        """
+        Create/update the File rows of (file_info, is_new, db_file) items as 'processing'
+        in one flush and commit; falls back to one file at a time if that fails
+        """
+        records = []
+        for file_info, is_new, db_file in work:
+            if is_new:
+                record = File(
+                    id=uuid4(),
+                    tenant_slug=self.tenant_slug,
+                    filename=file_info.name,
+                    file_path=file_info.path,
+                    file_size=file_info.size,
+                    file_hash=file_info.hash,
+                    sync_status="processing"
+                )
+                self.db.add(record)
+            else:
+                record = db_file
+                record.file_hash = file_info.hash
+                record.file_size = file_info.size
+                record.sync_status = "processing"
+            records.append(record)
+
+        if await self.commit():
+            return [(record, None) for record in records]
+
+        # Isolate the offending rows (one commit per file)
+        prepared = []
+        for file_info, is_new, db_file in work:
+            try:
+                if is_new:
+                    record = await create_file_record(self.db, self.tenant_slug, file_info)
+                else:
+                    record = await update_file_record(self.db, db_file, file_info)
+                prepared.append((record, None))
+            except Exception as e:
+                await self.db.rollback()
+                prepared.append((None, str(e)))
+        return prepared
+
+    def file_started(self, file_record: File, result: Dict[str, Any]) -> None:
+        """A file's chunk rows are about to change (tracked until file_done)"""
+        self._in_flight.setdefault(file_record, result)
+
+    async def add_rows(self, count: int) -> None:
+        """Chunk rows written in this batch"""
+        self._pending_rows += count
+        await self._maybe_commit()
+
+    async def discard_rows(self, file_id) -> None:
+        """
+        Delete a failed file's chunk rows: windows written before the failure and
+        rows parked at shifted indices must not stay searchable
+        """
+        async with self.step():
+            await self.db.execute(delete(EmbeddingChunk).where(EmbeddingChunk.file_id == file_id))
+
+    async def file_done(
+        self,
+        file_record: File,
+        result: Dict[str, Any],
+        status: str,
+        error_message: Optional[str] = None,
+        page_count: Optional[int] = None,
+        extraction_method: Optional[str] = None
+    ) -> None:
+        """Final status of a file, written with the batch"""
+        if status == "synced":
+            file_record.page_count = page_count
+            file_record.extraction_method = extraction_method
+        await set_file_status(self.db, file_record, status, error_message, commit=False)
+        self._in_flight.pop(file_record, None)
+        self._uncommitted.append(result)
+        self._pending_files += 1
+        await self._maybe_commit()
+
+    async def _delete_ids(self, file_ids: list) -> None:
+        await self.db.execute(delete(EmbeddingChunk).where(EmbeddingChunk.file_id.in_(file_ids)))
+        await self.db.execute(
+            delete(File).where(File.id.in_(file_ids)).execution_options(synchronize_session=False)
+        )
+
+    async def delete_files(self, db_files: List[File]) -> Tuple[List[File], List[Tuple[File, str]]]:
+        """Delete files and their chunks with set-based DELETEs; returns (deleted, [(file, error)])"""
+        deleted = []
+        failures = []
+        for i in range(0, len(db_files), DELETE_BATCH):
+            batch = db_files[i:i + DELETE_BATCH]
+            try:
+                async with self.step():
+                    await self._delete_ids([db_file.id for db_file in batch])
+                deleted.extend(batch)
+            except Exception:
+                # Retry one by one so a single bad row does not keep the rest
+                for db_file in batch:
+                    try:
+                        async with self.step():
+                            await self._delete_ids([db_file.id])
+                        deleted.append(db_file)
+                    except Exception as e:
+                        failures.append((db_file, str(e)))
+
+        if deleted and not await self.commit():
+            failures.extend((db_file, "Commit failed") for db_file in deleted)
+            deleted = []
+        return deleted, failures
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "commits": self.commits,
+            "savepoint_rollbacks": self.savepoint_rollbacks,
+            "rolled_back_files": len(self.rolled_back_files),
+            "batch_files": self.batch_files,
+            "batch_rows": self.batch_rows
+        }
@@ -0,0 +1,225 @@
+"""
+Upload Watcher - New Documents Become Queryable Within Seconds
+Filesystem events (inotify on Linux, via watchdog) for the upload root are
+debounced and fed to the sync pipeline as per-tenant path batches; no scans
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import select
+
+from src.backend.config.settings import get_settings
+
+# A tenant whose sync fails keeps its paths pending and is retried after a
+# backoff that doubles with each consecutive failure
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 300.0
+
+
+class UploadWatcher:
+    """Collects changed paths per tenant and syncs each burst once it goes quiet"""
+
+    def __init__(self, root: Path, upload_dir: str, debounce_seconds: float, max_delay_seconds: float):
+        self.root = Path(root).resolve()
+        self.upload_dir = upload_dir
+        self.debounce_seconds = debounce_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self._pending: Dict[str, Set[str]] = {}
+        self._failures: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}  # tenants held back from batches until then
+        self._lock = threading.Lock()
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._observer = None
+        self._task: Optional[asyncio.Task] = None
+        self.events = 0
+        self.batches = 0
+        self.files_synced = 0
+        self.failed_syncs = 0
+        self.last_batch_seconds = 0.0
+
+    def _relative(self, path: str) -> Optional[str]:
+        """Upload-relative path ("tenant/...") or None for the root and tenant directories"""
+        try:
+            relative = Path(path).resolve().relative_to(self.root)
+        except ValueError:
+            return None
+        return str(relative) if len(relative.parts) >= 2 else None
+
+    def on_event(self, event) -> None:
+        """watchdog callback (observer thread): record the paths, wake the sync task"""
+        paths = [event.src_path, getattr(event, "dest_path", None)]
+        changed = [relative for relative in map(self._relative, filter(None, paths)) if relative]
+        if not changed or (event.is_directory and event.event_type == "modified"):
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if all(tenant_slug in self._retry_at for tenant_slug in self._pending):
+                self._first_event = now
+            self._last_event = now
+            for relative in changed:
+                self._pending.setdefault(Path(relative).parts[0], set()).add(relative)
+            self.events += 1
+        self._loop.call_soon_threadsafe(self._wake.set)
+
+    def _ready_tenants(self, now: float) -> Set[str]:
+        """Tenants with pending paths that are not backing off (caller holds _lock)"""
+        return {tenant_slug for tenant_slug in self._pending if self._retry_at.get(tenant_slug, 0.0) <= now}
+
+    async def _next_batch(self) -> Dict[str, Set[str]]:
+        """Wait for events, then until debounce_seconds of quiet (at most max_delay_seconds)"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self._ready_tenants(now):
+                    break  # (wakeups for paths an earlier batch already took are stale)
+                retry_waits = [self._retry_at[tenant_slug] - now for tenant_slug in self._pending]
+            try:
+                await asyncio.wait_for(self._wake.wait(), min(retry_waits) if retry_waits else None)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+        while True:
+            with self._lock:
+                ready_at = min(self._last_event + self.debounce_seconds, self._first_event + self.max_delay_seconds)
+            delay = ready_at - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        with self._lock:
+            batch = {tenant_slug: self._pending.pop(tenant_slug) for tenant_slug in self._ready_tenants(time.monotonic())}
+        return batch
+
+    def _retry_later(self, tenant_slug: str, paths: Set[str]) -> None:
+        """Return a failed tenant's paths to _pending and hold the tenant back for its backoff"""
+        failures = self._failures[tenant_slug] = self._failures.get(tenant_slug, 0) + 1
+        delay = min(max(self.debounce_seconds, RETRY_BASE_SECONDS) * 2 ** (failures - 1), RETRY_MAX_SECONDS)
+        with self._lock:
+            self._pending.setdefault(tenant_slug, set()).update(paths)
+            self._retry_at[tenant_slug] = time.monotonic() + delay
+        self.failed_syncs += 1
+        print(f"🔁 Upload watcher: retrying {len(paths)} paths for {tenant_slug} in {delay:.1f}s")
+
+    async def _sync_tenant(self, tenant_slug: str, paths: Set[str]) -> None:
+        from src.backend.core.sync_coordinator import SyncCoordinator
+        from src.backend.database import AsyncSessionLocal
+        from src.backend.models.database import Tenant
+
+        async with AsyncSessionLocal() as db:
+            tenant = await db.scalar(select(Tenant.slug).where(Tenant.slug == tenant_slug))
+            if tenant is None:
+                return  # not a tenant directory
+            coordinator = SyncCoordinator(db, self.upload_dir)
+            results = await coordinator.sync_paths(tenant_slug, sorted(paths))
+            self.files_synced += results.get("files_processed", 0) + results.get("deleted_files_processed", 0)
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            started = time.perf_counter()
+            for tenant_slug, paths in batch.items():
+                print(f"👀 Upload watcher: {len(paths)} changed paths for {tenant_slug}")
+                try:
+                    await self._sync_tenant(tenant_slug, paths)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    print(f"❌ Upload watcher sync failed for {tenant_slug}: {e}")
+                    self._retry_later(tenant_slug, paths)
+                    continue
+                self._failures.pop(tenant_slug, None)
+                with self._lock:
+                    self._retry_at.pop(tenant_slug, None)
+            self.batches += 1
+            self.last_batch_seconds = time.perf_counter() - started
+
+    def start(self) -> None:
+        """Subscribe to filesystem events and start the sync task (call on the event loop)"""
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        watcher = self
+
+        class _Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if event.event_type in ("created", "modified", "moved", "deleted", "closed"):
+                    watcher.on_event(event)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._observer = Observer()
+        self._observer.schedule(_Handler(), str(self.root), recursive=True)
+        self._observer.start()
+        self._task = self._loop.create_task(self._run())
+        print(f"👀 Watching {self.root} for uploads (debounce {self.debounce_seconds:.1f}s)")
+
+    async def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Watcher counters for monitoring"""
+        with self._lock:
+            pending = sum(len(paths) for paths in self._pending.values())
+            retrying = sorted(self._retry_at)
+        return {
+            "root": str(self.root),
+            "events": self.events,
+            "pending_paths": pending,
+            "batches": self.batches,
+            "files_synced": self.files_synced,
+            "failed_syncs": self.failed_syncs,
+            "retrying_tenants": retrying,
+            "last_batch_seconds": round(self.last_batch_seconds, 3)
+        }
+
+
+_watcher: Optional[UploadWatcher] = None
+
+
+def start_upload_watcher() -> Optional[UploadWatcher]:
+    """Start the watcher if enabled and watchdog is installed"""
+    global _watcher
+    settings = get_settings()
+    if not settings.upload_watcher_enabled or _watcher is not None:
+        return _watcher
+
+    watcher = UploadWatcher(
+        root=Path(settings.upload_watcher_dir),
+        upload_dir=settings.upload_watcher_dir,
+        debounce_seconds=settings.upload_watcher_debounce_ms / 1000,
+        max_delay_seconds=settings.upload_watcher_max_delay_ms / 1000
+    )
+    try:
+        watcher.start()
+    except ImportError:
+        print("⚠️ watchdog not installed - upload watcher disabled")
+        return None
+    _watcher = watcher
+    return watcher
+
+
+def get_upload_watcher_stats() -> Optional[Dict[str, Any]]:
+    return _watcher.get_stats() if _watcher is not None else None
+
+
+async def stop_upload_watcher() -> None:
+    global _watcher
+    if _watcher is not None:
+        await _watcher.stop()
+        _watcher = None
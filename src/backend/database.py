@@ -9,7 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from src.backend.models.database import Base
+from src.backend.models.database import Base, PGVECTOR_AVAILABLE
 from src.backend.config.settings import get_settings
 
 settings = get_settings()
@@ -87,6 +87,28 @@ async_engine = create_async_engine(
     pool_use_lifo=True
 )
 
+def register_vector_codec(engine) -> None:
+    """
+    Use pgvector's binary codec on every asyncpg connection of an async engine.
+    Float32Vector binds numpy arrays, which only the codec can encode: a
+    connection that fails to register it is discarded rather than pooled.
+    """
+    if not PGVECTOR_AVAILABLE:
+        return
+    
+    from pgvector.asyncpg import register_vector
+    
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register_vector(dbapi_connection, connection_record):
+        try:
+            dbapi_connection.run_async(register_vector)
+        except Exception as e:
+            # e.g. vector extension not created yet (database not initialised)
+            print(f"❌ pgvector binary codec not registered, discarding connection: {e}")
+            raise
+
+register_vector_codec(async_engine)
+
 # Session factories with improved configuration
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
 AsyncSessionLocal = async_sessionmaker(
@@ -117,6 +139,7 @@ def get_environment_engine(environment: str, async_mode: bool = True):
                 pool_pre_ping=True,
                 echo=False
             )
+            register_vector_codec(engine)
         else:
             engine = create_engine(
                 env_url,
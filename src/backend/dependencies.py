@@ -55,23 +55,11 @@ def get_db_session():
 def get_embedding_model():
     """Get singleton embedding model instance - cached across all requests"""
     try:
-        from sentence_transformers import SentenceTransformer
-        import torch
-        import os
+        from src.backend.core.model_registry import get_model_registry
         settings = get_settings()
-        
-        print(f"🤖 Loading embedding model: {settings.embedding_model}")
-        
-        # Use GPU if available, otherwise CPU
-        device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        model = SentenceTransformer(settings.embedding_model, device=device)
-        
-        # Clear any existing CUDA cache
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-        
-        print(f"✓ Embedding model loaded successfully on {device}")
-        return model
+
+        # Shared with the sync pipeline so the model is only loaded once per process
+        return get_model_registry().get_model(settings.embedding_model)
         
     except Exception as e:
         print(f"❌ Failed to load embedding model: {e}")
@@ -50,6 +50,8 @@ def create_database_tables(engine) -> bool:
                     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
                     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
                     sync_completed_at TIMESTAMP WITH TIME ZONE,
+                    page_count INTEGER,
+                    extraction_method VARCHAR(50),
                     UNIQUE(tenant_slug, file_path),
                     CHECK(sync_status IN ('pending', 'processing', 'synced', 'failed', 'deleted'))
                 )
@@ -65,6 +67,7 @@ def create_database_tables(engine) -> bool:
                     chunk_content TEXT NOT NULL,
                     chunk_hash VARCHAR(64) NOT NULL,
                     token_count INTEGER,
+                    page_number INTEGER,
                     embedding vector(384),
                     embedding_model VARCHAR(255) NOT NULL DEFAULT 'all-MiniLM-L6-v2',
                     processed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -72,6 +75,56 @@ def create_database_tables(engine) -> bool:
                 )
             """))
             
+            # PDF page metadata for databases created before page-aware extraction
+            conn.execute(text("""
+                ALTER TABLE files
+                ADD COLUMN IF NOT EXISTS page_count INTEGER,
+                ADD COLUMN IF NOT EXISTS extraction_method VARCHAR(50)
+            """))
+            conn.execute(text("""
+                ALTER TABLE embedding_chunks ADD COLUMN IF NOT EXISTS page_number INTEGER
+            """))
+            
+            # Resume configuration of background syncs (sync_operations is created by the backend)
+            conn.execute(text("""
+                ALTER TABLE IF EXISTS sync_operations ADD COLUMN IF NOT EXISTS sync_config JSONB
+            """))
+            
+            # One running sync per tenant across worker processes; older duplicate
+            # running rows (left by crashed processes) are closed first
+            conn.execute(text("""
+                DO $$
+                BEGIN
+                    IF to_regclass('sync_operations') IS NOT NULL THEN
+                        UPDATE sync_operations SET status = 'failed', completed_at = NOW(),
+                               error_message = 'Interrupted (superseded by a newer sync)'
+                        WHERE status = 'running' AND id NOT IN (
+                            SELECT DISTINCT ON (tenant_slug) id FROM sync_operations
+                            WHERE status = 'running' ORDER BY tenant_slug, started_at DESC
+                        );
+                        CREATE UNIQUE INDEX IF NOT EXISTS uq_sync_operations_tenant_running
+                        ON sync_operations (tenant_slug) WHERE status = 'running';
+                    END IF;
+                END $$
+            """))
+            
+            # Covering indexes for sync planning (path/hash/size/status) and status counts
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_files_plan_covering
+                ON files (tenant_slug, file_path)
+                INCLUDE (id, file_hash, file_size, sync_status, updated_at)
+            """))
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_files_status_covering
+                ON files (tenant_slug, sync_status) INCLUDE (filename)
+            """))
+            
+            # Index for reusing vectors of unchanged chunks during re-syncs
+            conn.execute(text("""
+                CREATE INDEX IF NOT EXISTS idx_chunks_hash_model
+                ON embedding_chunks (tenant_slug, chunk_hash, embedding_model)
+            """))
+            
             # Create index on embeddings for fast search
             conn.execute(text("""
                 CREATE INDEX IF NOT EXISTS idx_embedding_chunks_embedding 
@@ -18,6 +18,12 @@ from src.backend.api.v1.routes import api_router
 from src.backend.middleware.error_handler import setup_exception_handlers, error_tracking_middleware
 from src.backend.middleware.api_key_auth import api_key_auth_middleware
 from src.backend.database import startup_database_checks, close_database
+from src.backend.core.document_extraction import shutdown_pdf_executor
+from src.backend.core.embedding_pool import shutdown_embedding_pool
+from src.backend.core.inference_executor import shutdown_inference_executor
+from src.backend.core.query_batcher import shutdown_query_batchers
+from src.backend.core.sync_jobs import start_sync_jobs, stop_sync_jobs
+from src.backend.core.upload_watcher import start_upload_watcher, stop_upload_watcher
 from src.backend.startup import wait_for_dependencies, verify_system_requirements, reload_environment_variables
 
 settings = get_settings()
@@ -59,6 +65,13 @@ async def lifespan(app: FastAPI):
             logger.error(f"❌ Database startup failed: {e}")
             logger.warning("⚠️ Continuing despite database startup issues (debugging mode)")
         
+        # Step 5: Background sync jobs and continuous sync of changed uploads (optional)
+        try:
+            await start_sync_jobs()
+        except Exception as e:
+            logger.error(f"❌ Sync job runner failed to start: {e}")
+        start_upload_watcher()
+        
         logger.info("🎉 API startup completed successfully!")
         
     except Exception as e:
@@ -69,6 +82,14 @@ async def lifespan(app: FastAPI):
     
     logger.info("Shutting down Enterprise RAG Platform API...")
     try:        
+        await stop_upload_watcher()
+        await stop_sync_jobs()
+        logger.info("Stopping inference executor...")
+        await shutdown_query_batchers()
+        shutdown_inference_executor()
+        shutdown_embedding_pool()
+        shutdown_pdf_executor()
+        
         logger.info("Closing database connections...")
         await close_database()
         
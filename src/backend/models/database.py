@@ -13,6 +13,7 @@ from sqlalchemy import (
 )
 from sqlalchemy.dialects.postgresql import UUID as PostgreUUID, JSONB
 try:
+    import numpy as np
     from pgvector.sqlalchemy import Vector
     PGVECTOR_AVAILABLE = True
 except ImportError:
@@ -20,10 +21,30 @@ except ImportError:
     Vector = None  # Fallback for when pgvector is not available
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 
 Base = declarative_base()
 
+
+if PGVECTOR_AVAILABLE:
+    class Float32Vector(Vector):
+        """
+        pgvector column that hands float32 arrays straight to asyncpg.
+        The binary codec registered in database.py encodes them to the wire
+        format, skipping the '[x,y,...]' text round-trip of the base type.
+        """
+        cache_ok = True
+
+        def bind_processor(self, dialect):
+            if dialect.driver != "asyncpg":
+                return super().bind_processor(dialect)
+
+            def process(value):
+                if value is None:
+                    return None
+                return np.ascontiguousarray(value, dtype=np.float32)
+            return process
+
 # =============================================
 # BASE MODEL CLASS
 # =============================================
@@ -100,7 +121,12 @@ class File(BaseModel):
         Index('idx_files_tenant_slug', 'tenant_slug'),
         Index('idx_files_sync_status', 'sync_status', 'updated_at'),
         Index('idx_files_hash_lookup', 'tenant_slug', 'file_hash'),
-        Index('idx_files_path_lookup', 'tenant_slug', 'file_path')
+        # Covering indexes: sync planning and status read only these columns
+        Index(
+            'idx_files_plan_covering', 'tenant_slug', 'file_path',
+            postgresql_include=['id', 'file_hash', 'file_size', 'sync_status', 'updated_at']
+        ),
+        Index('idx_files_status_covering', 'tenant_slug', 'sync_status', postgresql_include=['filename'])
     )
 
 class EmbeddingChunk(BaseModel):
@@ -115,10 +141,11 @@ class EmbeddingChunk(BaseModel):
     chunk_content: Mapped[str] = mapped_column(Text, nullable=False)
     chunk_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     token_count: Mapped[Optional[int]] = mapped_column(Integer)
+    page_number: Mapped[Optional[int]] = mapped_column(Integer)  # 1-based page the chunk starts on (PDFs)
     
     # Vector Embedding (384 dimensions for all-MiniLM-L6-v2)
     if PGVECTOR_AVAILABLE:
-        embedding: Mapped[Optional[Vector]] = mapped_column(Vector(384))
+        embedding: Mapped[Optional[Vector]] = mapped_column(Float32Vector(384))
     else:
         # Fallback: store as JSON when pgvector is not available
         embedding: Mapped[Optional[list]] = mapped_column(JSONB)
@@ -138,6 +165,7 @@ class EmbeddingChunk(BaseModel):
             CheckConstraint('token_count > 0', name='check_token_count_positive'),
             Index('idx_chunks_tenant_slug', 'tenant_slug'),
             Index('idx_chunks_file_id', 'file_id', 'chunk_index'),
+            Index('idx_chunks_hash_model', 'tenant_slug', 'chunk_hash', 'embedding_model'),
             Index('idx_chunks_embedding', 'embedding', postgresql_using='ivfflat', postgresql_ops={'embedding': 'vector_cosine_ops'})
         )
     else:
@@ -146,7 +174,8 @@ class EmbeddingChunk(BaseModel):
             CheckConstraint('chunk_index >= 0', name='check_chunk_index_non_negative'),
             CheckConstraint('token_count > 0', name='check_token_count_positive'),
             Index('idx_chunks_tenant_slug', 'tenant_slug'),
-            Index('idx_chunks_file_id', 'file_id', 'chunk_index')
+            Index('idx_chunks_file_id', 'file_id', 'chunk_index'),
+            Index('idx_chunks_hash_model', 'tenant_slug', 'chunk_hash', 'embedding_model')
         )
 
 class SyncOperation(BaseModel):
@@ -191,6 +220,9 @@ class SyncOperation(BaseModel):
     error_message: Mapped[Optional[str]] = mapped_column(Text)
     error_details: Mapped[Optional[dict]] = mapped_column(JSONB)
     
+    # Job options, kept so an interrupted sync can be resumed with the same configuration
+    sync_config: Mapped[Optional[dict]] = mapped_column(JSONB)
+    
     # Relationships
     tenant: Mapped["Tenant"] = relationship("Tenant", back_populates="sync_operations")
     
@@ -204,7 +236,12 @@ class SyncOperation(BaseModel):
         Index('idx_sync_operations_tenant', 'tenant_slug', 'started_at'),
         Index('idx_sync_operations_status', 'status', 'started_at'),
         Index('idx_sync_operations_heartbeat', 'status', 'heartbeat_at'),
-        Index('idx_sync_operations_progress', 'tenant_slug', 'status', 'progress_stage')
+        Index('idx_sync_operations_progress', 'tenant_slug', 'status', 'progress_stage'),
+        # One running sync per tenant, across all worker processes
+        Index(
+            'uq_sync_operations_tenant_running', 'tenant_slug',
+            unique=True, postgresql_where=text("status = 'running'")
+        )
     )
 
 # =============================================
@@ -5,68 +5,58 @@ Replaces complex embedding_engine.py with direct, explicit memory management
 
 import torch
 import gc
-from typing import List
+import hashlib
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
 
-def generate_embeddings_simple(texts: List[str], model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> List[List[float]]:
+from src.backend.config.settings import get_settings
+from src.backend.core.batching import encode_length_bucketed
+from src.backend.core.chunking import (
+    iter_file_blocks,
+    iter_stream_word_windows,
+    iter_text_blocks,
+    iter_token_windows,
+    iter_word_windows,
+    model_token_budget,
+    window_text
+)
+from src.backend.core.document_extraction import ExtractedDocument, extract_document
+from src.backend.core.extraction_cache import chunking_config_key, get_extraction_cache
+from src.backend.core.model_registry import get_model_registry
+
+
+def generate_embeddings_simple(texts: List[str], model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> np.ndarray:
     """
-    Generate embeddings with explicit memory management
-    No singletons, no caching, immediate cleanup
+    Generate embeddings using the warm model from the shared registry
+    Texts are batched by tokenized length under a token budget to minimise padding
+    Returns a contiguous float32 matrix (one row per text)
     """
     if not texts:
-        return []
+        return np.empty((0, 0), dtype=np.float32)
     
-    model = None
     try:
-        from sentence_transformers import SentenceTransformer
+        settings = get_settings()
+        model = get_model_registry().get_model(model_name)
+        device = str(model.device) if hasattr(model, 'device') else 'cpu'
         
-        # Load model fresh (prevents accumulation)
-        print(f"🤖 Loading model: {model_name}")
-        device = 'cuda' if torch.cuda.is_available() else 'cpu'
-        model = SentenceTransformer(model_name, device=device)
-        model.eval()  # Set to evaluation mode
+        print(f"🔢 Processing {len(texts)} texts (token budget {settings.embedding_batch_token_budget}) on {device}")
         
-        print(f"📍 Using device: {device}")
-        if device == 'cuda':
-            print(f"🚀 GPU: {torch.cuda.get_device_name()}")
+        # Generate embeddings with no gradient computation
+        with torch.no_grad():
+            vectors = encode_length_bucketed(
+                model,
+                texts,
+                token_budget=settings.embedding_batch_token_budget,
+                max_batch_size=settings.embedding_batch_size
+            )
         
-        # Process in tiny batches to prevent OOM
-        embeddings = []
-        batch_size = 8 if device == 'cuda' else 16  # Smaller batches for GPU
+        embeddings = np.ascontiguousarray(vectors, dtype=np.float32)
         
-        print(f"🔢 Processing {len(texts)} texts in batches of {batch_size}")
-        
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i+batch_size]
-            batch_num = (i // batch_size) + 1
-            total_batches = (len(texts) - 1) // batch_size + 1
-            
-            print(f"   📦 Batch {batch_num}/{total_batches}: {len(batch)} texts")
-            
-            # Generate embeddings with no gradient computation
-            with torch.no_grad():
-                batch_emb = model.encode(
-                    batch, 
-                    convert_to_tensor=False,
-                    show_progress_bar=False,
-                    batch_size=min(4, len(batch)) if device == 'cuda' else min(8, len(batch))
-                )
-                
-                # Convert to list immediately
-                if hasattr(batch_emb, 'tolist'):
-                    batch_list = batch_emb.tolist()
-                else:
-                    batch_list = [emb.tolist() if hasattr(emb, 'tolist') else list(emb) for emb in batch_emb]
-                
-                embeddings.extend(batch_list)
-            
-            # Aggressive cleanup after each batch
-            del batch_emb, batch_list
-            if device == 'cuda' and torch.cuda.is_available():
-                torch.cuda.empty_cache()
-                torch.cuda.synchronize()
-            gc.collect()
+        if device.startswith('cuda'):
+            torch.cuda.empty_cache()
         
         print(f"✅ Generated {len(embeddings)} embeddings successfully")
         return embeddings
@@ -75,20 +65,7 @@ def generate_embeddings_simple(texts: List[str], model_name: str = "sentence-tra
         print(f"❌ Failed to generate embeddings: {e}")
         import traceback
         traceback.print_exc()
-        return []
-        
-    finally:
-        # Explicit cleanup - critical for preventing leaks
-        if model is not None:
-            print("🧹 Cleaning up model...")
-            del model
-        
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-            torch.cuda.synchronize()
-        
-        gc.collect()
-        print("✅ Memory cleanup completed")
+        return np.empty((0, 0), dtype=np.float32)
 
 
 def chunk_text_simple(text: str, chunk_size: int = 512, overlap: int = 50) -> List[str]:
@@ -99,110 +76,294 @@ def chunk_text_simple(text: str, chunk_size: int = 512, overlap: int = 50) -> Li
     if not text or len(text.strip()) < 10:
         return []
     
-    words = text.split()
-    if len(words) <= chunk_size:
-        return [text]  # Return whole text if small enough
-    
-    chunks = []
-    start = 0
+    return [chunk_text for _, chunk_text in _fixed_size_windows(text, chunk_size, overlap)]
+
+
+def _fixed_size_windows(text: str, chunk_size: int, overlap: int) -> List[Tuple[int, str]]:
+    """(start_char, chunk_text) of fixed-size word windows"""
+    # Single regex pass over the text; offsets only, no word list
+    windows = list(iter_word_windows(text, chunk_size, overlap))
+    if len(windows) == 1:
+        return [(windows[0][0], text)]  # Return whole text if small enough
     
-    while start < len(words):
-        end = min(start + chunk_size, len(words))
-        chunk_words = words[start:end]
-        chunk_text = " ".join(chunk_words)
-        chunks.append(chunk_text)
-        
-        # Move start position with overlap
-        start = end - overlap
-        if start >= len(words):
-            break
+    return [(start_char, window_text(text, start_char, end_char)) for start_char, end_char, _ in windows]
+
+
+def chunk_text_token_aware_simple(
+    text: str,
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    chunk_size: int = 512,
+    overlap: int = 50
+) -> List[tuple]:
+    """
+    Chunk by the model's own tokenizer so nothing is truncated by the encoder
+    chunk_size and overlap are in tokens; chunk_size is capped at max_seq_length
+    Returns (chunk_text, token_count) pairs
+    """
+    if not text or len(text.strip()) < 10:
+        return []
     
-    return chunks
+    return [
+        (chunk_text, token_count)
+        for _, chunk_text, token_count in _iter_chunk_texts(iter_text_blocks(text), chunk_size, overlap, "token-aware", model_name)
+    ]
 
 
-def extract_text_simple(file_path: Path) -> str:
+def _iter_chunk_texts(
+    blocks: Iterable[str],
+    chunk_size: int,
+    overlap: int,
+    chunking_strategy: str,
+    model_name: str
+) -> Iterator[Tuple[int, str, Optional[int]]]:
+    """(start_char, chunk_text, token_count) over a stream of text blocks; token_count only for token-aware"""
+    if chunking_strategy == "token-aware":
+        model = get_model_registry().get_model(model_name)
+        max_tokens = min(chunk_size, model_token_budget(model))
+        for start_char, _, token_count, chunk_text in iter_token_windows(blocks, model.tokenizer, max_tokens, overlap):
+            yield start_char, chunk_text, token_count
+    else:
+        content_defined = chunking_strategy == "content-defined"
+        for start_char, _, _, chunk_text in iter_stream_word_windows(blocks, chunk_size, overlap, content_defined):
+            yield start_char, chunk_text, None
+
+
+def extract_document_simple(file_path: Path) -> Optional[ExtractedDocument]:
     """
-    Simple text extraction from files
-    Supports: .txt, .md, and fallback to text
+    Text extraction from files
+    Supports: .pdf (page-parallel, with page offsets), .txt, .md, and fallback to text
+    Returns None if the file is missing, unreadable or too short
     """
     try:
         if not file_path.exists():
             print(f"⚠️ File not found: {file_path}")
-            return ""
+            return None
         
-        # Read as text with error handling
-        text = file_path.read_text(encoding='utf-8', errors='ignore')
+        document = extract_document(file_path)
         
-        # Basic cleanup
-        text = text.strip()
-        
-        if len(text) < 10:
+        if len(document.text.strip()) < 10:
             print(f"⚠️ File too short: {file_path}")
-            return ""
+            return None
         
-        print(f"📄 Extracted {len(text)} characters from {file_path.name}")
-        return text
+        pages = f" ({document.page_count} pages)" if document.page_count else ""
+        print(f"📄 Extracted {len(document.text)} characters from {file_path.name}{pages}")
+        return document
         
     except Exception as e:
         print(f"❌ Failed to extract text from {file_path}: {e}")
-        return ""
+        return None
 
 
-def process_file_to_embeddings_simple(
-    file_path: Path, 
-    chunk_size: int = 512, 
+def extract_text_simple(file_path: Path) -> str:
+    """Extracted text of a file, or "" if nothing usable was found"""
+    document = extract_document_simple(file_path)
+    return document.text if document else ""
+
+
+def compute_chunk_hash(chunk_text: str) -> str:
+    """Content address of a chunk - identical text always maps to the same vector"""
+    return hashlib.sha256(chunk_text.encode()).hexdigest()
+
+
+def prepare_file_chunks_simple(
+    file_path: Path,
+    chunk_size: int = 512,
     chunk_overlap: int = 50,
-    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
-    max_chunks: int = 1000
+    max_chunks: int = 1000,
+    chunking_strategy: str = "fixed-size",
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
 ) -> List[dict]:
     """
-    Complete pipeline: file → text → chunks → embeddings
-    Returns list of chunk dictionaries with embeddings
+    First half of the pipeline: file → text → chunks
+    Returns chunk dictionaries (index, text, hash, token_count, page_number) without embeddings
     """
     
     print(f"🔄 Processing file: {file_path.name}")
     
     # 1. Extract text
-    text = extract_text_simple(file_path)
-    if not text:
+    document = extract_document_simple(file_path)
+    if document is None:
         return []
     
-    # 2. Chunk text
-    chunks = chunk_text_simple(text, chunk_size, chunk_overlap)
+    return chunk_document_simple(document, chunk_size, chunk_overlap, max_chunks, chunking_strategy, model_name)
+
+
+def chunk_document_simple(
+    document: ExtractedDocument,
+    chunk_size: int = 512,
+    chunk_overlap: int = 50,
+    max_chunks: Optional[int] = 1000,
+    chunking_strategy: str = "fixed-size",
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+) -> List[dict]:
+    """
+    Chunk an extracted document; page_number is the page each chunk starts on (PDFs)
+    max_chunks=None keeps every chunk
+    """
+    text = document.text
+    
+    # 2. Chunk text (token-aware counts the model's word pieces; otherwise whitespace words;
+    #    content-defined places boundaries by rolling hash so edits stay local)
+    if chunking_strategy in ("token-aware", "content-defined"):
+        chunks = list(_iter_chunk_texts(iter_text_blocks(text), chunk_size, chunk_overlap, chunking_strategy, model_name))
+    else:
+        chunks = [(start_char, chunk_text, None) for start_char, chunk_text in _fixed_size_windows(text, chunk_size, chunk_overlap)]
     if not chunks:
-        print(f"⚠️ No chunks created from {file_path.name}")
+        print("⚠️ No chunks created")
         return []
     
     # 3. Limit chunks if too many
-    if len(chunks) > max_chunks:
+    if max_chunks is not None and len(chunks) > max_chunks:
         print(f"⚠️ Limiting to {max_chunks} chunks (was {len(chunks)})")
         chunks = chunks[:max_chunks]
     
     print(f"📦 Created {len(chunks)} chunks")
     
-    # 4. Generate embeddings
-    embeddings = generate_embeddings_simple(chunks, model_name)
-    if not embeddings:
-        print(f"❌ No embeddings generated for {file_path.name}")
-        return []
-    
-    # 5. Combine chunks with embeddings
-    result = []
-    for i, (chunk_text, embedding) in enumerate(zip(chunks, embeddings)):
-        result.append({
+    return [
+        {
             "index": i,
             "text": chunk_text,
-            "embedding": embedding,
-            "model": model_name
-        })
+            "hash": compute_chunk_hash(chunk_text),
+            "token_count": token_count,
+            "page_number": document.page_at(start_char)
+        }
+        for i, (start_char, chunk_text, token_count) in enumerate(chunks)
+    ]
+
+
+def prepare_file_chunks_cached(
+    file_path: Path,
+    file_hash: str,
+    chunk_size: int = 512,
+    chunk_overlap: int = 50,
+    max_chunks: Optional[int] = 1000,
+    chunking_strategy: str = "fixed-size",
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+) -> dict:
+    """
+    prepare_file_chunks_simple through the extraction cache
+    Tries the cached chunk list, then the cached extracted text, then extracts
+    Returns {"chunks", "page_count", "extraction_method", "cache"} where cache is
+    "chunks", "text", "miss" or None (cache disabled or no file hash)
+    """
+    cache = get_extraction_cache() if file_hash else None
+    if cache is None:
+        document = extract_document_simple(file_path)
+        chunks = chunk_document_simple(
+            document, chunk_size, chunk_overlap, max_chunks, chunking_strategy, model_name
+        ) if document else []
+        return {
+            "chunks": chunks,
+            "page_count": document.page_count if document else None,
+            "extraction_method": document.extraction_method if document else None,
+            "cache": None
+        }
+    
+    config_key = chunking_config_key(chunk_size, chunk_overlap, max_chunks, chunking_strategy, model_name)
+    cached = cache.get_chunks(file_hash, config_key)
+    if cached is not None:
+        cache.record_lookup("chunks")
+        print(f"⚡ Extraction cache hit (chunks) for {file_path.name}")
+        return {**cached, "cache": "chunks"}
+    
+    document = cache.get_document(file_hash)
+    status = "text" if document is not None else "miss"
+    cache.record_lookup(status)  # one hit or miss per file, whichever entries were tried
+    if document is None:
+        document = extract_document_simple(file_path)
+        if document is None:
+            return {"chunks": [], "page_count": None, "extraction_method": None, "cache": status}
+        cache.put_document(file_hash, document)
+    else:
+        print(f"⚡ Extraction cache hit (text) for {file_path.name}")
+    
+    chunks = chunk_document_simple(document, chunk_size, chunk_overlap, max_chunks, chunking_strategy, model_name)
+    if chunks:
+        cache.put_chunks(file_hash, config_key, document, chunks)
+    return {
+        "chunks": chunks,
+        "page_count": document.page_count,
+        "extraction_method": document.extraction_method,
+        "cache": status
+    }
+
+
+def iter_file_chunks_simple(
+    file_path: Path,
+    chunk_size: int = 512,
+    chunk_overlap: int = 50,
+    chunking_strategy: str = "fixed-size",
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+) -> Iterator[dict]:
+    """
+    Streaming variant of prepare_file_chunks_simple for large text files
+    Reads the file block by block and yields every chunk (no max_chunks cut)
+    """
+    blocks = iter_file_blocks(file_path)
+    for index, (_, chunk_text, token_count) in enumerate(
+        _iter_chunk_texts(blocks, chunk_size, chunk_overlap, chunking_strategy, model_name)
+    ):
+        yield {
+            "index": index,
+            "text": chunk_text,
+            "hash": compute_chunk_hash(chunk_text),
+            "token_count": token_count,
+            "page_number": None
+        }
+
+
+def next_chunk_window(chunks: Iterator[dict], size: int) -> List[dict]:
+    """Pull up to size chunks from a chunk iterator (empty list when exhausted)"""
+    return list(islice(chunks, size))
+
+
+def embed_chunks_simple(chunks: List[dict], model_name: str = "sentence-transformers/all-MiniLM-L6-v2") -> bool:
+    """
+    Second half of the pipeline: fill in "embedding" and "model" for every chunk
+    Returns False if the model produced no embeddings
+    """
+    if not chunks:
+        return True
+    
+    embeddings = generate_embeddings_simple([chunk["text"] for chunk in chunks], model_name)
+    if len(embeddings) != len(chunks):
+        return False
     
-    print(f"✅ Processed {file_path.name}: {len(result)} embedded chunks")
+    # Rows are float32 views into one matrix; no per-element Python floats
+    for chunk, embedding in zip(chunks, embeddings):
+        chunk["embedding"] = embedding
+        chunk["model"] = model_name
+    
+    return True
+
+
+def process_file_to_embeddings_simple(
+    file_path: Path, 
+    chunk_size: int = 512, 
+    chunk_overlap: int = 50,
+    model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+    max_chunks: int = 1000,
+    chunking_strategy: str = "fixed-size"
+) -> List[dict]:
+    """
+    Complete pipeline: file → text → chunks → embeddings
+    Returns list of chunk dictionaries with embeddings
+    """
+    chunks = prepare_file_chunks_simple(
+        file_path, chunk_size, chunk_overlap, max_chunks, chunking_strategy, model_name
+    )
+    if not chunks:
+        return []
+    
+    if not embed_chunks_simple(chunks, model_name):
+        print(f"❌ No embeddings generated for {file_path.name}")
+        return []
+    
+    print(f"✅ Processed {file_path.name}: {len(chunks)} embedded chunks")
     
-    # 6. Cleanup
-    del text, chunks, embeddings
     gc.collect()
     
-    return result
+    return chunks
 
 
 # Available models for the API
@@ -220,5 +381,7 @@ def get_available_strategies():
     return [
         {"value": "fixed-size", "name": "Fixed Size (Simple)"},
         {"value": "sliding-window", "name": "Sliding Window (Overlap)"},
-        {"value": "semantic", "name": "Semantic (Sentence Boundaries)"}
+        {"value": "semantic", "name": "Semantic (Sentence Boundaries)"},
+        {"value": "token-aware", "name": "Token-Aware (Model Sequence Length)"},
+        {"value": "content-defined", "name": "Content-Defined (Edit-Stable Boundaries)"}
     ]
\ No newline at end of file
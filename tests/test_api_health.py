@@ -56,6 +56,24 @@ class TestAPIHealth:
         assert "paths" in data
         print("✅ OpenAPI JSON schema accessible")
 
+    def test_performance_stats(self):
+        """Test admin embedding pipeline metrics endpoint."""
+        if not ADMIN_API_KEY:
+            pytest.skip("ADMIN_API_KEY not set")
+
+        response = requests.get(
+            f"{BACKEND_URL}/api/v1/admin/performance",
+            headers={"X-API-Key": ADMIN_API_KEY}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "inference_executor" in data
+        assert "model_registry" in data
+        assert "query_cache" in data
+        assert data["inference_executor"]["max_workers"] >= 1
+        print(f"✅ Performance stats: {data['inference_executor']['completed']} inference calls completed")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Length-Bucketed Batching Tests
+Batch planning under a padded-token budget and order restoration after encoding.
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.backend.core.batching import (
+    encode_length_bucketed,
+    padding_ratio,
+    plan_length_batches,
+    sequential_batches
+)
+
+
+def word_count_model(batch_sizes):
+    """No tokenizer (lengths fall back to word estimates); each row is (word count, starts with "x")"""
+
+    def encode(texts, batch_size, convert_to_numpy, show_progress_bar):
+        batch_sizes.append(len(texts))
+        return np.array([[float(len(text.split())), float(text.startswith("x"))] for text in texts], dtype=np.float32)
+
+    return SimpleNamespace(max_seq_length=512, encode=encode)
+
+
+class TestPlanLengthBatches:
+    """Sorting by length packs similar lengths together"""
+
+    def test_every_index_exactly_once(self):
+        lengths = [5, 300, 12, 7, 250, 40, 41, 3]
+        batches = plan_length_batches(lengths, token_budget=600, max_batch_size=3)
+
+        assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+
+    def test_batches_respect_budget_and_size(self):
+        lengths = [(i * 37) % 200 + 1 for i in range(100)]
+        batches = plan_length_batches(lengths, token_budget=1000, max_batch_size=16)
+
+        for batch in batches:
+            assert len(batch) <= 16
+            assert len(batch) == 1 or max(lengths[i] for i in batch) * len(batch) <= 1000
+
+    def test_batches_are_length_sorted(self):
+        lengths = [90, 10, 50, 20, 80, 30]
+        batches = plan_length_batches(lengths, token_budget=10_000, max_batch_size=2)
+
+        assert [[lengths[i] for i in batch] for batch in batches] == [[10, 20], [30, 50], [80, 90]]
+
+    def test_item_over_budget_gets_its_own_batch(self):
+        batches = plan_length_batches([5, 5000, 6], token_budget=100, max_batch_size=8)
+        assert [1] in batches
+
+    def test_less_padding_than_sequential(self):
+        lengths = [8, 500, 9, 480, 10, 470, 11, 460]
+        bucketed = plan_length_batches(lengths, token_budget=2000, max_batch_size=2)
+
+        assert padding_ratio(lengths, bucketed) < padding_ratio(lengths, sequential_batches(len(lengths), 2))
+
+    def test_empty_input(self):
+        assert plan_length_batches([], token_budget=100, max_batch_size=4) == []
+        assert padding_ratio([], []) == 0.0
+
+
+class TestEncodeLengthBucketed:
+    """Rows come back in input order whatever the batch order"""
+
+    def test_rows_in_input_order(self):
+        texts = ["x " * 40, "short", "y " * 3, "x " * 10, "z " * 25]
+        batch_sizes = []
+        vectors = encode_length_bucketed(word_count_model(batch_sizes), texts, token_budget=60, max_batch_size=2)
+
+        assert vectors.dtype == np.float32
+        assert vectors[:, 0].tolist() == [float(len(text.split())) for text in texts]
+        assert vectors[:, 1].tolist() == [1.0, 0.0, 0.0, 1.0, 0.0]
+        assert sum(batch_sizes) == len(texts)
+
+    def test_no_texts(self):
+        assert encode_length_bucketed(word_count_model([]), [], token_budget=60, max_batch_size=2).shape == (0, 0)
@@ -0,0 +1,140 @@
+"""
+Chunk Row Diff Tests
+FileChunkRows / apply_chunk_window decide which stored rows are kept, moved,
+parked or deleted when a file's chunks change; the session only records statements.
+"""
+
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from src.backend.core.database_operations import (
+    FileChunkRows,
+    apply_chunk_window,
+    finish_file_chunk_rows
+)
+
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def stored_rows(*hashes, model=MODEL):
+    """FileChunkRows for a file whose stored chunk i has hashes[i]; returns (rows, row ids)"""
+    ids = [uuid4() for _ in hashes]
+    rows = FileChunkRows(uuid4(), [(row_id, index, chunk_hash, model) for index, (row_id, chunk_hash) in enumerate(zip(ids, hashes))])
+    return rows, ids
+
+
+def chunks(*hashes, start=0):
+    return [{"index": start + i, "text": f"text of {chunk_hash}", "hash": chunk_hash} for i, chunk_hash in enumerate(hashes)]
+
+
+class TestFileChunkRows:
+    """Stored rows indexed by (hash, model) and by chunk index"""
+
+    def test_indexes(self):
+        rows, ids = stored_rows("a", "b", "a")
+
+        assert rows.all_ids == ids
+        assert rows.holders == {0: ids[0], 1: ids[1], 2: ids[2]}
+        # pop() hands out the lowest index first
+        assert rows.available[("a", MODEL)].pop() == (0, ids[0])
+
+
+class TestApplyChunkWindow:
+    """One window of new chunks against the stored rows"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_chunks_need_no_writes(self):
+        rows, ids = stored_rows("a", "b")
+        db = AsyncMock()
+
+        inserts = await apply_chunk_window(db, rows, chunks("a", "b"), MODEL)
+
+        assert inserts == []
+        db.execute.assert_not_awaited()
+        assert rows.unchanged == 2 and rows.kept == set(ids)
+
+    @pytest.mark.asyncio
+    async def test_new_chunk_parks_the_row_on_its_index(self):
+        rows, ids = stored_rows("a", "b")
+        db = AsyncMock()
+
+        # "x" is inserted before "a": both stored rows sit on a target index and are parked,
+        # then "a" moves to index 1 ("b" stays parked until the file is finished)
+        inserts = await apply_chunk_window(db, rows, chunks("x", "a"), MODEL)
+
+        assert [chunk["hash"] for chunk in inserts] == ["x"]
+        assert all(chunk["model"] == MODEL for chunk in inserts)
+        assert db.execute.await_count == 2
+        park_params = db.execute.await_args_list[0].args[0].compile().params
+        assert [set(value) for value in park_params.values() if isinstance(value, list)] == [{ids[0], ids[1]}]
+        assert db.execute.await_args_list[1].args[1] == [{"id": ids[0], "chunk_index": 1, "page_number": None}]
+        assert rows.moved == 1 and rows.kept == {ids[0]}
+
+    @pytest.mark.asyncio
+    async def test_other_model_is_not_reused(self):
+        rows, _ = stored_rows("a", model="other-model")
+        db = AsyncMock()
+
+        inserts = await apply_chunk_window(db, rows, chunks("a"), MODEL)
+
+        assert [chunk["hash"] for chunk in inserts] == ["a"]
+        assert rows.kept == set()
+
+    @pytest.mark.asyncio
+    async def test_missing_hash_is_computed(self):
+        rows, _ = stored_rows()
+        window = [{"index": 0, "text": "some chunk text"}]
+
+        inserts = await apply_chunk_window(AsyncMock(), rows, window, MODEL)
+
+        assert len(inserts[0]["hash"]) == 64
+
+    @pytest.mark.asyncio
+    async def test_windows_share_the_file_state(self):
+        rows, ids = stored_rows("a", "b", "c", "d")
+        db = AsyncMock()
+
+        first = await apply_chunk_window(db, rows, chunks("a", "b"), MODEL)
+        second = await apply_chunk_window(db, rows, chunks("c", "e", start=2), MODEL)
+
+        assert first == [] and [chunk["hash"] for chunk in second] == ["e"]
+        assert rows.kept == set(ids[:3])
+        assert rows.unchanged == 3
+
+    @pytest.mark.asyncio
+    async def test_duplicate_hashes_reuse_distinct_rows(self):
+        rows, ids = stored_rows("a", "a")
+
+        inserts = await apply_chunk_window(AsyncMock(), rows, chunks("a", "a", "a"), MODEL)
+
+        assert len(inserts) == 1 and inserts[0]["index"] == 2
+        assert rows.kept == set(ids)
+
+
+class TestFinishFileChunkRows:
+    """Rows no chunk matched are deleted at the end of the file"""
+
+    @pytest.mark.asyncio
+    async def test_unmatched_rows_are_deleted(self):
+        rows, ids = stored_rows("a", "b", "c")
+        db = AsyncMock()
+        await apply_chunk_window(db, rows, chunks("a"), MODEL)
+        db.execute.reset_mock()
+
+        counts = await finish_file_chunk_rows(db, rows, commit=False)
+
+        assert counts == {"unchanged": 1, "moved": 0, "inserted": 0, "removed": 2}
+        db.execute.assert_awaited_once()
+        db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_nothing_to_delete(self):
+        rows, _ = stored_rows("a")
+        db = AsyncMock()
+        await apply_chunk_window(db, rows, chunks("a"), MODEL)
+
+        assert (await finish_file_chunk_rows(db, rows))["removed"] == 0
+        db.execute.assert_not_awaited()
+        db.commit.assert_awaited_once()
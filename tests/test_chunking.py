@@ -0,0 +1,143 @@
+"""
+Chunking Primitive Tests
+Word, content-defined (CDC) and token-aware windows, and whitespace-aligned blocks.
+No model needed: token windows use a whitespace tokenizer.
+"""
+
+import re
+
+import pytest
+
+from src.backend.core.chunking import (
+    iter_content_defined_windows,
+    iter_file_blocks,
+    iter_stream_word_windows,
+    iter_text_blocks,
+    iter_token_windows,
+    iter_word_windows,
+    window_text
+)
+
+
+def make_words(count: int, seed: int = 7919) -> str:
+    """Deterministic text of count words with a small vocabulary"""
+    return " ".join(f"w{(i * seed) % 997}" for i in range(count))
+
+
+def whitespace_tokenizer(text, **kwargs):
+    """One token per whitespace-separated word, with character offsets"""
+    return {"offset_mapping": [(m.start(), m.end()) for m in re.finditer(r"\S+", text)]}
+
+
+class TestWordWindows:
+    """Fixed-size word windows located by regex"""
+
+    def test_windows_advance_by_chunk_size_minus_overlap(self):
+        text = make_words(10)
+        words = text.split()
+        windows = list(iter_word_windows(text, chunk_size=4, overlap=1))
+
+        assert [window_text(text, start, end).split() for start, end, _ in windows] == [
+            words[0:4], words[3:7], words[6:10]
+        ]
+        assert [count for _, _, count in windows] == [4, 4, 4]
+
+    def test_final_partial_window(self):
+        text = make_words(6)
+        windows = list(iter_word_windows(text, chunk_size=4, overlap=0))
+
+        assert [count for _, _, count in windows] == [4, 2]
+        assert window_text(text, *windows[-1][:2]).split() == text.split()[4:]
+
+    def test_empty_text_has_no_windows(self):
+        assert list(iter_word_windows("  \n\t ", chunk_size=4)) == []
+
+    def test_window_text_collapses_whitespace(self):
+        text = "alpha \t beta\n\n gamma"
+        assert window_text(text, 0, len(text)) == "alpha beta gamma"
+
+    def test_stream_windows_match_in_memory_windows(self):
+        text = make_words(500).replace(" w1", "\n\tw1")
+        expected = [window_text(text, start, end) for start, end, _ in iter_word_windows(text, 37, 5)]
+        streamed = [chunk for _, _, _, chunk in iter_stream_word_windows(iter_text_blocks(text, 64), 37, 5)]
+
+        assert streamed == expected
+
+
+class TestContentDefinedWindows:
+    """CDC boundaries depend only on nearby words"""
+
+    def test_chunk_sizes_stay_within_bounds(self):
+        windows = list(iter_content_defined_windows(make_words(5000), chunk_size=64))
+        counts = [count for _, _, count, _ in windows]
+
+        assert sum(counts) == 5000
+        assert all(16 <= count <= 64 for count in counts[:-1])
+
+    def test_deterministic(self):
+        text = make_words(2000)
+        assert list(iter_content_defined_windows(text, 64)) == list(iter_content_defined_windows(text, 64))
+
+    def test_local_edit_keeps_later_chunks(self):
+        words = make_words(5000).split()
+        original = [chunk for _, _, _, chunk in iter_content_defined_windows(" ".join(words), 64)]
+        words[20] = "edited"
+        edited = [chunk for _, _, _, chunk in iter_content_defined_windows(" ".join(words), 64)]
+
+        # Boundaries resynchronise once the gear hash has shifted the edit out (64 words);
+        # only the few chunks around the edit change
+        assert len(original) > 80
+        assert original[-len(original) // 2:] == edited[-len(original) // 2:]
+        assert len(set(original) - set(edited)) <= 8
+
+    def test_overlap_repeats_trailing_words(self):
+        windows = [chunk.split() for _, _, _, chunk in iter_content_defined_windows(make_words(3000), 64, overlap=8)]
+        for previous, current in zip(windows, windows[1:]):
+            assert current[:8] == previous[-8:]
+
+
+class TestTokenWindows:
+    """Token-aware windows over the tokenizer's own offsets"""
+
+    def test_windows_of_max_tokens_with_overlap(self):
+        text = make_words(25)
+        words = text.split()
+        windows = list(iter_token_windows(iter_text_blocks(text, 16), whitespace_tokenizer, max_tokens=10, overlap=2))
+
+        assert [count for _, _, count, _ in windows] == [10, 10, 9]
+        assert [chunk.split() for _, _, _, chunk in windows] == [words[0:10], words[8:18], words[16:25]]
+        for start, end, _, chunk in windows:
+            assert window_text(text, start, end) == chunk
+
+    def test_no_trailing_window_when_everything_is_covered(self):
+        windows = list(iter_token_windows([make_words(20)], whitespace_tokenizer, max_tokens=10, overlap=0))
+        assert [count for _, _, count, _ in windows] == [10, 10]
+
+
+class TestTextBlocks:
+    """Blocks end on whitespace so no word spans two blocks"""
+
+    @pytest.mark.parametrize("separator", [" ", "\n", "\t", "\r", "\u00a0", "\u2003"])
+    def test_blocks_end_on_any_whitespace(self, separator):
+        text = separator.join(make_words(300).split())
+        blocks = list(iter_text_blocks(text, 50))
+
+        assert "".join(blocks) == text
+        assert all(block[-1].isspace() for block in blocks[:-1])
+
+    def test_long_word_stays_in_one_block(self):
+        long_word = "x" * 120
+        text = f"short {long_word} tail words here"
+        blocks = list(iter_text_blocks(text, 16))
+
+        assert "".join(blocks) == text
+        assert any(long_word in block for block in blocks)
+
+    def test_file_blocks(self, tmp_path):
+        text = "\t".join(make_words(400).split()) + " " + "y" * 300
+        path = tmp_path / "doc.txt"
+        path.write_text(text, encoding="utf-8")
+        blocks = list(iter_file_blocks(path, block_chars=64))
+
+        assert "".join(blocks) == text
+        assert all(block[-1].isspace() for block in blocks[:-1])
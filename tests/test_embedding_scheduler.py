@@ -0,0 +1,122 @@
+"""
+Embedding Scheduler Tests
+Weighted fair queuing of embedding batches across tenants.
+"""
+
+import asyncio
+
+import pytest
+
+from src.backend.core.embedding_scheduler import EmbeddingScheduler, parse_tenant_weights
+
+
+def recording_embed(order, release, tenant_slug):
+    """embed_fn that appends tenant_slug to order, then waits for release"""
+
+    async def embed(batch, model_name):
+        order.append(tenant_slug)
+        await release.wait()
+        await asyncio.sleep(0)
+        return True
+
+    return embed
+
+
+async def run_queued(scheduler: EmbeddingScheduler, calls):
+    """Hold the only slot, queue (tenant, chunk count) calls in order, then let them all run"""
+    order, release = [], asyncio.Event()
+    blocker = asyncio.create_task(scheduler.embed("blocker", [{}], "m", recording_embed(order, release, "blocker")))
+    await asyncio.sleep(0)
+
+    tasks = []
+    for tenant_slug, count in calls:
+        tasks.append(asyncio.create_task(scheduler.embed(tenant_slug, [{}] * count, "m", recording_embed(order, release, tenant_slug))))
+        await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(blocker, *tasks)
+    return order[1:]
+
+
+class TestParseTenantWeights:
+    """EMBEDDING_SCHEDULER_TENANT_WEIGHTS parsing"""
+
+    def test_valid_entries(self):
+        assert parse_tenant_weights("tenant1:2, tenant2:0.5") == {"tenant1": 2.0, "tenant2": 0.5}
+
+    def test_invalid_and_non_positive_entries_are_ignored(self):
+        assert parse_tenant_weights("tenant1:abc,tenant2:0,tenant3:-1,,tenant4:3") == {"tenant4": 3.0}
+
+    def test_empty(self):
+        assert parse_tenant_weights("") == {}
+
+
+class TestEmbeddingScheduler:
+    """Slots go to waiting batches in virtual finish order"""
+
+    @pytest.mark.asyncio
+    async def test_small_tenant_is_not_starved(self):
+        scheduler = EmbeddingScheduler(slots=1, batch_chunks=10, weights={})
+        order = await run_queued(scheduler, [("big", 10)] * 4 + [("small", 10)])
+
+        # The small tenant's first batch is due before the big tenant's second
+        assert order.index("small") <= 1
+        assert order.count("big") == 4
+
+    @pytest.mark.asyncio
+    async def test_weights_share_slots_proportionally(self):
+        scheduler = EmbeddingScheduler(slots=1, batch_chunks=10, weights={"heavy": 2.0})
+        order = await run_queued(scheduler, [("light", 10)] * 4 + [("heavy", 10)] * 4)
+
+        assert order[:6].count("heavy") == 4
+        assert order[-2:] == ["light", "light"]
+
+    @pytest.mark.asyncio
+    async def test_large_call_is_split_into_batches(self):
+        scheduler = EmbeddingScheduler(slots=2, batch_chunks=10, weights={})
+        order, release = [], asyncio.Event()
+        release.set()
+
+        assert await scheduler.embed("tenant1", [{}] * 35, "m", recording_embed(order, release, "tenant1"))
+        stats = scheduler.get_stats()
+
+        assert order == ["tenant1"] * 4
+        assert stats["tenants"]["tenant1"]["chunks_embedded"] == 35
+        assert stats["tenants"]["tenant1"]["granted_batches"] == 4
+        assert stats["free_slots"] == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_stops_the_call(self):
+        scheduler = EmbeddingScheduler(slots=1, batch_chunks=10, weights={})
+        calls = []
+
+        async def failing(batch, model_name):
+            calls.append(len(batch))
+            return False
+
+        assert not await scheduler.embed("tenant1", [{}] * 30, "m", failing)
+        assert calls == [10]
+        assert scheduler.get_stats()["free_slots"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_gives_up_its_place(self):
+        scheduler = EmbeddingScheduler(slots=1, batch_chunks=10, weights={})
+        order, release = [], asyncio.Event()
+
+        holder = asyncio.create_task(scheduler.embed("tenant1", [{}], "m", recording_embed(order, release, "tenant1")))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(scheduler.embed("tenant2", [{}], "m", recording_embed(order, release, "tenant2")))
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()["tenants"]["tenant2"]["queued_batches"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        await holder
+
+        stats = scheduler.get_stats()
+        assert order == ["tenant1"]
+        assert stats["tenants"]["tenant2"]["queued_batches"] == 0
+        assert stats["waiting_batches"] == 0
+        assert stats["free_slots"] == 1
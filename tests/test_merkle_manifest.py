@@ -0,0 +1,98 @@
+"""
+Merkle Manifest Tests
+Hash trees over upload-relative paths, diffs between trees, and the saved manifest.
+"""
+
+from src.backend.core import merkle_manifest
+from src.backend.core.merkle_manifest import build_merkle_tree, diff_merkle_trees
+
+ROOT = "tenant1"
+
+FILES = {
+    "tenant1/readme.txt": "h-readme",
+    "tenant1/docs/policy.md": "h-policy",
+    "tenant1/docs/hr/vacation.md": "h-vacation",
+    "tenant1/docs/hr/benefits.md": "h-benefits",
+    "tenant1/reports/q1.pdf": "h-q1"
+}
+
+
+class TestBuildMerkleTree:
+    """Directory hashes summarise their subtrees"""
+
+    def test_same_files_same_root_hash(self):
+        reordered = dict(reversed(list(FILES.items())))
+        assert build_merkle_tree(FILES, ROOT)[ROOT]["hash"] == build_merkle_tree(reordered, ROOT)[ROOT]["hash"]
+
+    def test_nodes_for_every_directory(self):
+        tree = build_merkle_tree(FILES, ROOT)
+
+        assert set(tree) == {"tenant1", "tenant1/docs", "tenant1/docs/hr", "tenant1/reports"}
+        assert tree[ROOT]["dirs"] == ["docs", "reports"]
+        assert tree["tenant1/docs/hr"]["files"] == {"vacation.md": "h-vacation", "benefits.md": "h-benefits"}
+
+    def test_change_propagates_to_ancestors_only(self):
+        before = build_merkle_tree(FILES, ROOT)
+        after = build_merkle_tree({**FILES, "tenant1/docs/hr/vacation.md": "h-vacation-2"}, ROOT)
+
+        for path in ("tenant1", "tenant1/docs", "tenant1/docs/hr"):
+            assert before[path]["hash"] != after[path]["hash"]
+        assert before["tenant1/reports"]["hash"] == after["tenant1/reports"]["hash"]
+
+    def test_empty_tenant(self):
+        tree = build_merkle_tree({}, ROOT)
+        assert tree[ROOT]["dirs"] == [] and tree[ROOT]["files"] == {}
+
+
+class TestDiffMerkleTrees:
+    """Changed, new and deleted files between the current and the synced tree"""
+
+    def test_identical_trees(self):
+        tree = build_merkle_tree(FILES, ROOT)
+        assert diff_merkle_trees(tree, build_merkle_tree(FILES, ROOT), ROOT) == ([], [])
+
+    def test_changed_new_and_deleted(self):
+        current = dict(FILES)
+        current["tenant1/docs/hr/vacation.md"] = "h-vacation-2"
+        current["tenant1/reports/q2.pdf"] = "h-q2"
+        current["tenant1/new/dir/notes.txt"] = "h-notes"
+        del current["tenant1/readme.txt"]
+        del current["tenant1/docs/hr/benefits.md"]
+
+        changed, deleted = diff_merkle_trees(build_merkle_tree(current, ROOT), build_merkle_tree(FILES, ROOT), ROOT)
+
+        assert sorted(changed) == ["tenant1/docs/hr/vacation.md", "tenant1/new/dir/notes.txt", "tenant1/reports/q2.pdf"]
+        assert sorted(deleted) == ["tenant1/docs/hr/benefits.md", "tenant1/readme.txt"]
+
+    def test_deleted_directory(self):
+        current = {path: file_hash for path, file_hash in FILES.items() if not path.startswith("tenant1/docs/")}
+        changed, deleted = diff_merkle_trees(build_merkle_tree(current, ROOT), build_merkle_tree(FILES, ROOT), ROOT)
+
+        assert changed == []
+        assert sorted(deleted) == ["tenant1/docs/hr/benefits.md", "tenant1/docs/hr/vacation.md", "tenant1/docs/policy.md"]
+
+    def test_first_sync_reports_every_file(self):
+        changed, deleted = diff_merkle_trees(build_merkle_tree(FILES, ROOT), {}, ROOT)
+        assert sorted(changed) == sorted(FILES) and deleted == []
+
+
+class TestSyncedTreeState:
+    """The tree last synced is saved atomically per tenant"""
+
+    def test_save_and_load(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(merkle_manifest, "_state_path", lambda slug: tmp_path / f"{slug}.merkle.json")
+        tree = build_merkle_tree(FILES, ROOT)
+
+        merkle_manifest.save_synced_tree(ROOT, tree, "fingerprint-1")
+        state = merkle_manifest.load_synced_tree(ROOT)
+
+        assert state["fingerprint"] == "fingerprint-1"
+        assert state["tree"][ROOT]["hash"] == tree[ROOT]["hash"]
+        assert list(tmp_path.iterdir()) == [tmp_path / "tenant1.merkle.json"]
+
+    def test_missing_or_corrupt_state(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(merkle_manifest, "_state_path", lambda slug: tmp_path / f"{slug}.merkle.json")
+        assert merkle_manifest.load_synced_tree(ROOT) is None
+
+        (tmp_path / "tenant1.merkle.json").write_text("{not json", encoding="utf-8")
+        assert merkle_manifest.load_synced_tree(ROOT) is None
@@ -0,0 +1,100 @@
+"""
+Query Embedding Cache Tests
+LRU eviction, TTL expiry, read-only vectors and query normalization.
+"""
+
+import numpy as np
+import pytest
+
+from src.backend.core import query_cache
+from src.backend.core.query_cache import QueryEmbeddingCache, normalize_query
+
+MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Mutable monotonic time for the cache module: bump clock["now"] to move it"""
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: clock["now"])
+    return clock
+
+
+class TestNormalizeQuery:
+    """Cache keys ignore whitespace runs and Unicode compatibility forms"""
+
+    def test_collapses_whitespace(self):
+        assert normalize_query("  what is\tthe   mission?\n") == "what is the mission?"
+
+    def test_nfkc(self):
+        # Full-width letters and the "fi" ligature fold to ASCII
+        assert normalize_query("ｍｉｓｓｉｏｎ ﬁle") == "mission file"
+
+
+class TestQueryEmbeddingCache:
+    """Bounded LRU whose entries also expire"""
+
+    def test_miss_then_hit(self, clock):
+        cache = QueryEmbeddingCache(max_entries=4, ttl_seconds=60)
+        assert cache.get(MODEL, "q") is None
+
+        cache.put(MODEL, "q", [1.0, 2.0])
+        assert cache.get(MODEL, "q").tolist() == [1.0, 2.0]
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+    def test_keys_include_the_model(self, clock):
+        cache = QueryEmbeddingCache(max_entries=4, ttl_seconds=60)
+        cache.put(MODEL, "q", [1.0])
+        assert cache.get("other-model", "q") is None
+
+    def test_least_recently_used_entry_is_evicted(self, clock):
+        cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=60)
+        cache.put(MODEL, "a", [1.0])
+        cache.put(MODEL, "b", [2.0])
+        cache.get(MODEL, "a")  # "b" is now the least recently used
+        cache.put(MODEL, "c", [3.0])
+
+        assert cache.get(MODEL, "b") is None
+        assert cache.get(MODEL, "a") is not None and cache.get(MODEL, "c") is not None
+        assert cache.get_stats()["evictions"] == 1
+        assert cache.get_stats()["entries"] == 2
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = QueryEmbeddingCache(max_entries=4, ttl_seconds=60)
+        cache.put(MODEL, "q", [1.0])
+
+        clock["now"] += 59
+        assert cache.get(MODEL, "q") is not None
+        clock["now"] += 2
+        assert cache.get(MODEL, "q") is None
+
+        stats = cache.get_stats()
+        assert stats["expirations"] == 1 and stats["entries"] == 0
+
+    def test_zero_ttl_never_expires(self, clock):
+        cache = QueryEmbeddingCache(max_entries=4, ttl_seconds=0)
+        cache.put(MODEL, "q", [1.0])
+        clock["now"] += 10 ** 6
+        assert cache.get(MODEL, "q") is not None
+
+    @pytest.mark.parametrize("max_entries", [0, -1])
+    def test_non_positive_entries_disables_caching(self, clock, max_entries):
+        cache = QueryEmbeddingCache(max_entries=max_entries, ttl_seconds=60)
+        assert cache.put(MODEL, "q", [1.0]).tolist() == [1.0]
+        assert cache.get(MODEL, "q") is None
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 0 and stats["evictions"] == 0
+
+    def test_vectors_are_read_only_float32_copies(self, clock):
+        cache = QueryEmbeddingCache(max_entries=4, ttl_seconds=60)
+        original = np.array([1.0, 2.0], dtype=np.float64)
+        stored = cache.put(MODEL, "q", original)
+        original[0] = 99.0
+
+        assert stored.dtype == np.float32
+        assert cache.get(MODEL, "q").tolist() == [1.0, 2.0]
+        with pytest.raises(ValueError):
+            stored[0] = 5.0